@@ -14,7 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from husarion_ugv_utils.logging import limit_log_level_to_info
+from husarion_ugv_utils.logging import LogLevelPolicy
+from husarion_ugv_utils.substitutions import BundledConfig
+from husarion_ugv_utils.supervision import Criticality, SupervisedProcess
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument
 from launch.substitutions import (
@@ -35,6 +37,8 @@ def generate_launch_description():
         description="Logging level",
     )
 
+    log_policy = LogLevelPolicy(log_level)
+
     namespace = LaunchConfiguration("namespace")
     declare_namespace_arg = DeclareLaunchArgument(
         "namespace",
@@ -42,33 +46,45 @@ def generate_launch_description():
         description="Add namespace to all launched nodes.",
     )
 
+    config_bundle_path = LaunchConfiguration("config_bundle_path")
+    declare_config_bundle_path_arg = DeclareLaunchArgument(
+        "config_bundle_path",
+        default_value="",
+        description=(
+            "Path to the configuration bundle compiled with 'ros2 run husarion_ugv_utils "
+            "compile_config_bundle'. If set, default configuration files are taken from it."
+        ),
+    )
+
     battery_config_path = LaunchConfiguration("battery_config_path")
     declare_battery_config_path_arg = DeclareLaunchArgument(
         "battery_config_path",
-        default_value=PathJoinSubstitution(
-            [FindPackageShare("husarion_ugv_battery"), "config", "battery.yaml"]
+        default_value=BundledConfig(
+            config_bundle_path,
+            "battery",
+            PathJoinSubstitution(
+                [FindPackageShare("husarion_ugv_battery"), "config", "battery.yaml"]
+            ),
         ),
         description="Specify the path to the system monitor configuration file.",
     )
 
-    battery_driver_node = Node(
-        package="husarion_ugv_battery",
-        executable="battery_driver_node",
-        name="battery_driver",
-        parameters=[battery_config_path],
-        namespace=namespace,
-        remappings=[("/diagnostics", "diagnostics")],
-        arguments=[
-            "--ros-args",
-            "--log-level",
-            log_level,
-            "--log-level",
-            limit_log_level_to_info("rcl", log_level),
-        ],
-        emulate_tty=True,
+    battery_driver_node = SupervisedProcess(
+        lambda: Node(
+            package="husarion_ugv_battery",
+            executable="battery_driver_node",
+            name="battery_driver",
+            parameters=[battery_config_path],
+            namespace=namespace,
+            remappings=[("/diagnostics", "diagnostics")],
+            arguments=log_policy.arguments(),
+            emulate_tty=True,
+        ),
+        criticality=Criticality.RESPAWN,
     )
 
     actions = [
+        declare_config_bundle_path_arg,
         declare_log_level_arg,
         declare_namespace_arg,
         declare_battery_config_path_arg,
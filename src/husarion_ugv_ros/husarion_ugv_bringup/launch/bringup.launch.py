@@ -15,15 +15,9 @@
 # limitations under the License.
 
 
-import os
-
-from husarion_ugv_utils.messages import (
-    ErrorMessages,
-    error_msg,
-    warning_msg,
-    welcome_msg,
-)
-from husarion_ugv_utils.version_check import check_version_compatibility
+from husarion_ugv_utils.actions import PreflightCheck
+from husarion_ugv_utils.messages import ErrorMessages, error_msg, welcome_msg
+from husarion_ugv_utils.robot_metadata import get_robot_metadata
 from launch import LaunchDescription
 from launch.actions import (
     DeclareLaunchArgument,
@@ -38,7 +32,6 @@ from launch.substitutions import (
     EnvironmentVariable,
     LaunchConfiguration,
     PathJoinSubstitution,
-    PythonExpression,
 )
 from launch_ros.substitutions import FindPackageShare
 
@@ -61,6 +54,16 @@ def generate_launch_description():
         description="Path to the common configuration directory.",
     )
 
+    config_bundle_path = LaunchConfiguration("config_bundle_path")
+    declare_config_bundle_path_arg = DeclareLaunchArgument(
+        "config_bundle_path",
+        default_value="",
+        description=(
+            "Path to the configuration bundle compiled with 'ros2 run husarion_ugv_utils "
+            "compile_config_bundle'. If set, default configuration files are taken from it."
+        ),
+    )
+
     disable_manager = LaunchConfiguration("disable_manager")
     declare_disable_manager_arg = DeclareLaunchArgument(
         "disable_manager",
@@ -77,6 +80,17 @@ def generate_launch_description():
         description="Logging level",
     )
 
+    log_pipeline = LaunchConfiguration("log_pipeline")
+    declare_log_pipeline_arg = DeclareLaunchArgument(
+        "log_pipeline",
+        default_value="False",
+        description=(
+            "Rate limit output of high-frequency nodes and write it to compressed JSON lines files"
+            " in '$ROS_LOG_DIR/husarion_ugv'. Recommended with 'log_level:=DEBUG'."
+        ),
+        choices=["True", "true", "False", "false"],
+    )
+
     namespace = LaunchConfiguration("namespace")
     declare_namespace_arg = DeclareLaunchArgument(
         "namespace",
@@ -84,10 +98,10 @@ def generate_launch_description():
         description="Add namespace to all launched nodes.",
     )
 
-    robot_model_name = EnvironmentVariable(name="ROBOT_MODEL_NAME", default_value="panther")
-    robot_serial_no = EnvironmentVariable(name="ROBOT_SERIAL_NO", default_value="----")
-    robot_version = EnvironmentVariable(name="ROBOT_VERSION", default_value="1.0")
-    welcome_info = welcome_msg(robot_model_name, robot_serial_no, robot_version)
+    robot_metadata = get_robot_metadata()
+    welcome_info = welcome_msg(
+        robot_metadata.model, robot_metadata.serial_number, robot_metadata.hardware_version
+    )
 
     controller_launch = IncludeLaunchDescription(
         PythonLaunchDescriptionSource(
@@ -97,8 +111,10 @@ def generate_launch_description():
         ),
         launch_arguments={
             "log_level": log_level,
+            "log_pipeline": log_pipeline,
             "namespace": namespace,
             "common_dir_path": common_dir_path,
+            "config_bundle_path": config_bundle_path,
         }.items(),
     )
 
@@ -112,7 +128,11 @@ def generate_launch_description():
                 ]
             ),
         ),
-        launch_arguments={"log_level": log_level, "namespace": namespace}.items(),
+        launch_arguments={
+            "log_level": log_level,
+            "namespace": namespace,
+            "config_bundle_path": config_bundle_path,
+        }.items(),
     )
 
     lights_launch = IncludeLaunchDescription(
@@ -125,6 +145,7 @@ def generate_launch_description():
             "log_level": log_level,
             "namespace": namespace,
             "common_dir_path": common_dir_path,
+            "config_bundle_path": config_bundle_path,
         }.items(),
     )
 
@@ -134,7 +155,11 @@ def generate_launch_description():
                 [FindPackageShare("husarion_ugv_battery"), "launch", "battery.launch.py"]
             ),
         ),
-        launch_arguments={"log_level": log_level, "namespace": namespace}.items(),
+        launch_arguments={
+            "log_level": log_level,
+            "namespace": namespace,
+            "config_bundle_path": config_bundle_path,
+        }.items(),
     )
 
     ekf_launch = IncludeLaunchDescription(
@@ -147,6 +172,7 @@ def generate_launch_description():
             "log_level": log_level,
             "namespace": namespace,
             "common_dir_path": common_dir_path,
+            "config_bundle_path": config_bundle_path,
         }.items(),
     )
 
@@ -161,6 +187,7 @@ def generate_launch_description():
             "log_level": log_level,
             "namespace": namespace,
             "common_dir_path": common_dir_path,
+            "config_bundle_path": config_bundle_path,
         }.items(),
     )
 
@@ -179,21 +206,7 @@ def generate_launch_description():
         condition=UnlessCondition(hw_config_correct),
     )
 
-    os_version = os.environ.get("SYSTEM_BUILD_VERSION", "v0.0.0")
-    os_version_correct = PythonExpression(
-        f"{check_version_compatibility(os_version, MIN_REQUIRED_OS_VERSION)}"
-    )
-
-    incorrect_os_version_action = GroupAction(
-        [
-            warning_msg(
-                ErrorMessages.INCORRECT_OS_VERSION
-                + f"Current version: {os_version},"
-                + f" required: {MIN_REQUIRED_OS_VERSION}\n"
-            )
-        ],
-        condition=UnlessCondition(os_version_correct),
-    )
+    preflight_check = PreflightCheck(MIN_REQUIRED_OS_VERSION)
 
     delayed_action = TimerAction(
         period=10.0,
@@ -217,12 +230,14 @@ def generate_launch_description():
     actions = [
         declare_exit_on_wrong_hw_arg,
         declare_common_dir_path_arg,
+        declare_config_bundle_path_arg,
         declare_disable_manager_arg,
         declare_log_level_arg,
+        declare_log_pipeline_arg,
         declare_namespace_arg,
         welcome_info,
         incorrect_hw_config_action,
-        incorrect_os_version_action,
+        preflight_check,
         driver_actions,
     ]
 
@@ -15,14 +15,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from husarion_ugv_utils.logging import limit_log_level_to_info
+from husarion_ugv_utils.logging import LogLevelPolicy
+from husarion_ugv_utils.substitutions import (
+    BundledConfig,
+    DefaultWheelType,
+    LogPipelinePrefix,
+    NamespacedLogUnit,
+    NamespacedPrefix,
+    ReplaceString,
+)
+from husarion_ugv_utils.supervision import Criticality, SupervisedProcess
 from launch import LaunchDescription
 from launch.actions import (
     DeclareLaunchArgument,
     GroupAction,
     IncludeLaunchDescription,
     RegisterEventHandler,
-    Shutdown,
 )
 from launch.conditions import UnlessCondition
 from launch.event_handlers import OnProcessExit
@@ -35,7 +43,6 @@ from launch.substitutions import (
 )
 from launch_ros.actions import Node, SetParameter
 from launch_ros.substitutions import FindPackageShare
-from nav2_common.launch import ReplaceString
 
 
 def generate_launch_description():
@@ -57,6 +64,16 @@ def generate_launch_description():
         ]
     )
 
+    config_bundle_path = LaunchConfiguration("config_bundle_path")
+    declare_config_bundle_path_arg = DeclareLaunchArgument(
+        "config_bundle_path",
+        default_value="",
+        description=(
+            "Path to the configuration bundle compiled with 'ros2 run husarion_ugv_utils "
+            "compile_config_bundle'. If set, default configuration files are taken from it."
+        ),
+    )
+
     robot_model = LaunchConfiguration("robot_model")
     declare_robot_model_arg = DeclareLaunchArgument(
         "robot_model",
@@ -69,12 +86,16 @@ def generate_launch_description():
     controller_config_path = LaunchConfiguration("controller_config_path")
     declare_controller_config_path_arg = DeclareLaunchArgument(
         "controller_config_path",
-        default_value=PathJoinSubstitution(
-            [
-                husarion_ugv_controller_common_dir,
-                "config",
-                PythonExpression(["'", wheel_type, "_controller.yaml'"]),
-            ]
+        default_value=BundledConfig(
+            config_bundle_path,
+            "controller",
+            PathJoinSubstitution(
+                [
+                    husarion_ugv_controller_common_dir,
+                    "config",
+                    PythonExpression(["'", wheel_type, "_controller.yaml'"]),
+                ]
+            ),
         ),
         description=(
             "Path to controller configuration file. By default, it is located in"
@@ -91,6 +112,19 @@ def generate_launch_description():
         description="Logging level",
     )
 
+    log_policy = LogLevelPolicy(log_level)
+
+    log_pipeline = LaunchConfiguration("log_pipeline")
+    declare_log_pipeline_arg = DeclareLaunchArgument(
+        "log_pipeline",
+        default_value="False",
+        description=(
+            "Run ros2_control_node and spawners through the log pipeline, which rate limits their"
+            " output and writes it to compressed JSON lines files in '$ROS_LOG_DIR/husarion_ugv'."
+        ),
+        choices=["True", "true", "False", "false"],
+    )
+
     namespace = LaunchConfiguration("namespace")
     declare_namespace_arg = DeclareLaunchArgument(
         "namespace",
@@ -106,10 +140,9 @@ def generate_launch_description():
         choices=["True", "true", "False", "false"],
     )
 
-    default_wheel_type = {"lynx": "WH05", "panther": "WH01"}
     declare_wheel_type_arg = DeclareLaunchArgument(
         "wheel_type",
-        default_value=PythonExpression([f"{default_wheel_type}['", robot_model, "']"]),
+        default_value=DefaultWheelType(robot_model),
         description=(
             "Specify the wheel type. If the selected wheel type is not 'custom', "
             "the 'wheel_config_path' and 'controller_config_path' arguments will be "
@@ -131,61 +164,40 @@ def generate_launch_description():
         }.items(),
     )
 
-    ns = PythonExpression(["'", namespace, "' + '/' if '", namespace, "' else ''"])
+    ns = NamespacedPrefix(namespace)
     ns_controller_config_path = ReplaceString(controller_config_path, {"<namespace>/": ns})
 
-    joint_state_broadcaster_log_unit = PythonExpression(
-        [
-            "'",
-            namespace,
-            "' + '.joint_state_broadcaster' if '",
-            namespace,
-            "' else 'joint_state_broadcaster'",
-        ]
-    )
-    controller_manager_log_unit = PythonExpression(
-        [
-            "'",
-            namespace,
-            "' + '.controller_manager' if '",
-            namespace,
-            "' else 'controller_manager'",
-        ]
-    )
+    joint_state_broadcaster_log_unit = NamespacedLogUnit(namespace, "joint_state_broadcaster")
+    controller_manager_log_unit = NamespacedLogUnit(namespace, "controller_manager")
 
-    control_node = Node(
-        package="controller_manager",
-        executable="ros2_control_node",
-        parameters=[ns_controller_config_path],
-        namespace=namespace,
-        remappings=[
-            ("/diagnostics", "diagnostics"),
-            ("drive_controller/cmd_vel", "cmd_vel"),
-            ("drive_controller/odom", "odometry/wheels"),
-            ("drive_controller/transition_event", "_drive_controller/transition_event"),
-            ("imu_broadcaster/imu", "imu/data"),
-            ("imu_broadcaster/transition_event", "_imu_broadcaster/transition_event"),
-            (
-                "joint_state_broadcaster/transition_event",
-                "_joint_state_broadcaster/transition_event",
+    control_node = SupervisedProcess(
+        lambda: Node(
+            package="controller_manager",
+            executable="ros2_control_node",
+            parameters=[ns_controller_config_path],
+            namespace=namespace,
+            remappings=[
+                ("/diagnostics", "diagnostics"),
+                ("drive_controller/cmd_vel", "cmd_vel"),
+                ("drive_controller/odom", "odometry/wheels"),
+                ("drive_controller/transition_event", "_drive_controller/transition_event"),
+                ("imu_broadcaster/imu", "imu/data"),
+                ("imu_broadcaster/transition_event", "_imu_broadcaster/transition_event"),
+                (
+                    "joint_state_broadcaster/transition_event",
+                    "_joint_state_broadcaster/transition_event",
+                ),
+            ],
+            arguments=log_policy.arguments(
+                "pluginlib.ClassLoader",
+                joint_state_broadcaster_log_unit,
+                controller_manager_log_unit,
             ),
-        ],
-        arguments=[
-            "--ros-args",
-            "--log-level",
-            log_level,
-            "--log-level",
-            limit_log_level_to_info("rcl", log_level),
-            "--log-level",
-            limit_log_level_to_info("pluginlib.ClassLoader", log_level),
-            "--log-level",
-            limit_log_level_to_info(joint_state_broadcaster_log_unit, log_level),
-            "--log-level",
-            limit_log_level_to_info(controller_manager_log_unit, log_level),
-        ],
+            emulate_tty=True,
+            prefix=LogPipelinePrefix(log_pipeline, controller_manager_log_unit),
+        ),
+        criticality=Criticality.CRITICAL,
         condition=UnlessCondition(use_sim),
-        emulate_tty=True,
-        on_exit=Shutdown(),
     )
 
     spawner_common_args = [
@@ -193,11 +205,7 @@ def generate_launch_description():
         "controller_manager",
         "--controller-manager-timeout",
         "10",
-        "--ros-args",
-        "--log-level",
-        log_level,
-        "--log-level",
-        limit_log_level_to_info("rcl", log_level),
+        *log_policy.arguments(),
     ]
 
     joint_state_broadcaster_spawner = Node(
@@ -206,6 +214,9 @@ def generate_launch_description():
         arguments=["joint_state_broadcaster", *spawner_common_args],
         namespace=namespace,
         emulate_tty=True,
+        prefix=LogPipelinePrefix(
+            log_pipeline, NamespacedLogUnit(namespace, "joint_state_broadcaster_spawner")
+        ),
     )
 
     drive_controller_spawner = Node(
@@ -214,6 +225,9 @@ def generate_launch_description():
         arguments=["drive_controller", *spawner_common_args],
         namespace=namespace,
         emulate_tty=True,
+        prefix=LogPipelinePrefix(
+            log_pipeline, NamespacedLogUnit(namespace, "drive_controller_spawner")
+        ),
     )
 
     imu_broadcaster_spawner = Node(
@@ -222,6 +236,9 @@ def generate_launch_description():
         arguments=["imu_broadcaster", *spawner_common_args],
         namespace=namespace,
         emulate_tty=True,
+        prefix=LogPipelinePrefix(
+            log_pipeline, NamespacedLogUnit(namespace, "imu_broadcaster_spawner")
+        ),
     )
 
     # Launch spawner one after another
@@ -250,12 +267,14 @@ def generate_launch_description():
 
     actions = [
         declare_common_dir_path_arg,
+        declare_config_bundle_path_arg,
         declare_robot_model_arg,  # robot_model is used by wheel_type
         declare_wheel_type_arg,  # wheel_type is used by controller_config_path
         declare_controller_config_path_arg,
         declare_namespace_arg,
         declare_use_sim_arg,
         declare_log_level_arg,
+        declare_log_pipeline_arg,
         SetParameter(name="use_sim_time", value=use_sim),
         load_urdf,
         control_node,
@@ -17,6 +17,12 @@
 
 import os
 
+from husarion_ugv_utils.substitutions import (
+    BundledConfig,
+    DefaultWheelType,
+    NamespacedPrefix,
+    ReplaceString,
+)
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument
 from launch.substitutions import (
@@ -29,7 +35,6 @@ from launch.substitutions import (
 )
 from launch_ros.actions import Node, SetParameter
 from launch_ros.substitutions import FindPackageShare
-from nav2_common.launch import ReplaceString
 
 
 def generate_launch_description():
@@ -40,6 +45,16 @@ def generate_launch_description():
         description="Path to the common configuration directory.",
     )
 
+    config_bundle_path = LaunchConfiguration("config_bundle_path")
+    declare_config_bundle_path_arg = DeclareLaunchArgument(
+        "config_bundle_path",
+        default_value="",
+        description=(
+            "Path to the configuration bundle compiled with 'ros2 run husarion_ugv_utils "
+            "compile_config_bundle'. If set, default configuration files are taken from it."
+        ),
+    )
+
     description_pkg = FindPackageShare("husarion_ugv_description")
     description_common_dir = PythonExpression(
         [
@@ -67,7 +82,11 @@ def generate_launch_description():
     components_config_path = LaunchConfiguration("components_config_path")
     declare_components_config_path_arg = DeclareLaunchArgument(
         "components_config_path",
-        default_value=PathJoinSubstitution([description_common_dir, "config", "components.yaml"]),
+        default_value=BundledConfig(
+            config_bundle_path,
+            "components",
+            PathJoinSubstitution([description_common_dir, "config", "components.yaml"]),
+        ),
         description=(
             "Specify file which contains components. These components will be included in URDF."
             "Available options can be found in manuals: https://husarion.com/manuals"
@@ -78,12 +97,16 @@ def generate_launch_description():
     controller_config_path = LaunchConfiguration("controller_config_path")
     declare_controller_config_path_arg = DeclareLaunchArgument(
         "controller_config_path",
-        default_value=PathJoinSubstitution(
-            [
-                FindPackageShare("husarion_ugv_controller"),
-                "config",
-                PythonExpression(["'", wheel_type, "_controller.yaml'"]),
-            ]
+        default_value=BundledConfig(
+            config_bundle_path,
+            "controller",
+            PathJoinSubstitution(
+                [
+                    FindPackageShare("husarion_ugv_controller"),
+                    "config",
+                    PythonExpression(["'", wheel_type, "_controller.yaml'"]),
+                ]
+            ),
         ),
         description=(
             "Path to controller configuration file. By default, it is located in"
@@ -118,12 +141,16 @@ def generate_launch_description():
     wheel_config_path = LaunchConfiguration("wheel_config_path")
     declare_wheel_config_path_arg = DeclareLaunchArgument(
         "wheel_config_path",
-        default_value=PathJoinSubstitution(
-            [
-                FindPackageShare("husarion_ugv_description"),
-                "config",
-                PythonExpression(["'", wheel_type, ".yaml'"]),
-            ]
+        default_value=BundledConfig(
+            config_bundle_path,
+            "wheel",
+            PathJoinSubstitution(
+                [
+                    FindPackageShare("husarion_ugv_description"),
+                    "config",
+                    PythonExpression(["'", wheel_type, ".yaml'"]),
+                ]
+            ),
         ),
         description=(
             "Path to wheel configuration file. By default, it is located in "
@@ -132,10 +159,9 @@ def generate_launch_description():
         ),
     )
 
-    default_wheel_type = {"lynx": "WH05", "panther": "WH01"}
     declare_wheel_type_arg = DeclareLaunchArgument(
         "wheel_type",
-        default_value=PythonExpression([f"{default_wheel_type}['", robot_model, "']"]),
+        default_value=DefaultWheelType(robot_model),
         description=(
             "Specify the wheel type. If the selected wheel type is not 'custom', "
             "the 'wheel_config_path' and 'controller_config_path' arguments will be "
@@ -144,7 +170,7 @@ def generate_launch_description():
         choices=["WH01", "WH02", "WH04", "WH05", "custom"],
     )
 
-    ns = PythonExpression(["'", namespace, "' + '/' if '", namespace, "' else ''"])
+    ns = NamespacedPrefix(namespace)
     ns_controller_config_path = ReplaceString(controller_config_path, {"<namespace>/": ns})
 
     # Get URDF via xacro
@@ -181,7 +207,7 @@ def generate_launch_description():
         ]
     )
 
-    namespace_ext = PythonExpression(["'", namespace, "' + '/' if '", namespace, "' else ''"])
+    namespace_ext = NamespacedPrefix(namespace)
 
     robot_state_pub_node = Node(
         package="robot_state_publisher",
@@ -196,6 +222,7 @@ def generate_launch_description():
 
     actions = [
         declare_common_dir_path_arg,
+        declare_config_bundle_path_arg,
         declare_battery_config_path_arg,
         declare_components_config_path_arg,
         declare_robot_model_arg,  # robot_model is used by wheel_type
@@ -17,8 +17,10 @@
 
 import os
 
+from husarion_ugv_utils.actions import SetRobotDescription
+from husarion_ugv_utils.substitutions import DefaultWheelType, NamespacedPrefix
 from launch import LaunchDescription
-from launch.actions import DeclareLaunchArgument, ExecuteProcess
+from launch.actions import DeclareLaunchArgument
 from launch.substitutions import (
     Command,
     EnvironmentVariable,
@@ -113,10 +115,9 @@ def generate_launch_description():
         ),
     )
 
-    default_wheel_type = {"lynx": "WH05", "panther": "WH01"}
     declare_wheel_type_arg = DeclareLaunchArgument(
         "wheel_type",
-        default_value=PythonExpression([f"{default_wheel_type}['", robot_model, "']"]),
+        default_value=DefaultWheelType(robot_model),
         description=(
             "Specify the wheel type. If the selected wheel type is not 'custom', "
             "the 'wheel_config_path' and 'controller_config_path' arguments will be "
@@ -159,18 +160,11 @@ def generate_launch_description():
         ]
     )
 
-    namespace_ext = PythonExpression(["'", namespace, "' + '/' if '", namespace, "' else ''"])
-
-    set_robot_description = ExecuteProcess(
-        cmd=[
-            "ros2",
-            "param",
-            "set",
-            [namespace_ext, "robot_state_publisher"],
-            "robot_description",
-            robot_description_content,
-        ],
-        output="screen",
+    namespace_ext = NamespacedPrefix(namespace)
+
+    set_robot_description = SetRobotDescription(
+        robot_description=robot_description_content,
+        node_name=[namespace_ext, "robot_state_publisher"],
     )
 
     actions = [
@@ -15,17 +15,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from husarion_ugv_utils.substitutions import NamespacedPrefix, ReplaceString
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument
 from launch.substitutions import (
     EnvironmentVariable,
     LaunchConfiguration,
     PathJoinSubstitution,
-    PythonExpression,
 )
 from launch_ros.actions import Node, SetParameter
 from launch_ros.substitutions import FindPackageShare
-from nav2_common.launch import ReplaceString
 
 
 def generate_launch_description():
@@ -54,7 +53,7 @@ def generate_launch_description():
         choices=["True", "true", "False", "false"],
     )
 
-    ns_ext = PythonExpression(["'", namespace, "' + '/' if '", namespace, "' else ''"])
+    ns_ext = NamespacedPrefix(namespace)
 
     rviz_config = ReplaceString(
         source_file=rviz_config,
@@ -16,13 +16,13 @@
 
 import unittest
 
-import launch
 import launch_testing
 import pytest
 from diagnostic_msgs.msg import DiagnosticArray
+from husarion_ugv_utils.readiness import ReadyWhen, TopicPublished
+from husarion_ugv_utils.ros_test_fixture import SharedTestNode
 from launch import LaunchDescription
 from launch_ros.actions import Node
-from launch_testing_ros import WaitForTopics
 
 from husarion_ugv_msgs.msg import SystemStatus
 
@@ -35,12 +35,10 @@ def generate_test_description():
         executable="system_monitor_node",
     )
 
-    # Start test after 1s
-    delay_timer = launch.actions.TimerAction(
-        period=1.0, actions=[launch_testing.actions.ReadyToTest()]
-    )
+    # Start test as soon as the node publishes its topics
+    ready_to_test = ReadyWhen([TopicPublished("system_status"), TopicPublished("diagnostics")])
 
-    actions = [system_monitor_node, delay_timer]
+    actions = [system_monitor_node, ready_to_test]
 
     context = {}
 
@@ -56,12 +54,16 @@ class TestNodeInitialization(unittest.TestCase):
 
 
 class TestNode(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._test_node = SharedTestNode.get()
+
     def test_msg(self):
         topic_list = [("system_status", SystemStatus), ("diagnostics", DiagnosticArray)]
 
-        with WaitForTopics(topic_list, timeout=5.0) as wait_for_topics:
-            received_topics_str = ", ".join(wait_for_topics.topics_received())
-            print("Received messages from the following topics: [" + received_topics_str + "]")
+        received_topics = self._test_node.wait_for_topics(topic_list, timeout=5.0)
+        self.assertEqual(received_topics, {topic for topic, _ in topic_list})
+        print("Received messages from the following topics: [" + ", ".join(received_topics) + "]")
 
 
 @launch_testing.post_shutdown_test()
@@ -15,7 +15,14 @@
 # limitations under the License.
 
 
-from husarion_ugv_utils.logging import limit_log_level_to_info
+from husarion_ugv_utils.logging import LogLevelPolicy
+from husarion_ugv_utils.substitutions import (
+    LogPipelinePrefix,
+    NamespacedFrame,
+    NamespacedLogUnit,
+    NamespacedPrefix,
+    ReplaceString,
+)
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument, IncludeLaunchDescription
 from launch.conditions import IfCondition, UnlessCondition
@@ -28,7 +35,6 @@ from launch.substitutions import (
 )
 from launch_ros.actions import Node, SetUseSimTime
 from launch_ros.substitutions import FindPackageShare
-from nav2_common.launch import ReplaceString
 
 
 def generate_launch_description():
@@ -93,6 +99,19 @@ def generate_launch_description():
         description="Logging level",
     )
 
+    log_policy = LogLevelPolicy(log_level)
+
+    log_pipeline = LaunchConfiguration("log_pipeline")
+    declare_log_pipeline_arg = DeclareLaunchArgument(
+        "log_pipeline",
+        default_value="False",
+        description=(
+            "Rate limit output of high-frequency nodes and write it to compressed JSON lines files"
+            " in '$ROS_LOG_DIR/husarion_ugv'. Recommended with 'log_level:=DEBUG'."
+        ),
+        choices=["True", "true", "False", "false"],
+    )
+
     namespace = LaunchConfiguration("namespace")
     declare_namespace_arg = DeclareLaunchArgument(
         "namespace",
@@ -163,6 +182,7 @@ def generate_launch_description():
         ),
         launch_arguments={
             "log_level": log_level,
+            "log_pipeline": log_pipeline,
             "namespace": namespace,
             "publish_robot_state": "False",
             "use_sim": "True",
@@ -204,7 +224,7 @@ def generate_launch_description():
     )
 
     model_name = PythonExpression(["'", namespace, "' if '", namespace, "' else 'panther'"])
-    ns = PythonExpression(["'", namespace, "' + '/' if '", namespace, "' else ''"])
+    ns = NamespacedPrefix(namespace)
     namespaced_gz_bridge_config_path = ReplaceString(
         source_file=gz_bridge_config_path,
         replacements={"<model_name>": model_name, "<namespace>/": ns},
@@ -216,17 +236,12 @@ def generate_launch_description():
         name="gz_bridge",
         parameters=[{"config_file": namespaced_gz_bridge_config_path}],
         namespace=namespace,
-        arguments=[
-            "--ros-args",
-            "--log-level",
-            log_level,
-            "--log-level",
-            limit_log_level_to_info("rcl", log_level),
-        ],
+        arguments=log_policy.arguments(),
         emulate_tty=True,
+        prefix=LogPipelinePrefix(log_pipeline, NamespacedLogUnit(namespace, "gz_bridge")),
     )
 
-    child_tf = PythonExpression(["'", namespace, "' + '/odom' if '", namespace, "' else 'odom'"])
+    child_tf = NamespacedFrame(namespace, "odom")
 
     world_transform = Node(
         package="tf2_ros",
@@ -263,6 +278,7 @@ def generate_launch_description():
         declare_disable_manager_arg,
         declare_gz_bridge_config_path_arg,
         declare_log_level_arg,
+        declare_log_pipeline_arg,
         declare_namespace_arg,
         SetUseSimTime(True),
         spawn_robot_launch,
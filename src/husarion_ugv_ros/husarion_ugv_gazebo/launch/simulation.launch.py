@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from husarion_ugv_utils.substitutions import ReplaceString
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument, IncludeLaunchDescription
 from launch.conditions import IfCondition
@@ -25,7 +26,6 @@ from launch.substitutions import (
 )
 from launch_ros.actions import Node, SetUseSimTime
 from launch_ros.substitutions import FindPackageShare
-from nav2_common.launch import ReplaceString
 
 
 def generate_launch_description():
@@ -111,24 +111,6 @@ def generate_launch_description():
         ),
         condition=IfCondition(use_rviz),
     )
-    zed_cam_bridge_launch = IncludeLaunchDescription(
-        PythonLaunchDescriptionSource(
-            PathJoinSubstitution(
-                [
-                    FindPackageShare("ros_components_description"), # Assuming this is the package where gz_lidar_slamtec_launch.py is
-                    "launch", # Or whatever subdirectory it's in
-                    "gz_stereolabs_zed.launch.py", # The name of THIS file
-                ]
-            )
-        ),
-        launch_arguments={
-            "robot_namespace": namespace, 
-            "device_namespace": "front_cam", # Pass the main namespace
-            # "device_namespace": "lidar", # Optional: if you want to further namespace this specific lidar
-                                          # If not passed, it will use the default "" from its own declaration
-            # "gz_bridge_name": "lidar_bridge" # Optional: to give it a unique name if you have other bridges
-        }.items(),
-    )
     zed_cam_bridge_launch_front = IncludeLaunchDescription(
         PythonLaunchDescriptionSource(
             PathJoinSubstitution(
@@ -15,7 +15,7 @@
 # limitations under the License.
 
 
-from husarion_ugv_utils.logging import limit_log_level_to_info
+from husarion_ugv_utils.logging import LogLevelPolicy
 from husarion_ugv_utils.messages import welcome_msg
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument, IncludeLaunchDescription
@@ -38,6 +38,8 @@ def generate_launch_description():
         description="Logging level",
     )
 
+    log_policy = LogLevelPolicy(log_level)
+
     namespace = LaunchConfiguration("namespace")
     declare_namespace_arg = DeclareLaunchArgument(
         "namespace",
@@ -123,11 +125,7 @@ def generate_launch_description():
             pitch,
             "-Y",
             yaw,
-            "--ros-args",
-            "--log-level",
-            log_level,
-            "--log-level",
-            limit_log_level_to_info("rcl", log_level),
+            *log_policy.arguments(),
         ],
         namespace=namespace,
         emulate_tty=True,
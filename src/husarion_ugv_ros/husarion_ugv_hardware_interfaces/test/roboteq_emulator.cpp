@@ -0,0 +1,126 @@
+// Copyright 2024 Husarion sp. z o.o.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+// Standalone emulator of Roboteq motor controllers on an existing (virtual) CAN interface, used to
+// run the hardware interfaces without the robot, e.g. for benchmarking the bringup.
+//
+// Usage: roboteq_emulator [--can-interface robot_can] [--node-ids 1,2]
+//   [--encoder-resolution 1600] [--max-rpm-motor-speed 3600]
+
+#include <chrono>
+#include <csignal>
+#include <cstdint>
+#include <iostream>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include <pthread.h>
+
+#include "utils/mock_roboteq.hpp"
+
+namespace
+{
+
+struct EmulatorSettings
+{
+  std::string can_interface_name = "robot_can";
+  std::vector<std::uint8_t> node_ids = {1, 2};
+  float encoder_resolution = 1600.0;
+  float max_rpm_motor_speed = 3600.0;
+};
+
+std::vector<std::uint8_t> ParseNodeIds(const std::string & value)
+{
+  std::vector<std::uint8_t> node_ids;
+  std::stringstream stream(value);
+  std::string node_id;
+  while (std::getline(stream, node_id, ',')) {
+    node_ids.push_back(static_cast<std::uint8_t>(std::stoi(node_id)));
+  }
+  return node_ids;
+}
+
+EmulatorSettings ParseArguments(int argc, char ** argv)
+{
+  EmulatorSettings settings;
+  for (int i = 1; i < argc; ++i) {
+    const std::string argument = argv[i];
+    if (i + 1 >= argc) {
+      throw std::invalid_argument("Missing value of the argument: " + argument);
+    }
+    const std::string value = argv[++i];
+
+    if (argument == "--can-interface") {
+      settings.can_interface_name = value;
+    } else if (argument == "--node-ids") {
+      settings.node_ids = ParseNodeIds(value);
+    } else if (argument == "--encoder-resolution") {
+      settings.encoder_resolution = std::stof(value);
+    } else if (argument == "--max-rpm-motor-speed") {
+      settings.max_rpm_motor_speed = std::stof(value);
+    } else {
+      throw std::invalid_argument("Unknown argument: " + argument);
+    }
+  }
+  return settings;
+}
+
+}  // namespace
+
+int main(int argc, char ** argv)
+{
+  EmulatorSettings settings;
+  try {
+    settings = ParseArguments(argc, argv);
+  } catch (const std::exception & e) {
+    std::cerr << e.what() << std::endl;
+    return 2;
+  }
+
+  // Signals are blocked before CANopen threads are created, so they are received only by sigwait
+  sigset_t signals;
+  sigemptyset(&signals);
+  sigaddset(&signals, SIGINT);
+  sigaddset(&signals, SIGTERM);
+  pthread_sigmask(SIG_BLOCK, &signals, nullptr);
+
+  husarion_ugv_hardware_interfaces_test::MockRoboteq mock_roboteq;
+  try {
+    // Same periods as configured in Roboteq drivers of the robot
+    mock_roboteq.Start(
+      std::chrono::milliseconds(10), std::chrono::milliseconds(50), settings.can_interface_name,
+      settings.node_ids);
+  } catch (const std::exception & e) {
+    std::cerr << "Failed to start Roboteq emulator: " << e.what() << std::endl;
+    return 1;
+  }
+
+  for (const auto node_id : settings.node_ids) {
+    auto driver = mock_roboteq.GetDriver(node_id);
+    driver->SetVoltage(390);
+    driver->SetTemperature(30);
+    driver->SetHeatsinkTemperature(30);
+    driver->EnableMotorsSimulation(settings.encoder_resolution, settings.max_rpm_motor_speed);
+  }
+
+  std::cout << "Roboteq emulator ready on " << settings.can_interface_name << std::endl;
+
+  int received_signal;
+  sigwait(&signals, &received_signal);
+
+  mock_roboteq.Stop();
+  return 0;
+}
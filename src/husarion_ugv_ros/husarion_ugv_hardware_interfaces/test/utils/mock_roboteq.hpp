@@ -15,11 +15,16 @@
 #ifndef HUSARION_UGV_HARDWARE_INTERFACES_TEST_UTILS_MOCK_ROBOTEQ_HPP_
 #define HUSARION_UGV_HARDWARE_INTERFACES_TEST_UTILS_MOCK_ROBOTEQ_HPP_
 
+#include <array>
 #include <atomic>
 #include <condition_variable>
 #include <cstdint>
 #include <filesystem>
+#include <map>
+#include <memory>
+#include <string>
 #include <thread>
+#include <vector>
 
 #include <ament_index_cpp/get_package_share_directory.hpp>
 
@@ -151,6 +156,20 @@ public:
     ClearErrorFlags();
   };
 
+  /**
+   * @brief Enables simple simulation of motors - with every motors states publish, velocity is
+   * set to the last received command and position is integrated from it
+   *
+   * @param encoder_resolution encoder ticks per motor revolution
+   * @param max_rpm_motor_speed motor speed corresponding to the command value of 1000
+   */
+  void EnableMotorsSimulation(const float encoder_resolution, const float max_rpm_motor_speed)
+  {
+    encoder_resolution_ = encoder_resolution;
+    max_rpm_motor_speed_ = max_rpm_motor_speed;
+    simulate_motors_.store(true);
+  }
+
   /**
    * @brief Creates two threads, one that will trigger motors states PDOs and second that triggers
    * driver state PDOs
@@ -166,6 +185,9 @@ public:
       auto next = std::chrono::steady_clock::now();
       while (!stop_publishing_) {
         next += motors_states_period;
+        if (simulate_motors_) {
+          UpdateMotorsStates(motors_states_period);
+        }
         TriggerMotorsStatesPublish();
         std::this_thread::sleep_until(next);
       }
@@ -238,6 +260,20 @@ public:
   }
 
 private:
+  void UpdateMotorsStates(const std::chrono::milliseconds period)
+  {
+    for (const auto channel : {DriverChannel::CHANNEL1, DriverChannel::CHANNEL2}) {
+      // Command and velocity feedback are both relative to max RPM, in range of +-1000
+      const std::int32_t cmd = GetRoboteqCmd(channel);
+      auto & position = motors_positions_[static_cast<std::uint8_t>(channel) - 1];
+      position += cmd / 1000.0 * max_rpm_motor_speed_ / 60.0 * encoder_resolution_ *
+                  std::chrono::duration<double>(period).count();
+
+      SetVelocity(channel, static_cast<std::int16_t>(cmd));
+      SetPosition(channel, static_cast<std::int32_t>(position));
+    }
+  }
+
   void TriggerMotorsStatesPublish()
   {
     // Every PDO holds two values - it is enough to send an event to just one and both will be sent
@@ -255,6 +291,11 @@ private:
   std::thread driver_state_publishing_thread_;
 
   std::atomic_bool stop_publishing_ = false;
+
+  std::atomic_bool simulate_motors_ = false;
+  float encoder_resolution_ = 0.0;
+  float max_rpm_motor_speed_ = 0.0;
+  std::array<double, 2> motors_positions_ = {0.0, 0.0};
 };
 
 /**
@@ -267,21 +308,25 @@ public:
   ~MockRoboteq() {}
 
   /**
-   * @brief Starts CAN communication and creates a simulated Roboteq, that publish PDOs with set
+   * @brief Starts CAN communication and creates simulated Roboteqs, that publish PDOs with set
    * frequencies
    *
    * @param motors_states_period period of motors states publishing thread
    * @param driver_state_period period of driver state publishing thread
+   * @param can_interface_name name of the CAN interface
+   * @param node_ids CANopen node IDs of simulated Roboteqs
    */
   void Start(
     const std::chrono::milliseconds motors_states_period,
-    const std::chrono::milliseconds driver_state_period)
+    const std::chrono::milliseconds driver_state_period,
+    const std::string & can_interface_name = "robot_can",
+    const std::vector<std::uint8_t> & node_ids = {1})
   {
     canopen_communication_started_.store(false);
     ctx_ = std::make_shared<lely::io::Context>();
 
-    canopen_communication_thread_ =
-      std::thread([this, motors_states_period, driver_state_period]() {
+    canopen_communication_thread_ = std::thread(
+      [this, motors_states_period, driver_state_period, can_interface_name, node_ids]() {
         std::string slave_eds_path =
           std::filesystem::path(
             ament_index_cpp::get_package_share_directory("husarion_ugv_hardware_interfaces")) /
@@ -297,17 +342,23 @@ public:
         auto exec = loop.get_executor();
         lely::io::Timer timer(poll, exec, CLOCK_MONOTONIC);
 
-        lely::io::CanController ctrl("robot_can");
-
-        lely::io::CanChannel chan1(poll, exec);
-        chan1.open(ctrl);
-        lely::io::Timer timer1(poll, exec, CLOCK_MONOTONIC);
-        driver_ = std::make_shared<RoboteqSlave>(
-          timer1, chan1, slave_eds_path, slave1_eds_bin_path, 1);
-
-        driver_->Reset();
-        driver_->InitializeValues();
-        driver_->StartPublishing(motors_states_period, driver_state_period);
+        lely::io::CanController ctrl(can_interface_name.c_str());
+
+        // Concise DCF of the slave only sets the heartbeat, so it is shared by all node IDs
+        std::vector<std::unique_ptr<lely::io::CanChannel>> channels;
+        std::vector<std::unique_ptr<lely::io::Timer>> timers;
+        for (const auto node_id : node_ids) {
+          channels.push_back(std::make_unique<lely::io::CanChannel>(poll, exec));
+          channels.back()->open(ctrl);
+          timers.push_back(std::make_unique<lely::io::Timer>(poll, exec, CLOCK_MONOTONIC));
+
+          auto driver = std::make_shared<RoboteqSlave>(
+            *timers.back(), *channels.back(), slave_eds_path, slave1_eds_bin_path, node_id);
+          driver->Reset();
+          driver->InitializeValues();
+          driver->StartPublishing(motors_states_period, driver_state_period);
+          drivers_.emplace(node_id, driver);
+        }
 
         {
           std::lock_guard<std::mutex> lck_g(canopen_communication_started_mtx_);
@@ -317,7 +368,9 @@ public:
 
         loop.run();
 
-        driver_->StopPublishing();
+        for (auto & driver : drivers_) {
+          driver.second->StopPublishing();
+        }
       });
 
     if (!canopen_communication_started_.load()) {
@@ -340,12 +393,16 @@ public:
       canopen_communication_thread_.join();
     }
 
-    driver_.reset();
+    drivers_.clear();
 
     canopen_communication_started_.store(false);
   }
 
-  std::shared_ptr<RoboteqSlave> GetDriver() { return driver_; }
+  std::shared_ptr<RoboteqSlave> GetDriver() { return drivers_.begin()->second; }
+  std::shared_ptr<RoboteqSlave> GetDriver(const std::uint8_t node_id)
+  {
+    return drivers_.at(node_id);
+  }
 
 private:
   std::shared_ptr<lely::io::Context> ctx_;
@@ -356,7 +413,7 @@ private:
   std::condition_variable canopen_communication_started_cond_;
   std::mutex canopen_communication_started_mtx_;
 
-  std::shared_ptr<RoboteqSlave> driver_;
+  std::map<std::uint8_t, std::shared_ptr<RoboteqSlave>> drivers_;
 };
 
 }  // namespace husarion_ugv_hardware_interfaces_test
@@ -16,9 +16,11 @@
 # limitations under the License.
 
 
-from husarion_ugv_utils.logging import limit_log_level_to_info
+from husarion_ugv_utils.logging import LogLevelPolicy
+from husarion_ugv_utils.substitutions import BundledConfig
+from husarion_ugv_utils.supervision import Criticality, SupervisedProcess
 from launch import LaunchDescription
-from launch.actions import DeclareLaunchArgument, Shutdown
+from launch.actions import DeclareLaunchArgument
 from launch.conditions import UnlessCondition
 from launch.substitutions import (
     EnvironmentVariable,
@@ -52,12 +54,26 @@ def generate_launch_description():
         ]
     )
 
+    config_bundle_path = LaunchConfiguration("config_bundle_path")
+    declare_config_bundle_path_arg = DeclareLaunchArgument(
+        "config_bundle_path",
+        default_value="",
+        description=(
+            "Path to the configuration bundle compiled with 'ros2 run husarion_ugv_utils "
+            "compile_config_bundle'. If set, default configuration files are taken from it."
+        ),
+    )
+
     animations_config = PythonExpression(["'", robot_model, "_animations.yaml'"])
 
     animations_config_path = LaunchConfiguration("animations_config_path")
     declare_animations_config_path_arg = DeclareLaunchArgument(
         "animations_config_path",
-        default_value=PathJoinSubstitution([husarion_ugv_lights_pkg, "config", animations_config]),
+        default_value=BundledConfig(
+            config_bundle_path,
+            "animations",
+            PathJoinSubstitution([husarion_ugv_lights_pkg, "config", animations_config]),
+        ),
         description="Path to a YAML file with a description of led configuration.",
     )
 
@@ -69,6 +85,8 @@ def generate_launch_description():
         description="Logging level",
     )
 
+    log_policy = LogLevelPolicy(log_level)
+
     namespace = LaunchConfiguration("namespace")
     declare_namespace_arg = DeclareLaunchArgument(
         "namespace",
@@ -93,61 +111,64 @@ def generate_launch_description():
     user_led_animations_path = LaunchConfiguration("user_led_animations_path")
     declare_user_led_animations_path_arg = DeclareLaunchArgument(
         "user_led_animations_path",
-        default_value=PathJoinSubstitution(
-            [husarion_ugv_lights_common_dir, "config", "user_animations.yaml"]
+        default_value=BundledConfig(
+            config_bundle_path,
+            "user_animations",
+            PathJoinSubstitution(
+                [husarion_ugv_lights_common_dir, "config", "user_animations.yaml"]
+            ),
         ),
         description="Path to a YAML file with a description of the user defined animations.",
     )
 
     driver_config = PythonExpression(["'", robot_model, "_driver.yaml'"])
-    driver_config_path = PathJoinSubstitution([husarion_ugv_lights_pkg, "config", driver_config])
-    lights_container = ComposableNodeContainer(
-        package="rclcpp_components",
-        name="lights_container",
-        namespace=namespace,
-        executable="component_container",
-        composable_node_descriptions=[
-            ComposableNode(
-                package="husarion_ugv_lights",
-                plugin="husarion_ugv_lights::LightsDriverNode",
-                name="lights_driver",
-                namespace=namespace,
-                remappings=[("/diagnostics", "diagnostics")],
-                parameters=[driver_config_path],
-                extra_arguments=[
-                    {"use_intra_process_comms": True},
-                ],
-                condition=UnlessCondition(use_sim),
-            ),
-            ComposableNode(
-                package="husarion_ugv_lights",
-                plugin="husarion_ugv_lights::LightsControllerNode",
-                name="lights_controller",
-                namespace=namespace,
-                parameters=[
-                    {"animations_config_path": animations_config_path},
-                    {"user_led_animations_path": user_led_animations_path},
-                ],
-                extra_arguments=[
-                    {"use_intra_process_comms": True},
-                ],
-            ),
-        ],
-        arguments=[
-            "--ros-args",
-            "--log-level",
-            log_level,
-            "--log-level",
-            limit_log_level_to_info("rcl", log_level),
-            "--log-level",
-            limit_log_level_to_info("pluginlib.ClassLoader", log_level),
-        ],
-        emulate_tty=True,
-        on_exit=Shutdown(),
+    driver_config_path = BundledConfig(
+        config_bundle_path,
+        "lights_driver",
+        PathJoinSubstitution([husarion_ugv_lights_pkg, "config", driver_config]),
+    )
+    lights_container = SupervisedProcess(
+        lambda: ComposableNodeContainer(
+            package="rclcpp_components",
+            name="lights_container",
+            namespace=namespace,
+            executable="component_container",
+            composable_node_descriptions=[
+                ComposableNode(
+                    package="husarion_ugv_lights",
+                    plugin="husarion_ugv_lights::LightsDriverNode",
+                    name="lights_driver",
+                    namespace=namespace,
+                    remappings=[("/diagnostics", "diagnostics")],
+                    parameters=[driver_config_path],
+                    extra_arguments=[
+                        {"use_intra_process_comms": True},
+                    ],
+                    condition=UnlessCondition(use_sim),
+                ),
+                ComposableNode(
+                    package="husarion_ugv_lights",
+                    plugin="husarion_ugv_lights::LightsControllerNode",
+                    name="lights_controller",
+                    namespace=namespace,
+                    parameters=[
+                        {"animations_config_path": animations_config_path},
+                        {"user_led_animations_path": user_led_animations_path},
+                    ],
+                    extra_arguments=[
+                        {"use_intra_process_comms": True},
+                    ],
+                ),
+            ],
+            arguments=log_policy.arguments("pluginlib.ClassLoader"),
+            emulate_tty=True,
+        ),
+        criticality=Criticality.RESPAWN,
     )
 
     actions = [
         declare_common_dir_path_arg,
+        declare_config_bundle_path_arg,
         declare_robot_model_arg,  # robot_model is used by animations_config_path
         declare_animations_config_path_arg,
         declare_log_level_arg,
@@ -18,22 +18,31 @@
 import unittest
 
 import husarion_ugv_utils.integration_test_utils as test_utils
-import launch
 import launch_testing
-import rclpy
-import rclpy.qos
 from diagnostic_msgs.msg import DiagnosticArray
+from husarion_ugv_utils.readiness import (
+    NodeAvailable,
+    ReadyWhen,
+    ServiceAvailable,
+    TopicPublished,
+)
+from husarion_ugv_utils.ros_test_fixture import SharedTestNode
 from launch import LaunchDescription
 from launch.substitutions import PathJoinSubstitution
 from launch_ros.actions import Node
 from launch_ros.substitutions import FindPackageShare
-from launch_testing_ros import WaitForTopics
 from sensor_msgs.msg import Image
 from std_srvs.srv import SetBool
 
 from husarion_ugv_msgs.msg import LEDAnimation
 from husarion_ugv_msgs.srv import SetLEDAnimation
 
+TOPICS = [
+    ("lights/channel_1_frame", Image),
+    ("lights/channel_2_frame", Image),
+    ("diagnostics", DiagnosticArray),
+]
+
 
 def generate_test_description():
 
@@ -55,12 +64,17 @@ def generate_test_description():
         executable="lights_driver_node",
     )
 
-    # Start test after 1s
-    delay_timer = launch.actions.TimerAction(
-        period=1.0, actions=[launch_testing.actions.ReadyToTest()]
+    # Start test as soon as nodes under test are discovered
+    ready_to_test = ReadyWhen(
+        [
+            NodeAvailable("/lights_driver"),
+            ServiceAvailable("lights/set_animation"),
+            TopicPublished("lights/channel_1_frame"),
+            TopicPublished("lights/channel_2_frame"),
+        ]
     )
 
-    actions = [lights_controller_node, lights_driver_node, delay_timer]
+    actions = [lights_controller_node, lights_driver_node, ready_to_test]
 
     context = {}
 
@@ -74,40 +88,25 @@ class TestNodesIntegration(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        rclpy.init()
-
-    @classmethod
-    def tearDownClass(cls):
-        rclpy.shutdown()
-
-    def setUp(self):
-        self._test_node = rclpy.create_node("test_node")
-        self._led_control_requested = None
-
-        self._led_control_enable_srv = self._test_node.create_service(
-            srv_type=SetBool,
-            srv_name="hardware/led_control_enable",
-            callback=self._led_control_enable_cb,
-            qos_profile=rclpy.qos.qos_profile_services_default,
-        )
+        cls._test_node = SharedTestNode.get()
+        cls._led_control_requested = None
 
-        self._set_led_animation_client = self._test_node.create_client(
-            srv_type=SetLEDAnimation,
-            srv_name="lights/set_animation",
-            qos_profile=rclpy.qos.qos_profile_services_default,
+        cls._test_node.service(SetBool, "hardware/led_control_enable", cls._led_control_enable_cb)
+        cls._set_led_animation_client = cls._test_node.client(
+            SetLEDAnimation, "lights/set_animation"
         )
+        for topic, msg_type in TOPICS:
+            cls._test_node.subscribe(topic, msg_type)
 
-    def tearDown(self):
-        self._test_node.destroy_node()
-
-    def _led_control_enable_cb(self, request, response):
-        self._led_control_requested = request.data
+    @classmethod
+    def _led_control_enable_cb(cls, request, response):
+        cls._led_control_requested = request.data
         response.success = True
         response.message = "LED control enabled"
         return response
 
     def test_initialization(self, proc_output):
-        rclpy.spin_until_future_complete(self._test_node, rclpy.task.Future(), timeout_sec=2.0)
+        self._test_node.wait_until(lambda: self._led_control_requested is not None, timeout=5.0)
 
         self.assertTrue(self._led_control_requested)
 
@@ -129,15 +128,9 @@ class TestNodesIntegration(unittest.TestCase):
     def test_msg_publishers(self):
         self._request_error_animation()
 
-        topic_list = [
-            ("lights/channel_1_frame", Image),
-            ("lights/channel_2_frame", Image),
-            ("diagnostics", DiagnosticArray),
-        ]
-
-        with WaitForTopics(topic_list, timeout=5.0) as wait_for_topics:
-            received_topics_str = ", ".join(wait_for_topics.topics_received())
-            print("Received messages from the following topics: [" + received_topics_str + "]")
+        received_topics = self._test_node.wait_for_topics(TOPICS, timeout=5.0)
+        self.assertEqual(received_topics, {topic for topic, _ in TOPICS})
+        print("Received messages from the following topics: [" + ", ".join(received_topics) + "]")
 
     def test_msg_subscribers(self):
         node_info = test_utils.get_node_info("/lights_driver")
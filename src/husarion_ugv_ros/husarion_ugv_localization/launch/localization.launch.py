@@ -14,7 +14,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from husarion_ugv_utils.logging import limit_log_level_to_info
+from husarion_ugv_utils.logging import LogLevelPolicy
+from husarion_ugv_utils.substitutions import BundledConfig
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument, IncludeLaunchDescription
 from launch.conditions import IfCondition
@@ -66,6 +67,8 @@ def generate_launch_description():
         description="Logging level",
     )
 
+    log_policy = LogLevelPolicy(log_level)
+
     namespace = LaunchConfiguration("namespace")
     declare_namespace_arg = DeclareLaunchArgument(
         "namespace",
@@ -113,11 +116,25 @@ def generate_launch_description():
         ]
     )
 
+    config_bundle_path = LaunchConfiguration("config_bundle_path")
+    declare_config_bundle_path_arg = DeclareLaunchArgument(
+        "config_bundle_path",
+        default_value="",
+        description=(
+            "Path to the configuration bundle compiled with 'ros2 run husarion_ugv_utils "
+            "compile_config_bundle'. If set, default configuration files are taken from it."
+        ),
+    )
+
     localization_config_path = LaunchConfiguration("localization_config_path")
     declare_localization_config_path_arg = DeclareLaunchArgument(
         "localization_config_path",
-        default_value=PathJoinSubstitution(
-            [husarion_ugv_localization_common_dir, "config", localization_config_filename]
+        default_value=BundledConfig(
+            config_bundle_path,
+            "localization",
+            PathJoinSubstitution(
+                [husarion_ugv_localization_common_dir, "config", localization_config_filename]
+            ),
         ),
         description="Specify the path to the localization configuration file.",
     )
@@ -134,13 +151,7 @@ def generate_launch_description():
             ("set_pose", "localization/set_pose"),
             ("toggle", "localization/toggle"),
         ],
-        arguments=[
-            "--ros-args",
-            "--log-level",
-            log_level,
-            "--log-level",
-            limit_log_level_to_info("rcl", log_level),
-        ],
+        arguments=log_policy.arguments(),
         condition=IfCondition(use_ekf),
     )
 
@@ -165,18 +176,13 @@ def generate_launch_description():
             ("gps/fix", "gps/fix"),
             ("odometry/gps", "_odometry/gps"),
         ],
-        arguments=[
-            "--ros-args",
-            "--log-level",
-            log_level,
-            "--log-level",
-            limit_log_level_to_info("rcl", log_level),
-        ],
+        arguments=log_policy.arguments(),
         condition=IfCondition(fuse_gps),
     )
 
     actions = [
         declare_common_dir_path_arg,
+        declare_config_bundle_path_arg,
         declare_fuse_gps_arg,
         declare_launch_nmea_gps_arg,
         declare_localization_mode_arg,
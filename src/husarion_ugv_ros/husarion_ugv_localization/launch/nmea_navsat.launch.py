@@ -14,7 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from husarion_ugv_utils.logging import limit_log_level_to_info
+from husarion_ugv_utils.logging import LogLevelPolicy
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument
 from launch.substitutions import (
@@ -35,6 +35,8 @@ def generate_launch_description():
         description="Logging level",
     )
 
+    log_policy = LogLevelPolicy(log_level)
+
     nmea_params_path = LaunchConfiguration("nmea_params_path")
     declare_nmea_params_path_arg = DeclareLaunchArgument(
         "nmea_params_path",
@@ -70,13 +72,7 @@ def generate_launch_description():
             ("vel", [device_namespace, "/vel"]),
             ("heading", ["_", device_namespace, "/heading"]),
         ],
-        arguments=[
-            "--ros-args",
-            "--log-level",
-            log_level,
-            "--log-level",
-            limit_log_level_to_info("rcl", log_level),
-        ],
+        arguments=log_policy.arguments(),
     )
 
     actions = [
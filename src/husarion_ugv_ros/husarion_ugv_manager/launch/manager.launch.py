@@ -14,7 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from husarion_ugv_utils.logging import limit_log_level_to_info
+from husarion_ugv_utils.logging import LogLevelPolicy
+from husarion_ugv_utils.substitutions import BundledConfig
+from husarion_ugv_utils.supervision import Criticality, SupervisedProcess
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument
 from launch.conditions import UnlessCondition
@@ -48,6 +50,16 @@ def generate_launch_description():
         ]
     )
 
+    config_bundle_path = LaunchConfiguration("config_bundle_path")
+    declare_config_bundle_path_arg = DeclareLaunchArgument(
+        "config_bundle_path",
+        default_value="",
+        description=(
+            "Path to the configuration bundle compiled with 'ros2 run husarion_ugv_utils "
+            "compile_config_bundle'. If set, default configuration files are taken from it."
+        ),
+    )
+
     husarion_ugv_manager_pkg = FindPackageShare("husarion_ugv_manager")
 
     lights_bt_project_path = LaunchConfiguration("lights_bt_project_path")
@@ -67,6 +79,8 @@ def generate_launch_description():
         description="Logging level",
     )
 
+    log_policy = LogLevelPolicy(log_level)
+
     namespace = LaunchConfiguration("namespace")
     declare_namespace_arg = DeclareLaunchArgument(
         "namespace",
@@ -86,12 +100,16 @@ def generate_launch_description():
     shutdown_hosts_config_path = LaunchConfiguration("shutdown_hosts_config_path")
     declare_shutdown_hosts_config_path_arg = DeclareLaunchArgument(
         "shutdown_hosts_config_path",
-        default_value=PathJoinSubstitution(
-            [
-                husarion_ugv_manager_common_dir,
-                "config",
-                "shutdown_hosts.yaml",
-            ]
+        default_value=BundledConfig(
+            config_bundle_path,
+            "shutdown_hosts",
+            PathJoinSubstitution(
+                [
+                    husarion_ugv_manager_common_dir,
+                    "config",
+                    "shutdown_hosts.yaml",
+                ]
+            ),
         ),
         description="Path to file with list of hosts to request shutdown.",
     )
@@ -103,25 +121,28 @@ def generate_launch_description():
         description="Whether simulation is used",
     )
 
-    lights_manager_node = Node(
-        package="husarion_ugv_manager",
-        executable="lights_manager_node",
-        name="lights_manager",
-        parameters=[
-            PathJoinSubstitution([husarion_ugv_manager_pkg, "config", "lights_manager.yaml"]),
-            {
-                "bt_project_path": lights_bt_project_path,
-            },
-        ],
-        namespace=namespace,
-        arguments=[
-            "--ros-args",
-            "--log-level",
-            log_level,
-            "--log-level",
-            limit_log_level_to_info("rcl", log_level),
-        ],
-        emulate_tty=True,
+    lights_manager_node = SupervisedProcess(
+        lambda: Node(
+            package="husarion_ugv_manager",
+            executable="lights_manager_node",
+            name="lights_manager",
+            parameters=[
+                BundledConfig(
+                    config_bundle_path,
+                    "lights_manager",
+                    PathJoinSubstitution(
+                        [husarion_ugv_manager_pkg, "config", "lights_manager.yaml"]
+                    ),
+                ),
+                {
+                    "bt_project_path": lights_bt_project_path,
+                },
+            ],
+            namespace=namespace,
+            arguments=log_policy.arguments(),
+            emulate_tty=True,
+        ),
+        criticality=Criticality.RESPAWN,
     )
 
     safety_manager_node = Node(
@@ -129,26 +150,25 @@ def generate_launch_description():
         executable="safety_manager_node",
         name="safety_manager",
         parameters=[
-            PathJoinSubstitution([husarion_ugv_manager_pkg, "config", "safety_manager.yaml"]),
+            BundledConfig(
+                config_bundle_path,
+                "safety_manager",
+                PathJoinSubstitution([husarion_ugv_manager_pkg, "config", "safety_manager.yaml"]),
+            ),
             {
                 "bt_project_path": safety_bt_project_path,
                 "shutdown_hosts_path": shutdown_hosts_config_path,
             },
         ],
         namespace=namespace,
-        arguments=[
-            "--ros-args",
-            "--log-level",
-            log_level,
-            "--log-level",
-            limit_log_level_to_info("rcl", log_level),
-        ],
+        arguments=log_policy.arguments(),
         emulate_tty=True,
         condition=UnlessCondition(use_sim),
     )
 
     actions = [
         declare_common_dir_path_arg,
+        declare_config_bundle_path_arg,
         declare_log_level_arg,
         declare_lights_bt_project_path_arg,
         declare_safety_bt_project_path_arg,
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import hashlib
+import time
+from typing import List, Optional
+
+import launch.logging
+from husarion_ugv_utils.messages import ErrorMessages, warning_msg
+from husarion_ugv_utils.preflight import get_default_probes, run_preflight_checks
+from launch.action import Action
+from launch.launch_context import LaunchContext
+from launch.some_substitutions_type import SomeSubstitutionsType
+from launch.utilities import normalize_to_list_of_substitutions, perform_substitutions
+from launch_ros.ros_adapters import get_ros_node
+from rcl_interfaces.msg import Parameter, ParameterType, ParameterValue
+from rcl_interfaces.srv import GetParameters, SetParameters
+
+
+async def _wait_for_future(future, timeout: float):
+    """Waits for an rclpy future without blocking the launch event loop."""
+    deadline = time.monotonic() + timeout
+    while not future.done():
+        if time.monotonic() > deadline:
+            future.cancel()
+            raise TimeoutError
+        await asyncio.sleep(0.005)
+    return future.result()
+
+
+class SetRobotDescription(Action):
+    """
+    Action that sets the 'robot_description' parameter of a robot_state_publisher node.
+
+    Parameter services are called from the long-lived ROS node of the launch process, so neither
+    the ros2 CLI is spawned nor the URDF is passed on a command line. The parameter is not set if
+    the hash of the new description equals the hash of the current one.
+
+    Args:
+        robot_description (SomeSubstitutionsType): URDF content.
+        node_name (SomeSubstitutionsType): Name of the robot_state_publisher node (with namespace).
+        timeout (float): Timeout in seconds for each service call.
+    """
+
+    def __init__(
+        self,
+        robot_description: SomeSubstitutionsType,
+        node_name: SomeSubstitutionsType = "robot_state_publisher",
+        timeout: float = 10.0,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        self._robot_description = normalize_to_list_of_substitutions(robot_description)
+        self._node_name = normalize_to_list_of_substitutions(node_name)
+        self._timeout = timeout
+        self._task: Optional[asyncio.Task] = None
+        self._logger = launch.logging.get_logger("set_robot_description")
+
+    def execute(self, context: LaunchContext) -> Optional[List[Action]]:
+        robot_description = perform_substitutions(context, self._robot_description)
+        node_name = perform_substitutions(context, self._node_name)
+        self._task = context.asyncio_loop.create_task(
+            self._set_robot_description(context, node_name, robot_description)
+        )
+        return None
+
+    def get_asyncio_future(self) -> Optional[asyncio.Future]:
+        return self._task
+
+    async def _set_robot_description(
+        self, context: LaunchContext, node_name: str, robot_description: str
+    ) -> None:
+        node = get_ros_node(context)
+        get_client = node.create_client(GetParameters, node_name + "/get_parameters")
+        set_client = node.create_client(SetParameters, node_name + "/set_parameters")
+        start = time.perf_counter()
+
+        try:
+            for client in (get_client, set_client):
+                available = await context.asyncio_loop.run_in_executor(
+                    None, client.wait_for_service, self._timeout
+                )
+                if not available:
+                    self._logger.error(f"Service {client.srv_name} is not available.")
+                    return
+
+            new_hash = hashlib.sha256(robot_description.encode("utf-8")).hexdigest()
+
+            response = await _wait_for_future(
+                get_client.call_async(GetParameters.Request(names=["robot_description"])),
+                self._timeout,
+            )
+            if response.values:
+                current = response.values[0].string_value
+                if hashlib.sha256(current.encode("utf-8")).hexdigest() == new_hash:
+                    self._logger.info(
+                        f"robot_description of {node_name} is up to date ({new_hash[:16]}), "
+                        "skipping update."
+                    )
+                    return
+
+            parameter = Parameter(
+                name="robot_description",
+                value=ParameterValue(
+                    type=ParameterType.PARAMETER_STRING, string_value=robot_description
+                ),
+            )
+            response = await _wait_for_future(
+                set_client.call_async(SetParameters.Request(parameters=[parameter])),
+                self._timeout,
+            )
+
+            result = response.results[0]
+            if not result.successful:
+                self._logger.error(
+                    f"Failed to set robot_description of {node_name}: {result.reason}"
+                )
+                return
+
+            self._logger.info(
+                f"robot_description of {node_name} updated ({new_hash[:16]}, "
+                f"{len(robot_description)} bytes) in "
+                f"{(time.perf_counter() - start) * 1000.0:.1f} ms."
+            )
+        except TimeoutError:
+            self._logger.error(f"Timed out setting robot_description of {node_name}.")
+        finally:
+            node.destroy_client(get_client)
+            node.destroy_client(set_client)
+
+
+class PreflightCheck(Action):
+    """
+    Action that runs pre-flight probes when it is executed and shows a warning for each failed
+    probe. Probing at execution time, instead of in generate_launch_description, keeps loading
+    and inspecting the launch description (e.g. launch_graph) free of hardware access.
+
+    Args:
+        min_required_os_version (str): Minimum required OS version.
+        can_interface (str): CAN interface of the motor controllers.
+    """
+
+    def __init__(
+        self, min_required_os_version: str, can_interface: str = "robot_can", **kwargs
+    ) -> None:
+        super().__init__(**kwargs)
+
+        self._min_required_os_version = min_required_os_version
+        self._can_interface = can_interface
+
+    def execute(self, context: LaunchContext) -> Optional[List[Action]]:
+        # Probes run concurrently, so this blocks at most for the longest probe timeout
+        report = run_preflight_checks(
+            get_default_probes(self._min_required_os_version, self._can_interface)
+        )
+        return [
+            warning_msg(
+                (
+                    ErrorMessages.INCORRECT_OS_VERSION
+                    if result.name == "os_version"
+                    else ErrorMessages.PREFLIGHT_CHECK_FAILED + f"{result.name}: "
+                )
+                + f"{result.message}\n"
+            )
+            for result in report.incompatible
+        ]
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure bringup time, control loop jitter and CPU usage without the robot hardware.
+
+Usage: sudo -E python3 -m husarion_ugv_utils.benchmarks.bringup [--robot-model panther]
+    [--runs 3] [--duration 20.0] [--startup-timeout 60.0] [--save [--label <text>]]
+    [launch_arguments ...]
+
+bringup.launch.py is started with ROBOT_HW_CONFIG_CORRECT=true and hardware stand-ins:
+- Roboteq drivers: roboteq_emulator of husarion_ugv_hardware_interfaces (built with tests) on
+  a virtual CAN interface created with the vcan module,
+- GPIO: a gpio-sim chip with lines named as on the robot, created through configfs. The chip has
+  to become /dev/gpiochip0, so the machine can't have other GPIO chips,
+- ADC: fake sysfs IIO device trees passed to the battery driver with battery_config_path.
+
+The Phidget IMU and the lights SPI device have no stand-ins, so imu_broadcaster and the lights
+driver fail to start. Requires root privileges for vcan and gpio-sim.
+
+For every run, time from the launch start to the first message on each topic is shown. Bringup
+time is the time of the last milestone, NaN if any of them didn't arrive. Jitter is the deviation
+in ms of joint_states stamp intervals from the controller manager update period, overruns are
+intervals longer than 1.5 of the period. CPU usage is the share of a single core used by all
+launched processes and by the emulator. Jitter and CPU usage are measured for duration seconds
+after the bringup.
+"""
+
+import argparse
+import os
+import select
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Dict, List
+
+import rclpy
+import yaml
+from ament_index_python.packages import get_package_share_directory
+from husarion_ugv_utils.benchmarks.process_stats import (
+    get_session_cpu_time,
+    percentile,
+    stop_sessions,
+)
+from husarion_ugv_utils.benchmarks.results import (
+    BenchmarkResult,
+    add_result_arguments,
+    save_result,
+)
+from husarion_ugv_utils.benchmarks.system_monitor import spin_for
+from nav_msgs.msg import Odometry
+from rclpy.node import Node
+from sensor_msgs.msg import BatteryState, JointState
+
+from husarion_ugv_msgs.msg import RobotDriverState, SystemStatus
+
+CAN_INTERFACE = "robot_can"
+DRIVER_NODE_IDS = {"lynx": [1], "panther": [1, 2]}
+GPIO_SIM_CONFIGFS = "/sys/kernel/config/gpio-sim"
+GPIO_CHIP = "gpiochip0"
+
+# Same as pin_names_ in husarion_ugv_hardware_interfaces/robot_system/gpio/types.hpp
+GPIO_LINES = [
+    "WATCHDOG",
+    "AUX_PW_EN",
+    "CHRG_DISABLE",
+    "CHRG_SENSE",
+    "DRIVER_EN",
+    "E_STOP_RESET",
+    "FAN_SW",
+    "GPOUT1",
+    "GPOUT2",
+    "GPIN1",
+    "GPIN2",
+    "LED_SBC_SEL",
+    "SHDN_INIT",
+    "STAGE2_INPUT",
+    "VDIG_OFF",
+    "VMOT_ON",
+    "MOTOR_ON",
+]
+# CHRG_SENSE is active low, pulled up it reports a disconnected charger
+GPIO_PULL_UP_LINES = ["CHRG_SENSE"]
+
+# Single battery at 38 V and 25 deg C, discharged with 1 A, see battery_driver_node.cpp for
+# channels and adc_battery.cpp for conversions. With scale of 1 mV, raw values are in mV.
+IIO_RAW_VALUES = {
+    "iio:device0": {
+        0: 3200,  # second battery temperature, above detection threshold - not present
+        1: 1640,  # battery temperature
+        2: 0,  # charge current
+        3: 0,
+    },
+    "iio:device1": {
+        0: 1517,  # battery voltage
+        1: 650,  # battery current, with offset of 625
+        2: 650,
+        3: 0,
+    },
+}
+
+MILESTONES = [
+    ("hardware/robot_driver_state", RobotDriverState),
+    ("joint_states", JointState),
+    ("odometry/wheels", Odometry),
+    ("system_status", SystemStatus),
+    ("battery/battery_status", BatteryState),
+    ("odometry/filtered", Odometry),
+]
+
+
+class VirtualCANInterface:
+    """Virtual CAN interface, created if it doesn't exist yet and removed afterwards."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._created = False
+
+    def __enter__(self) -> "VirtualCANInterface":
+        link = subprocess.run(
+            ["ip", "-details", "link", "show", self._name], capture_output=True, text=True
+        )
+        if link.returncode == 0:
+            if "vcan" not in link.stdout:
+                raise RuntimeError(f"Interface {self._name} exists and is not a virtual CAN.")
+        else:
+            subprocess.run(["modprobe", "vcan"], check=True)
+            subprocess.run(["ip", "link", "add", "dev", self._name, "type", "vcan"], check=True)
+            self._created = True
+        subprocess.run(["ip", "link", "set", "up", self._name], check=True)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._created:
+            subprocess.run(["ip", "link", "delete", self._name], check=False)
+
+
+class SimulatedGPIOChip:
+    """
+    GPIO chip of the gpio-sim kernel module with named lines. Input lines are pulled down,
+    except for the pull_up_lines.
+    """
+
+    def __init__(self, line_names: List[str], pull_up_lines: List[str]):
+        self._line_names = line_names
+        self._pull_up_lines = pull_up_lines
+        self._device_path = os.path.join(GPIO_SIM_CONFIGFS, f"husarion_ugv_{os.getpid()}")
+        self._bank_path = os.path.join(self._device_path, "bank0")
+
+    @staticmethod
+    def _write(path: str, value: str) -> None:
+        with open(path, mode="w", encoding="utf-8") as file:
+            file.write(value)
+
+    @staticmethod
+    def _read(path: str) -> str:
+        with open(path, mode="r", encoding="utf-8") as file:
+            return file.read().strip()
+
+    def __enter__(self) -> "SimulatedGPIOChip":
+        subprocess.run(["modprobe", "gpio-sim"], check=True)
+        os.mkdir(self._device_path)
+        try:
+            os.mkdir(self._bank_path)
+            self._write(os.path.join(self._bank_path, "num_lines"), str(len(self._line_names)))
+            for offset, name in enumerate(self._line_names):
+                line_path = os.path.join(self._bank_path, f"line{offset}")
+                os.mkdir(line_path)
+                self._write(os.path.join(line_path, "name"), name)
+            self._write(os.path.join(self._device_path, "live"), "1")
+
+            chip_name = self._read(os.path.join(self._bank_path, "chip_name"))
+            if chip_name != GPIO_CHIP:
+                raise RuntimeError(
+                    f"Simulated GPIO chip was created as {chip_name}, while hardware interfaces "
+                    f"use {GPIO_CHIP}. Other GPIO chips exist on this machine."
+                )
+
+            dev_name = self._read(os.path.join(self._device_path, "dev_name"))
+            for name in self._pull_up_lines:
+                self._write(
+                    os.path.join(
+                        "/sys/devices/platform",
+                        dev_name,
+                        chip_name,
+                        f"sim_gpio{self._line_names.index(name)}",
+                        "pull",
+                    ),
+                    "pull-up",
+                )
+        except BaseException:
+            self._remove()
+            raise
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._remove()
+
+    def _remove(self) -> None:
+        live_path = os.path.join(self._device_path, "live")
+        if os.path.exists(live_path) and self._read(live_path) == "1":
+            self._write(live_path, "0")
+        # configfs items are removed with rmdir, attributes can't be deleted
+        for offset in range(len(self._line_names)):
+            line_path = os.path.join(self._bank_path, f"line{offset}")
+            if os.path.isdir(line_path):
+                os.rmdir(line_path)
+        for path in [self._bank_path, self._device_path]:
+            if os.path.isdir(path):
+                os.rmdir(path)
+
+
+def create_iio_devices(directory: str) -> Dict[str, str]:
+    """Creates fake IIO device trees read by the battery driver. Returns their paths."""
+    device_paths = {}
+    for device, raw_values in IIO_RAW_VALUES.items():
+        device_path = os.path.join(directory, device)
+        os.makedirs(device_path)
+        for channel, raw_value in raw_values.items():
+            for data_type, value in [("raw", raw_value), ("scale", 1.0)]:
+                path = os.path.join(device_path, f"in_voltage{channel}_{data_type}")
+                with open(path, mode="w", encoding="utf-8") as file:
+                    file.write(f"{value}\n")
+        device_paths[device] = device_path
+    return device_paths
+
+
+def create_battery_config(directory: str, device_paths: Dict[str, str]) -> str:
+    """Writes battery.yaml of husarion_ugv_battery with ADC devices replaced by fake ones."""
+    config_path = os.path.join(
+        get_package_share_directory("husarion_ugv_battery"), "config", "battery.yaml"
+    )
+    with open(config_path, mode="r", encoding="utf-8") as file:
+        config = yaml.safe_load(file)
+
+    adc = config["/**"]["battery_driver"]["ros__parameters"]["adc"]
+    adc["device0"] = device_paths["iio:device0"]
+    adc["device1"] = device_paths["iio:device1"]
+
+    battery_config_path = os.path.join(directory, "battery.yaml")
+    with open(battery_config_path, mode="w", encoding="utf-8") as file:
+        yaml.safe_dump(config, file)
+    return battery_config_path
+
+
+def start_roboteq_emulator(robot_model: str, timeout: float) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            "ros2",
+            "run",
+            "husarion_ugv_hardware_interfaces",
+            "roboteq_emulator",
+            "--can-interface",
+            CAN_INTERFACE,
+            "--node-ids",
+            ",".join(str(node_id) for node_id in DRIVER_NODE_IDS[robot_model]),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+    )
+
+    # Wait for the ready line, so the bus is up before hardware interfaces try to boot drivers
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        ready, _, _ = select.select([process.stdout], [], [], 0.1)
+        if ready:
+            line = process.stdout.readline()
+            if not line or "ready" in line:
+                break
+    if process.poll() is not None or time.monotonic() >= deadline:
+        stop_sessions([process])
+        raise RuntimeError("Roboteq emulator failed to start.")
+    return process
+
+
+class BringupRecorder:
+    """Records first messages of bringup milestones and joint_states stamps."""
+
+    def __init__(self, node: Node):
+        self.node = node
+        self.first_message: Dict[str, float] = {}
+        self.joint_states_stamps: List[float] = []
+        self.start = 0.0
+        for topic, msg_type in MILESTONES:
+            node.create_subscription(
+                msg_type, topic, lambda msg, topic=topic: self._milestone_cb(topic, msg), 10
+            )
+
+    def _milestone_cb(self, topic: str, msg) -> None:
+        if topic not in self.first_message:
+            self.first_message[topic] = time.monotonic() - self.start
+        if topic == "joint_states":
+            self.joint_states_stamps.append(msg.header.stamp.sec + msg.header.stamp.nanosec * 1e-9)
+
+    def reset(self) -> None:
+        self.first_message = {}
+        self.joint_states_stamps = []
+        self.start = time.monotonic()
+
+
+def run_bringup(
+    args: argparse.Namespace,
+    recorder: BringupRecorder,
+    battery_config_path: str,
+    emulator: subprocess.Popen,
+) -> Dict[str, float]:
+    env = dict(
+        os.environ,
+        ROBOT_HW_CONFIG_CORRECT="true",
+        ROBOT_MODEL_NAME=args.robot_model,
+    )
+    command = [
+        "ros2",
+        "launch",
+        "husarion_ugv_bringup",
+        "bringup.launch.py",
+        f"battery_config_path:={battery_config_path}",
+        *args.launch_arguments,
+    ]
+
+    recorder.reset()
+    bringup = subprocess.Popen(
+        command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        env=env,
+    )
+    try:
+        spin_for(
+            recorder.node,
+            args.startup_timeout,
+            until=lambda: len(recorder.first_message) == len(MILESTONES),
+        )
+
+        recorder.joint_states_stamps = []
+        cpu_start = get_session_cpu_time([bringup.pid])
+        emulator_cpu_start = get_session_cpu_time([emulator.pid])
+        start = time.monotonic()
+        spin_for(recorder.node, args.duration)
+        elapsed = time.monotonic() - start
+        cpu_usage = (get_session_cpu_time([bringup.pid]) - cpu_start) / elapsed * 100.0
+        emulator_cpu_usage = (
+            (get_session_cpu_time([emulator.pid]) - emulator_cpu_start) / elapsed * 100.0
+        )
+    finally:
+        stop_sessions([bringup])
+
+    period = 1.0 / args.update_rate
+    intervals = [
+        current - last
+        for last, current in zip(recorder.joint_states_stamps, recorder.joint_states_stamps[1:])
+    ]
+    jitter = [abs(interval - period) * 1000.0 for interval in intervals]
+    result = {topic: recorder.first_message.get(topic, float("nan")) for topic, _ in MILESTONES}
+    # Bringup that didn't reach all milestones failed, it isn't faster
+    all_milestones = len(recorder.first_message) == len(MILESTONES)
+    result.update(
+        {
+            "bringup": max(recorder.first_message.values()) if all_milestones else float("nan"),
+            "jitter_p50": statistics.median(jitter) if jitter else float("nan"),
+            "jitter_p95": percentile(jitter, 0.95),
+            "jitter_max": max(jitter, default=float("nan")),
+            "overruns": sum(interval > 1.5 * period for interval in intervals),
+            "cpu": cpu_usage,
+            "emulator_cpu": emulator_cpu_usage,
+        }
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--robot-model", default="panther", choices=list(DRIVER_NODE_IDS))
+    parser.add_argument("--runs", type=int, default=3, help="Number of bringups.")
+    parser.add_argument(
+        "--duration", type=float, default=20.0, help="Duration of measurement after bringup."
+    )
+    parser.add_argument(
+        "--startup-timeout", type=float, default=60.0, help="Timeout of all milestones."
+    )
+    parser.add_argument(
+        "--update-rate", type=float, default=100.0, help="Update rate of the controller manager."
+    )
+    parser.add_argument(
+        "launch_arguments", nargs="*", help="Additional arguments of bringup.launch.py."
+    )
+    add_result_arguments(parser)
+    args = parser.parse_args()
+
+    if os.geteuid() != 0:
+        parser.error("root privileges are required to create vcan and gpio-sim devices")
+
+    rclpy.init()
+    node = rclpy.create_node("bringup_benchmark")
+    recorder = BringupRecorder(node)
+    tmp_dir = tempfile.mkdtemp(prefix="bringup_benchmark_")
+    benchmark_result = BenchmarkResult.from_args("bringup", args)
+
+    columns = [topic for topic, _ in MILESTONES]
+    print("Time to the first message [s]: " + ", ".join(columns))
+    print(
+        f"{'run':>4}"
+        + "".join(f"{index:>8}" for index in range(1, len(columns) + 1))
+        + f"{'bringup':>9}{'jit p50':>9}{'jit p95':>9}{'jit max':>9}{'overruns':>10}"
+        f"{'cpu %':>8}{'emu cpu %':>11}"
+    )
+    try:
+        battery_config_path = create_battery_config(tmp_dir, create_iio_devices(tmp_dir))
+        with VirtualCANInterface(CAN_INTERFACE), SimulatedGPIOChip(GPIO_LINES, GPIO_PULL_UP_LINES):
+            for run in range(1, args.runs + 1):
+                # Drivers are restarted with every bringup, as on the robot
+                emulator = start_roboteq_emulator(args.robot_model, timeout=10.0)
+                try:
+                    result = run_bringup(args, recorder, battery_config_path, emulator)
+                finally:
+                    stop_sessions([emulator])
+
+                print(
+                    f"{run:>4}"
+                    + "".join(f"{result[topic]:8.2f}" for topic in columns)
+                    + f"{result['bringup']:9.2f}{result['jitter_p50']:9.3f}"
+                    f"{result['jitter_p95']:9.3f}{result['jitter_max']:9.3f}"
+                    f"{result['overruns']:10d}{result['cpu']:8.1f}{result['emulator_cpu']:11.1f}"
+                )
+
+                for topic in columns:
+                    benchmark_result.add(f"first_{topic.replace('/', '_')}", [result[topic]], "s")
+                benchmark_result.add("bringup", [result["bringup"]], "s")
+                for name in ["jitter_p50", "jitter_p95", "jitter_max"]:
+                    benchmark_result.add(name, [result[name]], "ms")
+                benchmark_result.add("overruns", [result["overruns"]], "count")
+                benchmark_result.add("cpu", [result["cpu"]], "%")
+                benchmark_result.add("emulator_cpu", [result["emulator_cpu"]], "%")
+
+        save_result(args, benchmark_result)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        node.destroy_node()
+        rclpy.try_shutdown()
+
+
+if __name__ == "__main__":
+    main()
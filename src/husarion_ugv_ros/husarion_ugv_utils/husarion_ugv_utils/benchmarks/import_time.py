@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure import time of husarion_ugv_utils modules and husarion_ugv_* launch files.
+
+Usage: python3 -m husarion_ugv_utils.benchmarks.import_time [--budget-ms 250]
+    [--total-budget-ms 2000] [--top 5] [--launch-file <path> ...]
+
+Each module and launch file is imported in a fresh interpreter with '-X importtime'; the launch
+description itself is not generated. Only imports caused by the measured target are counted,
+interpreter startup is excluded. Exits with 1 if any target exceeds the budget or the sum of all
+targets exceeds the total budget.
+"""
+
+import argparse
+import glob
+import os
+import pkgutil
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+import husarion_ugv_utils
+
+MARKER = "husarion_ugv_import_time_start"
+
+# Executables and modules not imported by launch files
+EXCLUDED_MODULES = [
+    "benchmarks",
+    "integration_test_utils",
+    "launch_graph",
+    "launch_snapshot",
+    "log_pipeline",
+    "readiness",
+    "ros_test_fixture",
+    "sim_test_farm",
+    "synthetic_sensors",
+]
+
+LAUNCH_FILE_IMPORT = """
+import importlib.util
+spec = importlib.util.spec_from_file_location("launch_file", {path!r})
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+"""
+
+
+def measure(code: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    Runs the code in a fresh interpreter with '-X importtime'.
+
+    Returns:
+        Tuple[float, List[Tuple[float, str]]]: Total import time in milliseconds and the
+            cumulative time of top-level modules imported by the code, slowest first.
+    """
+    script = f"import sys\nsys.stderr.write('{MARKER}\\n')\n{code}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    lines = result.stderr.split(MARKER, 1)[1].splitlines()
+    modules = []
+    for line in lines:
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        # Nested imports are indented, their time is included in the parent's cumulative time
+        if not name.startswith("  "):
+            modules.append((int(cumulative) / 1000.0, name.strip()))
+
+    modules.sort(reverse=True)
+    return sum(time for time, _ in modules), modules
+
+
+def get_utils_modules() -> Dict[str, str]:
+    return {
+        f"husarion_ugv_utils.{module.name}": f"import husarion_ugv_utils.{module.name}"
+        for module in pkgutil.iter_modules(husarion_ugv_utils.__path__)
+        if module.name not in EXCLUDED_MODULES
+    }
+
+
+def get_launch_files() -> List[str]:
+    from ament_index_python.packages import get_packages_with_prefixes
+
+    launch_files = []
+    for package, prefix in sorted(get_packages_with_prefixes().items()):
+        if package.startswith("husarion_ugv_"):
+            launch_dir = os.path.join(prefix, "share", package, "launch")
+            launch_files.extend(sorted(glob.glob(os.path.join(launch_dir, "*.launch.py"))))
+    return launch_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--budget-ms", type=float, default=250.0, help="Import time budget of a single target."
+    )
+    parser.add_argument(
+        "--total-budget-ms", type=float, default=2000.0, help="Import time budget of all targets."
+    )
+    parser.add_argument("--top", type=int, default=3, help="Number of slowest imports shown.")
+    parser.add_argument(
+        "--launch-file",
+        nargs="*",
+        default=None,
+        help="Launch files to measure. By default all installed husarion_ugv_* launch files.",
+    )
+    args = parser.parse_args()
+
+    targets = get_utils_modules()
+    launch_files = args.launch_file if args.launch_file is not None else get_launch_files()
+    for path in launch_files:
+        targets[os.path.basename(path)] = LAUNCH_FILE_IMPORT.format(path=path)
+
+    total = 0.0
+    failed = []
+    for name, code in targets.items():
+        try:
+            import_time, modules = measure(code)
+        except RuntimeError as e:
+            print(f"{name:<44} failed: {e}")
+            failed.append(name)
+            continue
+
+        total += import_time
+        over_budget = import_time > args.budget_ms
+        if over_budget:
+            failed.append(name)
+
+        slowest = ", ".join(f"{module} {time:.1f}" for time, module in modules[: args.top])
+        status = "OVER BUDGET" if over_budget else ""
+        print(f"{name:<44} {import_time:8.1f} ms  {status:<11} [{slowest}]")
+
+    print(f"\n{'total':<44} {total:8.1f} ms  (budget: {args.total_budget_ms:.0f} ms)")
+    if total > args.total_budget_ms:
+        failed.append("total")
+
+    if failed:
+        print(f"Import time check failed (budget: {args.budget_ms:.0f} ms): {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
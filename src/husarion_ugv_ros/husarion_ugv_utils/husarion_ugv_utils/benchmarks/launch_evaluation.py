@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure launch description evaluation time of bringup.launch.py and a multi-robot simulation.
+
+Usage: python3 -m husarion_ugv_utils.benchmarks.launch_evaluation [--robots 10]
+    [--repetitions 5] [--save [--label <text>]] [launch_argument:=value ...]
+
+Launch descriptions are evaluated without starting any process: launch arguments, includes,
+groups and conditions are resolved and substitutions of all nodes are performed (this includes
+URDF generation with xacro). The cost of namespace and log level substitutions alone is compared
+with the equivalent PythonExpression constructs.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, Iterable, List
+
+from ament_index_python.packages import get_package_share_directory
+from husarion_ugv_utils.benchmarks.results import (
+    BenchmarkResult,
+    add_result_arguments,
+    save_result,
+)
+from husarion_ugv_utils.logging import LimitedLogLevel
+from husarion_ugv_utils.substitutions import (
+    DefaultWheelType,
+    NamespacedFrame,
+    NamespacedLogUnit,
+    NamespacedPrefix,
+)
+from launch import LaunchContext, LaunchDescription, LaunchDescriptionEntity
+from launch.actions import (
+    EmitEvent,
+    ExecuteProcess,
+    GroupAction,
+    IncludeLaunchDescription,
+    RegisterEventHandler,
+    Shutdown,
+    TimerAction,
+)
+from launch.launch_description_sources import PythonLaunchDescriptionSource
+from launch.substitutions import LaunchConfiguration, PythonExpression
+from launch_ros.actions import Node
+
+
+def evaluate(entities: Iterable[LaunchDescriptionEntity], context: LaunchContext) -> int:
+    """Resolve entities like the launch service does, but without executing processes."""
+    processes = 0
+
+    for entity in entities:
+        condition = getattr(entity, "condition", None)
+        if condition is not None and not condition.evaluate(context):
+            continue
+
+        if isinstance(entity, ExecuteProcess):
+            if isinstance(entity, Node):
+                entity._perform_substitutions(context)
+            entity.process_description.prepare(context, entity)
+            processes += 1
+        elif isinstance(entity, TimerAction):
+            processes += evaluate(entity.actions, context)
+        elif isinstance(entity, (EmitEvent, RegisterEventHandler, Shutdown)):
+            continue
+        else:
+            processes += evaluate(entity.visit(context) or [], context)
+
+    return processes
+
+
+def bringup_launch_description(launch_arguments: Dict[str, str]) -> LaunchDescription:
+    bringup_pkg = get_package_share_directory("husarion_ugv_bringup")
+    return LaunchDescription(
+        [
+            IncludeLaunchDescription(
+                PythonLaunchDescriptionSource(
+                    os.path.join(bringup_pkg, "launch", "bringup.launch.py")
+                ),
+                launch_arguments=launch_arguments.items(),
+            )
+        ]
+    )
+
+
+def simulation_launch_description(
+    robots: int, launch_arguments: Dict[str, str]
+) -> LaunchDescription:
+    gazebo_pkg = get_package_share_directory("husarion_ugv_gazebo")
+    simulate_robot_path = os.path.join(gazebo_pkg, "launch", "simulate_robot.launch.py")
+
+    actions = []
+    for i in range(robots):
+        robot_arguments = {"namespace": f"robot{i}", "x": str(2.0 * i), **launch_arguments}
+        actions.append(
+            GroupAction(
+                [
+                    IncludeLaunchDescription(
+                        PythonLaunchDescriptionSource(simulate_robot_path),
+                        launch_arguments=robot_arguments.items(),
+                    )
+                ],
+                scoped=True,
+            )
+        )
+    return LaunchDescription(actions)
+
+
+def measure_launch(
+    name: str, launch_description: LaunchDescription, repetitions: int
+) -> List[float]:
+    timings = []
+    for _ in range(repetitions):
+        context = LaunchContext()
+        start = time.perf_counter()
+        processes = evaluate([launch_description], context)
+        timings.append(time.perf_counter() - start)
+
+    print(
+        f"{name:<28} processes: {processes:4d}, first: {timings[0] * 1000.0:9.1f} ms, "
+        f"next: {min(timings[1:], default=timings[0]) * 1000.0:9.1f} ms"
+    )
+    return timings
+
+
+def robot_substitutions(namespace) -> Dict[str, List]:
+    """
+    Namespace and log level substitutions of a single robot, as PythonExpression and utils
+    substitutions.
+    """
+    robot_model = LaunchConfiguration("robot_model")
+    log_level = LaunchConfiguration("log_level")
+    # Each unit is a list of substitutions, so it can be spliced into PythonExpression
+    log_units = [["rcl"], ["pluginlib.ClassLoader"], [namespace, ".controller_manager"]]
+    return {
+        "PythonExpression": [
+            PythonExpression(["'", namespace, "' + '/' if '", namespace, "' else ''"]),
+            PythonExpression(["'", namespace, "' + '/odom' if '", namespace, "' else 'odom'"]),
+            PythonExpression(
+                [
+                    "'",
+                    namespace,
+                    "' + '.controller_manager' if '",
+                    namespace,
+                    "' else 'controller_manager'",
+                ]
+            ),
+            PythonExpression(["{'lynx': 'WH05', 'panther': 'WH01'}['", robot_model, "']"]),
+            *[
+                PythonExpression(
+                    [
+                        "'",
+                        *unit,
+                        "' + ':=' + ('INFO' if '",
+                        log_level,
+                        "'.upper() == 'DEBUG' else '",
+                        log_level,
+                        "'.upper())",
+                    ]
+                )
+                for unit in log_units
+            ],
+        ],
+        "husarion_ugv_utils": [
+            NamespacedPrefix(namespace),
+            NamespacedFrame(namespace, "odom"),
+            NamespacedLogUnit(namespace, "controller_manager"),
+            DefaultWheelType(robot_model),
+            *[LimitedLogLevel(unit, log_level) for unit in log_units],
+        ],
+    }
+
+
+def measure_substitutions(robots: int, repetitions: int) -> Dict[str, List[float]]:
+    """Returns substitution times of all robots for each repetition."""
+    # Each robot evaluates its substitutions several times (load_urdf, controller,
+    # simulate_robot and their includes).
+    evaluations_per_robot = 5
+
+    results = {}
+    for _ in range(repetitions):
+        context = LaunchContext()
+        context.launch_configurations["robot_model"] = "panther"
+        context.launch_configurations["log_level"] = "DEBUG"
+
+        totals = {}
+        for i in range(robots):
+            for name, substitutions in robot_substitutions(f"robot{i}").items():
+                start = time.perf_counter()
+                for _ in range(evaluations_per_robot):
+                    for substitution in substitutions:
+                        substitution.perform(context)
+                totals[name] = totals.get(name, 0.0) + time.perf_counter() - start
+
+        for name, total in totals.items():
+            results.setdefault(name, []).append(total)
+
+    for name, timings in results.items():
+        total = sum(timings) / repetitions
+        print(f"{name:<28} substitutions: {total * 1e6:9.1f} us per launch")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--robots", type=int, default=10, help="Number of simulated robots.")
+    parser.add_argument("--repetitions", type=int, default=5, help="Number of evaluations.")
+    parser.add_argument(
+        "launch_arguments", nargs="*", help="Launch arguments in 'name:=value' format."
+    )
+    add_result_arguments(parser)
+    args = parser.parse_args()
+    if args.repetitions < 1:
+        parser.error("--repetitions has to be at least 1.")
+
+    result = BenchmarkResult.from_args("launch_evaluation", args)
+    launch_arguments = dict(argument.split(":=", 1) for argument in args.launch_arguments)
+
+    # Nodes write their parameters to temporary files, keep them out of the system temp dir
+    with tempfile.TemporaryDirectory(prefix="husarion_ugv_launch_benchmark_") as tmp_dir:
+        tempfile.tempdir = tmp_dir
+
+        print(f"Namespace and log level substitutions of {args.robots} robots:")
+        substitutions = measure_substitutions(args.robots, args.repetitions)
+        for name, timings in substitutions.items():
+            result.add(f"substitutions_{name}", [timing * 1e6 for timing in timings], "us")
+
+        print("\nLaunch description evaluation:")
+        launches = {
+            "bringup": measure_launch(
+                "bringup.launch.py", bringup_launch_description(launch_arguments), args.repetitions
+            ),
+            "simulation": measure_launch(
+                f"simulation ({args.robots} robots)",
+                simulation_launch_description(args.robots, launch_arguments),
+                args.repetitions,
+            ),
+        }
+        # The first evaluation includes imports and caching, so it is stored separately
+        for name, timings in launches.items():
+            result.add(f"{name}_first", [timings[0] * 1000.0], "ms")
+            result.add(f"{name}_next", [timing * 1000.0 for timing in timings[1:]], "ms")
+
+    save_result(args, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure throughput, latency and CPU usage of the lights frame pipeline.
+
+Usage: python3 -m husarion_ugv_utils.benchmarks.lights_pipeline [--setups composed separate gazebo]
+    [--rates 1 5 10 20 50] [--duration 5.0] [--robot-model panther]
+
+Each setup is started by the benchmark, SetLEDAnimation requests are sent at increasing rates and
+lights/channel_{1,2}_frame are recorded. Setups:
+- composed: lights.launch.py, lights_controller and lights_driver in one container with
+  intra-process communication (requires the robot hardware),
+- separate: lights_controller_node and lights_driver_node in separate processes (requires the
+  robot hardware),
+- gazebo: lights.launch.py with use_sim:=True and parameter_bridge forwarding frames to Gazebo,
+  as configured in robot_bridge.yaml.
+
+Frame latency is the time from the frame stamp to its reception by the benchmark node, so for the
+composed setup it is an upper bound of the intra-process delivery to the driver. CPU usage is the
+share of a single core used by all processes of the setup.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+import rclpy
+import yaml
+from ament_index_python.packages import get_package_share_directory
+from husarion_ugv_utils.benchmarks.process_stats import (
+    get_session_cpu_time,
+    percentile,
+    start_session,
+    stop_sessions,
+)
+from rclpy.node import Node
+from sensor_msgs.msg import Image
+
+from husarion_ugv_msgs.msg import LEDAnimation
+from husarion_ugv_msgs.srv import SetLEDAnimation
+
+SETUPS = ["composed", "separate", "gazebo"]
+CHANNELS = ["lights/channel_1_frame", "lights/channel_2_frame"]
+ANIMATIONS = [LEDAnimation.ERROR, LEDAnimation.MANUAL_ACTION, LEDAnimation.GOAL_ACHIEVED]
+
+GZ_BRIDGE_CONFIG = [
+    {
+        "topic_name": f"/{channel}",
+        "ros_type_name": "sensor_msgs/msg/Image",
+        "gz_type_name": "gz.msgs.Image",
+        "direction": "ROS_TO_GZ",
+    }
+    for channel in CHANNELS
+]
+
+
+def setup_commands(setup: str, robot_model: str, tmp_dir: str) -> List[List[str]]:
+    if setup == "composed":
+        return [
+            [
+                "ros2",
+                "launch",
+                "husarion_ugv_lights",
+                "lights.launch.py",
+                f"robot_model:={robot_model}",
+            ]
+        ]
+
+    if setup == "separate":
+        config_dir = os.path.join(get_package_share_directory("husarion_ugv_lights"), "config")
+        with open(
+            os.path.join(config_dir, f"{robot_model}_driver.yaml"), encoding="utf-8"
+        ) as file:
+            driver_parameters = yaml.safe_load(file)
+
+        animations_config_path = os.path.join(config_dir, f"{robot_model}_animations.yaml")
+        driver_arguments = [
+            argument
+            for name, value in driver_parameters.items()
+            for argument in ("-p", f"{name}:={value}")
+        ]
+        return [
+            [
+                "ros2",
+                "run",
+                "husarion_ugv_lights",
+                "lights_controller_node",
+                "--ros-args",
+                "-p",
+                f"animations_config_path:={animations_config_path}",
+            ],
+            ["ros2", "run", "husarion_ugv_lights", "lights_driver_node", "--ros-args"]
+            + driver_arguments,
+        ]
+
+    if setup == "gazebo":
+        bridge_config_path = os.path.join(tmp_dir, "lights_bridge.yaml")
+        with open(bridge_config_path, mode="w", encoding="utf-8") as file:
+            yaml.safe_dump(GZ_BRIDGE_CONFIG, file)
+        return [
+            [
+                "ros2",
+                "launch",
+                "husarion_ugv_lights",
+                "lights.launch.py",
+                f"robot_model:={robot_model}",
+                "use_sim:=True",
+            ],
+            [
+                "ros2",
+                "run",
+                "ros_gz_bridge",
+                "parameter_bridge",
+                "--ros-args",
+                "-p",
+                f"config_file:={bridge_config_path}",
+            ],
+        ]
+
+    raise ValueError(f"Unknown setup '{setup}'. Expected one of: {', '.join(SETUPS)}.")
+
+
+class FrameRecorder:
+    """Records reception times and latencies of frames on a single channel."""
+
+    def __init__(self, node: Node, topic: str):
+        self._node = node
+        self.latencies: List[float] = []
+        self.count = 0
+        node.create_subscription(Image, topic, self._frame_cb, 10)
+
+    def _frame_cb(self, msg: Image) -> None:
+        stamp = msg.header.stamp.sec + msg.header.stamp.nanosec * 1e-9
+        now = self._node.get_clock().now().nanoseconds * 1e-9
+        self.latencies.append(now - stamp)
+        self.count += 1
+
+    def reset(self) -> None:
+        self.latencies = []
+        self.count = 0
+
+
+class LightsPipelineBenchmark:
+    """Drives SetLEDAnimation requests and records frames of a running setup."""
+
+    def __init__(self, node: Node):
+        self.node = node
+        self.client = node.create_client(SetLEDAnimation, "lights/set_animation")
+        self.recorders = {channel: FrameRecorder(node, channel) for channel in CHANNELS}
+
+    def wait_until_ready(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            rclpy.spin_once(self.node, timeout_sec=0.05)
+            if self.client.service_is_ready() and all(
+                recorder.count for recorder in self.recorders.values()
+            ):
+                return True
+        return False
+
+    def run(self, rate: float, duration: float, session_ids: List[int]) -> Dict[str, float]:
+        for recorder in self.recorders.values():
+            recorder.reset()
+
+        pending = []
+        response_times = []
+        failed = 0
+        sent = 0
+        start = time.monotonic()
+        cpu_start = get_session_cpu_time(session_ids)
+        next_request = start
+
+        while time.monotonic() - start < duration:
+            now = time.monotonic()
+            if now >= next_request:
+                request = SetLEDAnimation.Request()
+                request.animation = LEDAnimation(id=ANIMATIONS[sent % len(ANIMATIONS)])
+                request.repeating = False
+                pending.append((now, self.client.call_async(request)))
+                sent += 1
+                next_request += 1.0 / rate
+
+            rclpy.spin_once(self.node, timeout_sec=max(0.0, min(next_request - now, 0.01)))
+
+            for request_time, future in [item for item in pending if item[1].done()]:
+                pending.remove((request_time, future))
+                response_times.append(time.monotonic() - request_time)
+                if not future.result().success:
+                    failed += 1
+
+        elapsed = time.monotonic() - start
+        cpu_usage = (get_session_cpu_time(session_ids) - cpu_start) / elapsed * 100.0
+        for _, future in pending:
+            self.client.remove_pending_request(future)
+
+        latencies = [
+            latency for recorder in self.recorders.values() for latency in recorder.latencies
+        ]
+        return {
+            "requests": sent / elapsed,
+            "failed": failed + len(pending),
+            "response_p95": percentile(response_times, 0.95) * 1000.0,
+            "frame_rate": min(recorder.count for recorder in self.recorders.values()) / elapsed,
+            "latency_p50": statistics.median(latencies) * 1000.0 if latencies else float("nan"),
+            "latency_p95": percentile(latencies, 0.95) * 1000.0,
+            "latency_max": max(latencies, default=float("nan")) * 1000.0,
+            "cpu": cpu_usage,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--setups", nargs="+", choices=SETUPS, default=SETUPS)
+    parser.add_argument(
+        "--rates",
+        nargs="+",
+        type=float,
+        default=[1.0, 5.0, 10.0, 20.0, 50.0],
+        help="SetLEDAnimation request rates in Hz.",
+    )
+    parser.add_argument("--duration", type=float, default=5.0, help="Duration of each rate.")
+    parser.add_argument("--robot-model", default="panther", choices=["lynx", "panther"])
+    parser.add_argument(
+        "--startup-timeout", type=float, default=30.0, help="Timeout of the setup startup."
+    )
+    args = parser.parse_args()
+
+    rclpy.init()
+    node = rclpy.create_node("lights_pipeline_benchmark")
+    benchmark = LightsPipelineBenchmark(node)
+
+    print(
+        f"{'setup':<10}{'rate':>7}{'req/s':>8}{'failed':>8}{'resp p95':>10}{'fps':>7}"
+        f"{'lat p50':>9}{'lat p95':>9}{'lat max':>9}{'cpu %':>8}"
+    )
+    try:
+        for setup in args.setups:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                processes = [
+                    start_session(command)
+                    for command in setup_commands(setup, args.robot_model, tmp_dir)
+                ]
+                try:
+                    if not benchmark.wait_until_ready(args.startup_timeout):
+                        print(f"{setup:<10} not ready after {args.startup_timeout:.0f} s")
+                        continue
+
+                    session_ids = [process.pid for process in processes]
+                    for rate in args.rates:
+                        result = benchmark.run(rate, args.duration, session_ids)
+                        print(
+                            f"{setup:<10}{rate:7.1f}{result['requests']:8.1f}"
+                            f"{result['failed']:8d}{result['response_p95']:10.2f}"
+                            f"{result['frame_rate']:7.1f}{result['latency_p50']:9.2f}"
+                            f"{result['latency_p95']:9.2f}{result['latency_max']:9.2f}"
+                            f"{result['cpu']:8.1f}"
+                        )
+                finally:
+                    stop_sessions(processes)
+    finally:
+        node.destroy_node()
+        rclpy.try_shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Replay recorded sensor data through localization.launch.py and measure the EKF performance.
+
+Usage: python3 -m husarion_ugv_utils.benchmarks.localization_replay <bag>
+    [--configs relative relative_with_gps enu enu_with_gps] [--runs 3] [--jobs 4] [--rate 1.0]
+    [--namespace <namespace>] [--ground-truth-topic <topic>]
+    [--controller-config <WH0x_controller.yaml>] [--domain-id-base 40] [--save [--label <text>]]
+
+Every config is replayed in a worker process with its own ROS_DOMAIN_ID limited to localhost, so
+several configs run in parallel. localization.launch.py is started with use_sim:=True and the bag
+is played with its clock: odometry/wheels, imu/data, gps/fix and cmd_vel (control input of the
+EKF). Wheel odometry is relayed through the benchmark, which takes the time of each input. With
+--controller-config its twist covariance is replaced with twist_covariance_diagonal of the drive
+controller, so covariance changes can be evaluated on existing recordings.
+
+CPU usage is the share of a single core used by the launched processes during playback. Rate is
+the number of odometry/filtered messages per second of simulated time. Latency is the wall time
+from relaying wheel odometry to receiving the next filtered odometry. With a ground truth topic
+(nav_msgs/Odometry, e.g. recorded in simulation) the ground truth is aligned with the first
+filtered pose and RMSE of position and yaw and the position error at the end are computed.
+"""
+
+import argparse
+import bisect
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import rclpy
+import yaml
+from husarion_ugv_utils.benchmarks.process_stats import (
+    get_session_cpu_time,
+    percentile,
+    start_session,
+    stop_sessions,
+)
+from husarion_ugv_utils.benchmarks.results import (
+    BenchmarkResult,
+    add_result_arguments,
+    save_result,
+)
+from husarion_ugv_utils.benchmarks.system_monitor import spin_for
+from nav_msgs.msg import Odometry
+from rclpy.node import Node
+
+# Config name: (localization_mode, fuse_gps) launch arguments
+CONFIGS = {
+    "relative": ("relative", False),
+    "relative_with_gps": ("relative", True),
+    "enu": ("enu", False),
+    "enu_with_gps": ("enu", True),
+}
+REPLAYED_TOPICS = ["odometry/wheels", "imu/data", "gps/fix", "cmd_vel"]
+RELAY_PREFIX = "/localization_replay"
+MAX_DOMAIN_ID = 101
+
+# Metric: (unit, higher_is_better)
+METRICS = {
+    "cpu": ("%", False),
+    "rate": ("Hz", True),
+    "latency_p50": ("ms", False),
+    "latency_p95": ("ms", False),
+    "position_rmse": ("m", False),
+    "yaw_rmse": ("deg", False),
+    "final_error": ("m", False),
+}
+
+Pose = Tuple[float, float, float, float]
+
+
+def topic_name(namespace: str, name: str) -> str:
+    return "/" + "/".join(part for part in (namespace.strip("/"), name) if part)
+
+
+def load_twist_covariance(path: str) -> List[float]:
+    """Returns twist_covariance_diagonal of the drive controller from a controller config."""
+    with open(path, mode="r", encoding="utf-8") as file:
+        config = yaml.safe_load(file) or {}
+
+    for nodes in config.values():
+        parameters = nodes.get("drive_controller", {}).get("ros__parameters", {})
+        if "twist_covariance_diagonal" in parameters:
+            covariance = [float(value) for value in parameters["twist_covariance_diagonal"]]
+            if len(covariance) != 6:
+                raise ValueError(f"twist_covariance_diagonal in {path} has to have 6 values.")
+            return covariance
+    raise ValueError(f"twist_covariance_diagonal of drive_controller not found in {path}.")
+
+
+def to_pose(msg: Odometry) -> Pose:
+    """Returns stamp, x, y and yaw of the odometry message."""
+    q = msg.pose.pose.orientation
+    yaw = math.atan2(2.0 * (q.w * q.z + q.x * q.y), 1.0 - 2.0 * (q.y * q.y + q.z * q.z))
+    stamp = msg.header.stamp.sec + msg.header.stamp.nanosec * 1e-9
+    return (stamp, msg.pose.pose.position.x, msg.pose.pose.position.y, yaw)
+
+
+def wrap_angle(angle: float) -> float:
+    return math.atan2(math.sin(angle), math.cos(angle))
+
+
+def interpolate(poses: List[Pose], stamps: List[float], stamp: float) -> Optional[Pose]:
+    """Linearly interpolates poses sorted by stamps, None outside of their time range."""
+    index = bisect.bisect_left(stamps, stamp)
+    if index == len(stamps) or (index == 0 and stamps[0] != stamp):
+        return None
+    if stamps[index] == stamp:
+        return poses[index]
+
+    before, after = poses[index - 1], poses[index]
+    ratio = (stamp - before[0]) / (after[0] - before[0])
+    return (
+        stamp,
+        before[1] + (after[1] - before[1]) * ratio,
+        before[2] + (after[2] - before[2]) * ratio,
+        before[3] + wrap_angle(after[3] - before[3]) * ratio,
+    )
+
+
+def trajectory_errors(estimate: List[Pose], ground_truth: List[Pose]) -> Dict[str, float]:
+    """
+    Compares estimated poses with the ground truth, aligned so that both start at the first
+    estimated pose.
+    """
+    errors = {"position_rmse": float("nan"), "yaw_rmse": float("nan"), "final_error": float("nan")}
+    ground_truth = sorted(ground_truth)
+    stamps = [pose[0] for pose in ground_truth]
+    pairs = []
+    for pose in estimate:
+        reference = interpolate(ground_truth, stamps, pose[0])
+        if reference is not None:
+            pairs.append((pose, reference))
+    if not pairs:
+        return errors
+
+    start, reference_start = pairs[0]
+    rotation = start[3] - reference_start[3]
+    cos, sin = math.cos(rotation), math.sin(rotation)
+
+    position_errors = []
+    yaw_errors = []
+    for pose, reference in pairs:
+        dx, dy = reference[1] - reference_start[1], reference[2] - reference_start[2]
+        x = start[1] + cos * dx - sin * dy
+        y = start[2] + sin * dx + cos * dy
+        position_errors.append(math.hypot(pose[1] - x, pose[2] - y))
+        yaw_errors.append(wrap_angle(pose[3] - reference[3] - rotation))
+
+    errors["position_rmse"] = math.sqrt(sum(e * e for e in position_errors) / len(pairs))
+    errors["yaw_rmse"] = math.degrees(math.sqrt(sum(e * e for e in yaw_errors) / len(pairs)))
+    errors["final_error"] = position_errors[-1]
+    return errors
+
+
+class ReplayRecorder:
+    """
+    Relays replayed wheel odometry to the filter and records filtered and ground truth poses.
+
+    Args:
+        node (Node): Node of the benchmark.
+        namespace (str): Namespace of the robot topics.
+        ground_truth_topic (Optional[str]): Topic of ground truth odometry.
+        twist_covariance (Optional[List[float]]): Diagonal replacing the twist covariance of
+            wheel odometry.
+    """
+
+    def __init__(
+        self,
+        node: Node,
+        namespace: str,
+        ground_truth_topic: Optional[str] = None,
+        twist_covariance: Optional[List[float]] = None,
+    ):
+        self._twist_covariance = twist_covariance
+        self._input_time: Optional[float] = None
+        self.filtered: List[Pose] = []
+        self.ground_truth: List[Pose] = []
+        self.latencies: List[float] = []
+        self.recording = False
+
+        wheels_topic = topic_name(namespace, "odometry/wheels")
+        self._wheels_pub = node.create_publisher(Odometry, wheels_topic, 10)
+        node.create_subscription(Odometry, RELAY_PREFIX + wheels_topic, self._wheels_cb, 10)
+        node.create_subscription(
+            Odometry, topic_name(namespace, "odometry/filtered"), self._filtered_cb, 10
+        )
+        if ground_truth_topic:
+            node.create_subscription(Odometry, ground_truth_topic, self._ground_truth_cb, 10)
+
+    def _wheels_cb(self, msg: Odometry) -> None:
+        if self._twist_covariance is not None:
+            for i, value in enumerate(self._twist_covariance):
+                msg.twist.covariance[i * 7] = value
+        self._wheels_pub.publish(msg)
+        if self._input_time is None:
+            self._input_time = time.monotonic()
+
+    def _filtered_cb(self, msg: Odometry) -> None:
+        if not self.recording:
+            return
+        self.filtered.append(to_pose(msg))
+        if self._input_time is not None:
+            self.latencies.append((time.monotonic() - self._input_time) * 1000.0)
+            self._input_time = None
+
+    def _ground_truth_cb(self, msg: Odometry) -> None:
+        if self.recording:
+            self.ground_truth.append(to_pose(msg))
+
+    @property
+    def rate(self) -> float:
+        if len(self.filtered) < 2:
+            return float("nan")
+        return (len(self.filtered) - 1) / (self.filtered[-1][0] - self.filtered[0][0])
+
+
+def _init_worker(domain_ids: "multiprocessing.Queue[int]") -> None:
+    # Workers are long-lived, so replays running at the same time never share a domain
+    os.environ["ROS_DOMAIN_ID"] = str(domain_ids.get())
+    os.environ["ROS_AUTOMATIC_DISCOVERY_RANGE"] = "LOCALHOST"
+
+
+def replay(config: str, args: argparse.Namespace) -> Dict[str, float]:
+    """Replays the bag through localization.launch.py with the config and returns metrics."""
+    localization_mode, fuse_gps = CONFIGS[config]
+    twist_covariance = (
+        load_twist_covariance(args.controller_config) if args.controller_config else None
+    )
+
+    rclpy.init()
+    node = rclpy.create_node("localization_replay_benchmark")
+    recorder = ReplayRecorder(node, args.namespace, args.ground_truth_topic, twist_covariance)
+    launch = start_session(
+        [
+            "ros2",
+            "launch",
+            "husarion_ugv_localization",
+            "localization.launch.py",
+            "use_sim:=True",
+            f"localization_mode:={localization_mode}",
+            f"fuse_gps:={fuse_gps}",
+            f"namespace:={args.namespace}",
+        ]
+    )
+    player = None
+
+    try:
+        required_topics = ["odometry/wheels"] + (["gps/fix"] if fuse_gps else [])
+        if not spin_for(
+            node,
+            30.0,
+            until=lambda: all(
+                node.count_subscribers(topic_name(args.namespace, topic)) > 0
+                for topic in required_topics
+            ),
+        ):
+            raise RuntimeError("localization nodes are not subscribing sensor topics")
+
+        wheels_topic = topic_name(args.namespace, "odometry/wheels")
+        topics = [topic_name(args.namespace, topic) for topic in REPLAYED_TOPICS]
+        if args.ground_truth_topic:
+            topics.append(args.ground_truth_topic)
+
+        recorder.recording = True
+        cpu_start = get_session_cpu_time([launch.pid])
+        start = time.monotonic()
+        player = start_session(
+            [
+                "ros2",
+                "bag",
+                "play",
+                args.bag,
+                "--clock",
+                "100",
+                "--rate",
+                str(args.rate),
+                "--topics",
+                *topics,
+                "--remap",
+                f"{wheels_topic}:={RELAY_PREFIX}{wheels_topic}",
+            ]
+        )
+        spin_for(node, float("inf"), until=lambda: player.poll() is not None)
+        # Let the filter process the last messages
+        spin_for(node, 1.0)
+        elapsed = time.monotonic() - start
+        cpu_usage = (get_session_cpu_time([launch.pid]) - cpu_start) / elapsed * 100.0
+        recorder.recording = False
+
+        if player.returncode != 0:
+            raise RuntimeError(f"ros2 bag play exited with code {player.returncode}")
+    finally:
+        stop_sessions([process for process in (player, launch) if process is not None])
+        node.destroy_node()
+        rclpy.try_shutdown()
+
+    return {
+        "cpu": cpu_usage,
+        "rate": recorder.rate,
+        "latency_p50": percentile(recorder.latencies, 0.5),
+        "latency_p95": percentile(recorder.latencies, 0.95),
+        **trajectory_errors(recorder.filtered, recorder.ground_truth),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("bag", help="Path of the recorded bag.")
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    parser.add_argument("--runs", type=int, default=3, help="Number of replays of each config.")
+    parser.add_argument("--jobs", type=int, default=4, help="Number of parallel replays.")
+    parser.add_argument("--rate", type=float, default=1.0, help="Playback rate of the bag.")
+    parser.add_argument("--namespace", default="", help="Namespace of the recorded robot.")
+    parser.add_argument(
+        "--ground-truth-topic", help="Topic of ground truth odometry recorded in the bag."
+    )
+    parser.add_argument(
+        "--controller-config",
+        help="Controller config whose drive_controller twist covariance replaces the recorded one.",
+    )
+    parser.add_argument(
+        "--domain-id-base", type=int, default=40, help="ROS_DOMAIN_ID of the first worker."
+    )
+    add_result_arguments(parser)
+    args = parser.parse_args()
+
+    if args.domain_id_base + args.jobs - 1 > MAX_DOMAIN_ID:
+        parser.error(f"domain IDs exceed {MAX_DOMAIN_ID}, use fewer jobs or a lower base")
+    if args.controller_config:
+        # Fail before starting any replay
+        load_twist_covariance(args.controller_config)
+
+    domain_ids = multiprocessing.Queue()
+    for domain_id in range(args.domain_id_base, args.domain_id_base + args.jobs):
+        domain_ids.put(domain_id)
+
+    benchmark_result = BenchmarkResult.from_args("localization_replay", args)
+    tasks = [(config, run) for config in args.configs for run in range(1, args.runs + 1)]
+
+    print(
+        f"{'config':<18}{'run':>4}{'cpu %':>8}{'rate':>8}{'lat p50':>9}{'lat p95':>9}"
+        f"{'pos rmse':>10}{'yaw rmse':>10}{'final':>8}"
+    )
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=args.jobs, initializer=_init_worker, initargs=(domain_ids,)
+    ) as executor:
+        futures = [executor.submit(replay, config, args) for config, _ in tasks]
+        for (config, run), future in zip(tasks, futures):
+            try:
+                result = future.result()
+            except (OSError, RuntimeError, ValueError) as e:
+                print(f"{config:<18}{run:>4} error: {e}")
+                continue
+
+            print(
+                f"{config:<18}{run:>4}{result['cpu']:8.1f}{result['rate']:8.2f}"
+                f"{result['latency_p50']:9.2f}{result['latency_p95']:9.2f}"
+                f"{result['position_rmse']:10.3f}{result['yaw_rmse']:10.2f}"
+                f"{result['final_error']:8.3f}"
+            )
+            for name, (unit, higher_is_better) in METRICS.items():
+                benchmark_result.add(f"{config}_{name}", [result[name]], unit, higher_is_better)
+
+    save_result(args, benchmark_result)
+
+
+if __name__ == "__main__":
+    main()
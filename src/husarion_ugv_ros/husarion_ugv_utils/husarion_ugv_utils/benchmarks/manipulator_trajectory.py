@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure time to the first accepted trajectory of manipulator joint trajectory controllers.
+
+Usage: python3 -m husarion_ugv_utils.benchmarks.manipulator_trajectory \\
+    --controllers manipulator_joint_trajectory_controller components_config_path:=<path>
+
+The simulation launch is started by the benchmark and time is measured from its start. Each
+controller is sent a goal holding its current position as soon as it publishes its state. Goals
+are resent until accepted, so the measured time includes the launch, spawning and activation.
+"""
+
+import argparse
+import time
+from typing import Dict, Optional
+
+import rclpy
+from control_msgs.action import FollowJointTrajectory
+from control_msgs.msg import JointTrajectoryControllerState
+from husarion_ugv_utils.benchmarks.process_stats import start_session, stop_sessions
+from rclpy.action import ActionClient
+from rclpy.duration import Duration
+from rclpy.node import Node
+from trajectory_msgs.msg import JointTrajectoryPoint
+
+
+class TrajectoryProbe:
+    """Sends a holding trajectory to a single controller until it is accepted."""
+
+    def __init__(self, node: Node, controller: str, start: float):
+        self.controller = controller
+        self.start = start
+        self.state: Optional[JointTrajectoryControllerState] = None
+        self.accepted_time: Optional[float] = None
+        self._goal_future = None
+
+        self._client = ActionClient(
+            node, FollowJointTrajectory, controller + "/follow_joint_trajectory"
+        )
+        node.create_subscription(
+            JointTrajectoryControllerState, controller + "/controller_state", self._state_cb, 1
+        )
+
+    def _state_cb(self, msg: JointTrajectoryControllerState) -> None:
+        self.state = msg
+
+    def update(self) -> None:
+        if self.accepted_time is not None or self.state is None:
+            return
+
+        if self._goal_future is not None:
+            if not self._goal_future.done():
+                return
+            goal_handle = self._goal_future.result()
+            self._goal_future = None
+            if goal_handle is not None and goal_handle.accepted:
+                self.accepted_time = time.perf_counter() - self.start
+                return
+
+        if not self._client.server_is_ready():
+            return
+
+        point = JointTrajectoryPoint()
+        point.positions = list(self.state.feedback.positions)
+        point.time_from_start = Duration(seconds=1.0).to_msg()
+
+        goal = FollowJointTrajectory.Goal()
+        goal.trajectory.joint_names = list(self.state.joint_names)
+        goal.trajectory.points = [point]
+        self._goal_future = self._client.send_goal_async(goal)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--controllers",
+        nargs="+",
+        required=True,
+        help="Names of the joint trajectory controllers (with robot namespace prefix).",
+    )
+    parser.add_argument("--namespace", default="", help="Namespace of the controller manager.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Timeout in seconds.")
+    parser.add_argument("--package", default="husarion_ugv_gazebo", help="Launch file package.")
+    parser.add_argument("--launch-file", default="simulation.launch.py", help="Launch file.")
+    parser.add_argument(
+        "launch_arguments", nargs="*", help="Launch arguments in 'name:=value' format."
+    )
+    args = parser.parse_args()
+
+    rclpy.init()
+    node = rclpy.create_node("manipulator_trajectory_benchmark", namespace=args.namespace)
+
+    # Measured from the launch start, so the spawner time is included
+    start = time.perf_counter()
+    launch = start_session(
+        ["ros2", "launch", args.package, args.launch_file, *args.launch_arguments]
+    )
+    probes: Dict[str, TrajectoryProbe] = {
+        controller: TrajectoryProbe(node, controller, start) for controller in args.controllers
+    }
+
+    try:
+        while time.perf_counter() - start < args.timeout:
+            rclpy.spin_once(node, timeout_sec=0.01)
+            for probe in probes.values():
+                probe.update()
+            if all(probe.accepted_time is not None for probe in probes.values()):
+                break
+    finally:
+        stop_sessions([launch])
+        node.destroy_node()
+        rclpy.try_shutdown()
+
+    print(f"{'controller':<60}{'first trajectory accepted [s]':>32}")
+    for controller, probe in probes.items():
+        result = f"{probe.accepted_time:.3f}" if probe.accepted_time is not None else "timeout"
+        print(f"{controller:<60}{result:>32}")
+
+
+if __name__ == "__main__":
+    main()
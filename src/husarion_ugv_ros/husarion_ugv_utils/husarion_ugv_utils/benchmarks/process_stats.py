@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import signal
+import subprocess
+from typing import List
+
+
+def start_session(command: List[str]) -> subprocess.Popen:
+    """Starts the command in a new session, so all its child processes can be measured."""
+    return subprocess.Popen(
+        command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def stop_sessions(processes: List[subprocess.Popen], timeout: float = 10.0) -> None:
+    for process in processes:
+        if process.poll() is None:
+            os.killpg(process.pid, signal.SIGINT)
+    for process in processes:
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+
+
+def get_session_cpu_time(session_ids: List[int]) -> float:
+    """Returns the CPU time in seconds of all processes in the sessions."""
+    clock_ticks = os.sysconf("SC_CLK_TCK")
+    cpu_time = 0
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/stat", mode="r", encoding="utf-8") as file:
+                # Process name may contain spaces, fields after it are space separated
+                fields = file.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        # Fields: state (3), ppid, pgrp, session (6), ..., utime (14), stime (15)
+        if int(fields[3]) in session_ids:
+            cpu_time += int(fields[11]) + int(fields[12])
+    return cpu_time / clock_ticks
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
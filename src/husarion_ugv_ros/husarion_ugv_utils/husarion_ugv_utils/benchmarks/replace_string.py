@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare config rendering time of nav2_common ReplaceString and husarion_ugv_utils ReplaceString
+for the templates rendered while launching a multi-robot simulation.
+
+Usage: python3 -m husarion_ugv_utils.benchmarks.replace_string [--robots 10] [--repetitions 5]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from ament_index_python.packages import get_package_share_directory
+from launch import LaunchContext
+
+from husarion_ugv_utils import substitutions
+
+
+def robot_templates(namespace: str) -> List[Tuple[str, dict]]:
+    """Templates rendered by simulate_robot.launch.py and its includes for a single robot."""
+    gazebo_pkg = get_package_share_directory("husarion_ugv_gazebo")
+    controller_pkg = get_package_share_directory("husarion_ugv_controller")
+    components_pkg = get_package_share_directory("ros_components_description")
+
+    ns = namespace + "/" if namespace else ""
+    device_namespace = "front_cam"
+    return [
+        (
+            os.path.join(gazebo_pkg, "config", "robot_bridge.yaml"),
+            {"<model_name>": namespace or "panther", "<namespace>/": ns},
+        ),
+        (
+            os.path.join(controller_pkg, "config", "WH01_controller.yaml"),
+            {"<namespace>/": ns},
+        ),
+        (
+            os.path.join(components_pkg, "config", "gz_stereolabs_zed_remappings.yaml"),
+            {"<robot_namespace>": "/" + namespace, "<device_namespace>": "/" + device_namespace},
+        ),
+        (
+            os.path.join(components_pkg, "config", "kinova_6dof_controllers.yaml"),
+            {
+                "- joint": "- manipulator_joint",
+                "  joint_trajectory_controller:": f"  {namespace}_manipulator_jtc:",
+                "  robotiq_gripper_controller:": f"  {namespace}_manipulator_gripper:",
+                "robotiq_85_left_knuckle_joint": "manipulator_robotiq_85_left_knuckle_joint",
+            },
+        ),
+    ]
+
+
+def run(replace_string_cls: Callable, templates: List[Tuple[str, dict]]) -> float:
+    context = LaunchContext()
+    start = time.perf_counter()
+    for source_file, replacements in templates:
+        replace_string_cls(source_file=source_file, replacements=replacements).perform(context)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--robots", type=int, default=10, help="Number of simulated robots.")
+    parser.add_argument("--repetitions", type=int, default=5, help="Number of launches.")
+    args = parser.parse_args()
+
+    templates = []
+    for i in range(args.robots):
+        templates += robot_templates(f"robot{i}")
+
+    implementations = {"husarion_ugv_utils": substitutions.ReplaceString}
+    try:
+        from nav2_common.launch import ReplaceString as Nav2ReplaceString
+
+        implementations["nav2_common"] = Nav2ReplaceString
+    except ImportError:
+        print("nav2_common is not available, skipping reference measurement.")
+
+    print(f"Rendering {len(templates)} templates for {args.robots} robots per launch.")
+    for name, replace_string_cls in implementations.items():
+        files_before = len(os.listdir(tempfile.gettempdir()))
+        timings = [run(replace_string_cls, templates) for _ in range(args.repetitions)]
+        files_created = len(os.listdir(tempfile.gettempdir())) - files_before
+        print(
+            f"{name:<20} first: {timings[0] * 1000.0:8.2f} ms, "
+            f"next: {min(timings[1:], default=timings[0]) * 1000.0:8.2f} ms, "
+            f"new temp files: {files_created}"
+        )
+
+
+if __name__ == "__main__":
+    main()
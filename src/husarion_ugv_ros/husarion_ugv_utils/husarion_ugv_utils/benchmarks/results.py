@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Store benchmark results and compare runs with named baselines.
+
+Usage: python3 -m husarion_ugv_utils.benchmarks.results [--store <path>] <command>
+    list [--benchmark <name>] [--last 20]
+    baseline <name> <run_id>
+    compare <baseline> [<run_id>] [--threshold 0.05] [--sigma 2.0] [--metric-threshold m=0.1]
+
+Benchmarks started with --save append their runs to the store, a JSON lines file
+($ROS_HOME/husarion_ugv/benchmark_results.jsonl by default). Records are never modified: marking
+a run as a baseline appends a record and the latest one with a given name wins.
+
+A metric regresses when its mean changes in the worse direction by more than the relative
+threshold and the change is larger than sigma standard errors of the difference, so noise of
+metrics with several samples doesn't fail the comparison. A metric of the baseline that has
+failed (NaN) or no samples in the run is reported as FAILED, e.g. when a measurement timed out.
+Exits with 1 on regressions or failed metrics and with 2 if the baseline or the run is not found.
+"""
+
+import argparse
+import collections
+import hashlib
+import json
+import math
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+SCHEMA_VERSION = 1
+
+
+def default_store_path() -> str:
+    ros_home = os.environ.get("ROS_HOME", os.path.join(os.path.expanduser("~"), ".ros"))
+    return os.path.join(ros_home, "husarion_ugv", "benchmark_results.jsonl")
+
+
+def machine_fingerprint() -> Dict[str, Any]:
+    """
+    Describes the machine. The hash covers only properties affecting performance, not the host
+    name or software versions.
+    """
+    cpu_model = ""
+    memory_kb = 0
+    try:
+        with open("/proc/cpuinfo", mode="r", encoding="utf-8") as file:
+            cpu_model = next(
+                (line.split(":", 1)[1].strip() for line in file if line.startswith("model name")),
+                "",
+            )
+        with open("/proc/meminfo", mode="r", encoding="utf-8") as file:
+            memory_kb = int(file.readline().split()[1])
+    except (OSError, IndexError, ValueError):
+        pass
+
+    hardware = {
+        "arch": platform.machine(),
+        "cpu_model": cpu_model,
+        "cpu_count": os.cpu_count(),
+        "memory_kb": memory_kb,
+    }
+    fingerprint = hashlib.sha256(json.dumps(hardware, sort_keys=True).encode()).hexdigest()[:16]
+    return {
+        "fingerprint": fingerprint,
+        "hostname": socket.gethostname(),
+        "kernel": platform.release(),
+        "python": platform.python_version(),
+        "ros_distro": os.environ.get("ROS_DISTRO", ""),
+        **hardware,
+    }
+
+
+def git_revision(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Returns the revision of the repository containing the path, None if it isn't one."""
+    # With symlink install the module resolves to the source tree
+    path = path or os.path.dirname(os.path.realpath(__file__))
+    try:
+        revision = subprocess.run(
+            ["git", "-C", path, "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "-C", path, "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {"revision": revision, "dirty": bool(status.strip())}
+
+
+class BenchmarkResult:
+    """
+    Result of a single benchmark run.
+
+    Args:
+        benchmark (str): Name of the benchmark.
+        parameters (Optional[Dict[str, Any]]): Parameters of the run, e.g. parsed arguments.
+        label (str): Optional description of the run.
+    """
+
+    def __init__(
+        self, benchmark: str, parameters: Optional[Dict[str, Any]] = None, label: str = ""
+    ):
+        self.record: Dict[str, Any] = {
+            "schema": SCHEMA_VERSION,
+            "type": "run",
+            "id": uuid.uuid4().hex[:12],
+            "benchmark": benchmark,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "label": label,
+            "machine": machine_fingerprint(),
+            "git": git_revision(),
+            "parameters": parameters or {},
+            "metrics": {},
+        }
+
+    @classmethod
+    def from_args(cls, benchmark: str, args: argparse.Namespace) -> "BenchmarkResult":
+        """Creates the result with parsed arguments of the benchmark as its parameters."""
+        parameters = {
+            name: value
+            for name, value in vars(args).items()
+            if name not in ("save", "store", "label")
+        }
+        return cls(benchmark, parameters, args.label)
+
+    @property
+    def id(self) -> str:
+        return self.record["id"]
+
+    def add(
+        self, name: str, samples: List[float], unit: str, higher_is_better: bool = False
+    ) -> None:
+        """
+        Adds samples of a metric. NaN samples (e.g. failed measurements) are not stored, but
+        counted as failed.
+        """
+        metric = self.record["metrics"].setdefault(
+            name, {"unit": unit, "higher_is_better": higher_is_better, "samples": [], "failed": 0}
+        )
+        samples = [float(sample) for sample in samples]
+        metric["samples"].extend(sample for sample in samples if not math.isnan(sample))
+        metric["failed"] += sum(math.isnan(sample) for sample in samples)
+
+
+class ResultStore:
+    """
+    Append-only store of benchmark runs and baselines in a JSON lines file.
+
+    Args:
+        path (str): Path to the store file, created on the first append.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, mode="a", encoding="utf-8") as file:
+            file.write(json.dumps(record, sort_keys=True) + "\n")
+
+    def append(self, result: BenchmarkResult) -> None:
+        self._append(result.record)
+
+    def set_baseline(self, name: str, run_id: str) -> None:
+        self._append(
+            {
+                "schema": SCHEMA_VERSION,
+                "type": "baseline",
+                "name": name,
+                "run_id": run_id,
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+        )
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, mode="r", encoding="utf-8") as file:
+            for line in file:
+                # A partially written last line of an interrupted run is skipped
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def runs(self, benchmark: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [
+            record
+            for record in self.records()
+            if record.get("type") == "run" and benchmark in (None, record["benchmark"])
+        ]
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        return next((run for run in self.runs() if run["id"] == run_id), None)
+
+    def get_baseline(self, name: str) -> Optional[Dict[str, Any]]:
+        run_id = None
+        for record in self.records():
+            if record.get("type") == "baseline" and record["name"] == name:
+                run_id = record["run_id"]
+        return self.get_run(run_id) if run_id else None
+
+
+def add_result_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds arguments for saving the result of a benchmark to the store."""
+    parser.add_argument("--save", action="store_true", help="Save the result to the store.")
+    parser.add_argument("--store", default=default_store_path(), help="Path to the result store.")
+    parser.add_argument("--label", default="", help="Description of the saved run.")
+
+
+def save_result(args: argparse.Namespace, result: BenchmarkResult) -> None:
+    if args.save:
+        ResultStore(args.store).append(result)
+        print(f"Saved run {result.id} to {args.store}")
+
+
+class MetricComparison:
+    """
+    Comparison of a metric between the baseline and the compared run.
+
+    Args:
+        name (str): Name of the metric.
+        baseline (Dict[str, Any]): Metric of the baseline run.
+        run (Dict[str, Any]): Metric of the compared run.
+        threshold (float): Relative change of the mean in the worse direction treated as a
+            regression.
+        sigma (float): Required change in standard errors of the difference of means.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        baseline: Dict[str, Any],
+        run: Dict[str, Any],
+        threshold: float,
+        sigma: float,
+    ):
+        self.name = name
+        self.unit = run.get("unit", baseline.get("unit", ""))
+        self.baseline_samples = baseline["samples"]
+        self.run_samples = run["samples"]
+        self.run_failed = run.get("failed", 0)
+        self.baseline_mean = self._mean(self.baseline_samples)
+        self.run_mean = self._mean(self.run_samples)
+
+        # Positive change is always worse
+        sign = -1.0 if run.get("higher_is_better", baseline.get("higher_is_better")) else 1.0
+        difference = sign * (self.run_mean - self.baseline_mean)
+        self.change = difference / abs(self.baseline_mean) if self.baseline_mean else 0.0
+        standard_error = math.sqrt(
+            self._variance(self.baseline_samples) / max(len(self.baseline_samples), 1)
+            + self._variance(self.run_samples) / max(len(self.run_samples), 1)
+        )
+        significant = abs(difference) > sigma * standard_error
+
+        if self.run_failed or (self.baseline_samples and not self.run_samples):
+            self.status = "FAILED"
+        elif not self.baseline_samples:
+            self.status = "missing"
+        elif self.change > threshold and significant:
+            self.status = "REGRESSION"
+        elif self.change < -threshold and significant:
+            self.status = "improved"
+        elif abs(self.change) > threshold:
+            self.status = "noise"
+        else:
+            self.status = "ok"
+
+    @property
+    def regressed(self) -> bool:
+        return self.status in ("REGRESSION", "FAILED")
+
+    @staticmethod
+    def _mean(samples: List[float]) -> float:
+        return statistics.fmean(samples) if samples else float("nan")
+
+    @staticmethod
+    def _variance(samples: List[float]) -> float:
+        return statistics.variance(samples) if len(samples) > 1 else 0.0
+
+    @staticmethod
+    def _describe(samples: List[float], failed: int = 0) -> str:
+        failures = f", {failed} failed" if failed else ""
+        if not samples:
+            return f"-{failures}"
+        deviation = statistics.stdev(samples) if len(samples) > 1 else 0.0
+        return f"{statistics.fmean(samples):.4g} ± {deviation:.2g} (n={len(samples)}{failures})"
+
+    def __str__(self) -> str:
+        if self.baseline_samples and self.run_samples:
+            change = f"{self.change * 100.0:+8.1f} %"
+        else:
+            change = f"{'-':>10}"
+        return (
+            f"{self.name:<32} {self.unit:<6} {self._describe(self.baseline_samples):>26} "
+            f"{self._describe(self.run_samples, self.run_failed):>26} {change}  {self.status}"
+        )
+
+
+def compare(
+    baseline: Dict[str, Any],
+    run: Dict[str, Any],
+    threshold: float,
+    sigma: float,
+    metric_thresholds: Dict[str, float],
+) -> List[MetricComparison]:
+    # Metrics of the baseline first, so ones missing in the run are compared as well
+    names = list(baseline["metrics"])
+    names += [name for name in run["metrics"] if name not in baseline["metrics"]]
+    return [
+        MetricComparison(
+            name,
+            baseline["metrics"].get(name, {"samples": []}),
+            run["metrics"].get(name, {"samples": []}),
+            metric_thresholds.get(name, threshold),
+            sigma,
+        )
+        for name in names
+    ]
+
+
+def describe_run(run: Dict[str, Any]) -> str:
+    git = run.get("git") or {}
+    revision = git.get("revision", "")[:10] + ("+" if git.get("dirty") else "")
+    return (
+        f"{run['id']}  {run['timestamp']}  {run['benchmark']:<20} {revision or '-':<11} "
+        f"{run['machine']['hostname']:<16} {run['label']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--store", default=default_store_path(), help="Path to the result store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="List saved runs.")
+    list_parser.add_argument("--benchmark", default=None)
+    list_parser.add_argument("--last", type=int, default=20, help="Number of latest runs.")
+
+    baseline_parser = commands.add_parser("baseline", help="Mark a run as a named baseline.")
+    baseline_parser.add_argument("name")
+    baseline_parser.add_argument("run_id")
+
+    compare_parser = commands.add_parser("compare", help="Compare a run with a baseline.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument(
+        "run_id", nargs="?", default=None, help="Defaults to the latest run of the benchmark."
+    )
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.05, help="Relative change treated as a regression."
+    )
+    compare_parser.add_argument(
+        "--sigma", type=float, default=2.0, help="Required change in standard errors."
+    )
+    compare_parser.add_argument(
+        "--metric-threshold",
+        action="append",
+        default=[],
+        metavar="METRIC=THRESHOLD",
+        help="Threshold of a single metric, can be repeated.",
+    )
+    args = parser.parse_args()
+
+    store = ResultStore(args.store)
+
+    if args.command == "list":
+        for run in collections.deque(store.runs(args.benchmark), maxlen=args.last):
+            print(describe_run(run))
+        return
+
+    if args.command == "baseline":
+        if store.get_run(args.run_id) is None:
+            parser.exit(2, f"Run '{args.run_id}' not found in {args.store}.\n")
+        store.set_baseline(args.name, args.run_id)
+        print(f"Baseline '{args.name}' set to run {args.run_id}")
+        return
+
+    try:
+        metric_thresholds = {
+            name: float(value)
+            for name, value in (item.split("=", 1) for item in args.metric_threshold)
+        }
+    except ValueError:
+        parser.error("--metric-threshold has to be in METRIC=THRESHOLD format")
+
+    baseline = store.get_baseline(args.baseline)
+    if baseline is None:
+        parser.exit(2, f"Baseline '{args.baseline}' not found in {args.store}.\n")
+
+    if args.run_id is None:
+        runs = [run for run in store.runs(baseline["benchmark"]) if run["id"] != baseline["id"]]
+        run = runs[-1] if runs else None
+    else:
+        run = store.get_run(args.run_id)
+    if run is None:
+        parser.exit(2, f"No run to compare with baseline '{args.baseline}'.\n")
+    if run["benchmark"] != baseline["benchmark"]:
+        parser.exit(2, f"Run {run['id']} is of a different benchmark than the baseline.\n")
+
+    print(f"baseline: {describe_run(baseline)}\nrun:      {describe_run(run)}")
+    if run["machine"]["fingerprint"] != baseline["machine"]["fingerprint"]:
+        print("Warning: runs were taken on machines with different hardware.")
+    print(f"\n{'metric':<32} {'unit':<6} {'baseline':>26} {'run':>26} {'change':>10}  status")
+
+    comparisons = compare(baseline, run, args.threshold, args.sigma, metric_thresholds)
+    for comparison in comparisons:
+        print(comparison)
+
+    regressions = [c.name for c in comparisons if c.regressed]
+    if regressions:
+        print(f"\n{len(regressions)} regressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
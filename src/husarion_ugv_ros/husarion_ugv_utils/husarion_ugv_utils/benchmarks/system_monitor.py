@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure overhead and fidelity of system_monitor_node under synthetic load.
+
+Usage: python3 -m husarion_ugv_utils.benchmarks.system_monitor [--frequencies 1 5 10]
+    [--loads idle cpu memory disk] [--duration 10.0] [--cpu-workers 2] [--memory-mb 512]
+    [--disk-mb 1024] [--disk-dir /var/tmp]
+
+The node is started for each publish frequency and system_status is recorded under each load.
+For every load the CPU share of the node (percent of a single core), the publish jitter and the
+mean absolute error of reported values against ground truth read by the benchmark are shown.
+Ground truth is sampled when each message is received: CPU usage from /proc/stat over the
+interval between messages, RAM usage from /proc/meminfo, disk usage of '/' from statvfs and
+temperature from the thermal zone read by the node. The disk load directory has to be on the
+root filesystem to affect disk usage.
+"""
+
+import argparse
+import multiprocessing
+import multiprocessing.synchronize
+import os
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+
+import rclpy
+from husarion_ugv_utils.benchmarks.process_stats import (
+    get_session_cpu_time,
+    percentile,
+    start_session,
+    stop_sessions,
+)
+from rclpy.node import Node
+
+from husarion_ugv_msgs.msg import SystemStatus
+
+LOADS = ["idle", "cpu", "memory", "disk"]
+TEMPERATURE_PATH = "/sys/class/thermal/thermal_zone0/temp"
+PAGE_SIZE = 4096
+MB = 1024 * 1024
+
+
+def _burn_cpu(stop: multiprocessing.synchronize.Event) -> None:
+    while not stop.is_set():
+        pass
+
+
+def _hold_memory(size_mb: int, stop: multiprocessing.synchronize.Event) -> None:
+    memory = bytearray(size_mb * MB)
+    # Touch every page, so the memory is actually allocated
+    for offset in range(0, len(memory), PAGE_SIZE):
+        memory[offset] = 1
+    stop.wait()
+
+
+def _fill_disk(path: str, size_mb: int, stop: multiprocessing.synchronize.Event) -> None:
+    chunk = os.urandom(MB)
+    try:
+        with open(path, mode="wb") as file:
+            for _ in range(size_mb):
+                if stop.is_set():
+                    break
+                file.write(chunk)
+            file.flush()
+            os.fsync(file.fileno())
+        stop.wait()
+    finally:
+        os.remove(path)
+
+
+class LoadGenerator:
+    """
+    Synthetic system load running in child processes.
+
+    Args:
+        load (str): One of 'idle', 'cpu', 'memory' or 'disk'.
+        args (argparse.Namespace): Load sizes.
+    """
+
+    def __init__(self, load: str, args: argparse.Namespace):
+        self._stop = multiprocessing.Event()
+        self._processes: List[multiprocessing.Process] = []
+
+        if load == "cpu":
+            self._processes = [
+                multiprocessing.Process(target=_burn_cpu, args=(self._stop,))
+                for _ in range(args.cpu_workers)
+            ]
+        elif load == "memory":
+            self._processes = [
+                multiprocessing.Process(target=_hold_memory, args=(args.memory_mb, self._stop))
+            ]
+        elif load == "disk":
+            path = os.path.join(args.disk_dir, f"system_monitor_benchmark_{os.getpid()}")
+            self._processes = [
+                multiprocessing.Process(target=_fill_disk, args=(path, args.disk_mb, self._stop))
+            ]
+
+    def __enter__(self) -> "LoadGenerator":
+        for process in self._processes:
+            process.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        for process in self._processes:
+            process.join()
+
+
+class GroundTruth:
+    """Reads the system state the same way as system_monitor_node, independently of it."""
+
+    def __init__(self):
+        self._last_cpu_times = self._read_cpu_times()
+
+    @staticmethod
+    def _read_cpu_times() -> List[int]:
+        with open("/proc/stat", mode="r", encoding="utf-8") as file:
+            return [int(value) for value in file.readline().split()[1:]]
+
+    def cpu_usage(self) -> float:
+        """Returns the CPU usage in percent since the previous call."""
+        cpu_times = self._read_cpu_times()
+        deltas = [current - last for current, last in zip(cpu_times, self._last_cpu_times)]
+        self._last_cpu_times = cpu_times
+        total = sum(deltas)
+        # Fields: user, nice, system, idle, iowait, ...
+        idle = deltas[3] + deltas[4]
+        return (total - idle) / total * 100.0 if total else float("nan")
+
+    @staticmethod
+    def ram_usage() -> float:
+        meminfo = {}
+        with open("/proc/meminfo", mode="r", encoding="utf-8") as file:
+            for line in file:
+                name, value = line.split(":", 1)
+                meminfo[name] = int(value.split()[0])
+        return (meminfo["MemTotal"] - meminfo["MemAvailable"]) / meminfo["MemTotal"] * 100.0
+
+    @staticmethod
+    def disk_usage() -> float:
+        stat = os.statvfs("/")
+        capacity = stat.f_blocks * stat.f_frsize
+        available = stat.f_bavail * stat.f_frsize
+        return (capacity - available) / capacity * 100.0
+
+    @staticmethod
+    def cpu_temperature() -> float:
+        try:
+            with open(TEMPERATURE_PATH, mode="r", encoding="utf-8") as file:
+                return int(file.read()) / 1000.0
+        except (OSError, ValueError):
+            return float("nan")
+
+
+class SystemStatusRecorder:
+    """Records system_status messages with the ground truth at their reception."""
+
+    def __init__(self, node: Node):
+        self._node = node
+        self._ground_truth = GroundTruth()
+        self.stamps: List[float] = []
+        self.errors: Dict[str, List[float]] = {}
+        self.recording = False
+        node.create_subscription(SystemStatus, "system_status", self._system_status_cb, 10)
+
+    def _system_status_cb(self, msg: SystemStatus) -> None:
+        cpu_usage = self._ground_truth.cpu_usage()
+        if not self.recording:
+            return
+
+        self.stamps.append(msg.header.stamp.sec + msg.header.stamp.nanosec * 1e-9)
+        reported = {
+            "cpu": (msg.avg_load_percent, cpu_usage),
+            "ram": (msg.ram_usage_percent, self._ground_truth.ram_usage()),
+            "disk": (msg.disc_usage_percent, self._ground_truth.disk_usage()),
+            "temp": (msg.cpu_temp, self._ground_truth.cpu_temperature()),
+        }
+        for name, (value, truth) in reported.items():
+            self.errors.setdefault(name, []).append(abs(value - truth))
+
+    def start(self) -> None:
+        self.stamps = []
+        self.errors = {}
+        self.recording = True
+
+    def stop(self) -> None:
+        self.recording = False
+
+
+def spin_for(node: Node, duration: float, until: Optional[Callable[[], bool]] = None) -> bool:
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        rclpy.spin_once(node, timeout_sec=0.05)
+        if until is not None and until():
+            return True
+    return until is None
+
+
+def mean(values: List[float]) -> float:
+    # NaN values come from readings unavailable on the machine (e.g. missing thermal zone)
+    values = [value for value in values if value == value]
+    return statistics.fmean(values) if values else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--frequencies",
+        nargs="+",
+        type=float,
+        default=[1.0, 5.0, 10.0],
+        help="Publish frequencies of the node in Hz.",
+    )
+    parser.add_argument("--loads", nargs="+", choices=LOADS, default=LOADS)
+    parser.add_argument("--duration", type=float, default=10.0, help="Duration of each load.")
+    parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help="Number of busy looping processes of the CPU load.",
+    )
+    parser.add_argument("--memory-mb", type=int, default=512, help="Size of the memory load.")
+    parser.add_argument("--disk-mb", type=int, default=1024, help="Size of the disk load.")
+    parser.add_argument(
+        "--disk-dir", default="/var/tmp", help="Directory of the disk load, on the root fs."
+    )
+    args = parser.parse_args()
+
+    rclpy.init()
+    node = rclpy.create_node("system_monitor_benchmark")
+    recorder = SystemStatusRecorder(node)
+
+    print(
+        f"{'freq':>6} {'load':<8}{'rate':>7}{'cpu %':>8}{'jitter sd':>11}{'jitter p95':>12}"
+        f"{'err cpu':>9}{'err ram':>9}{'err disk':>10}{'err temp':>10}"
+    )
+    try:
+        for frequency in args.frequencies:
+            monitor = start_session(
+                [
+                    "ros2",
+                    "run",
+                    "husarion_ugv_diagnostics",
+                    "system_monitor_node",
+                    "--ros-args",
+                    "-p",
+                    f"publish_frequency:={frequency}",
+                ]
+            )
+            try:
+                recorder.start()
+                if not spin_for(node, 30.0, until=lambda: len(recorder.stamps) > 0):
+                    print(f"{frequency:6.1f} system_monitor_node not publishing")
+                    continue
+
+                for load in args.loads:
+                    with LoadGenerator(load, args):
+                        # Let the load settle before recording
+                        spin_for(node, 2.0)
+                        recorder.start()
+                        cpu_start = get_session_cpu_time([monitor.pid])
+                        start = time.monotonic()
+                        spin_for(node, args.duration)
+                        elapsed = time.monotonic() - start
+                        cpu_usage = (get_session_cpu_time([monitor.pid]) - cpu_start) / elapsed
+                        recorder.stop()
+
+                    period = 1.0 / frequency
+                    jitter = [
+                        abs(current - last - period) * 1000.0
+                        for last, current in zip(recorder.stamps, recorder.stamps[1:])
+                    ]
+                    errors = {name: mean(values) for name, values in recorder.errors.items()}
+                    print(
+                        f"{frequency:6.1f} {load:<8}{len(recorder.stamps) / elapsed:7.2f}"
+                        f"{cpu_usage * 100.0:8.2f}"
+                        f"{statistics.pstdev(jitter) if jitter else float('nan'):11.2f}"
+                        f"{percentile(jitter, 0.95):12.2f}"
+                        f"{errors.get('cpu', float('nan')):9.2f}"
+                        f"{errors.get('ram', float('nan')):9.2f}"
+                        f"{errors.get('disk', float('nan')):10.2f}"
+                        f"{errors.get('temp', float('nan')):10.2f}"
+                    )
+            finally:
+                stop_sessions([monitor])
+    finally:
+        node.destroy_node()
+        rclpy.try_shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compile all configuration files read at robot startup into one validated, hash-stamped bundle.
+
+Usage: ros2 run husarion_ugv_utils compile_config_bundle -o /config/config_bundle.json
+    [--robot-model panther] [--wheel-type WH01] [--localization-mode relative] [--fuse-gps]
+    [--common-dir-path /config] [--check]
+
+Files are resolved the same way as in the launch files: from the common configuration directory
+if it is given (for packages supporting it), otherwise from the package share directory. Pass the
+bundle to bringup.launch.py with config_bundle_path:=<path>.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import stat
+import sys
+from typing import Callable, Dict, Optional, Tuple
+
+import yaml
+from ament_index_python.packages import get_package_share_directory
+from ros_components_description.components_config import parse_components_config
+
+BUNDLE_VERSION = 1
+
+_bundle_cache: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+
+
+def _validate_mapping(content, source: str) -> Dict:
+    if not isinstance(content, dict) or not content:
+        raise ValueError(f"Invalid configuration file {source}: expected non-empty mapping.")
+    return content
+
+
+def _validate_required_keys(required: Dict[str, type]) -> Callable:
+    def validate(content, source: str) -> None:
+        content = _validate_mapping(content, source)
+        for key, expected_type in required.items():
+            value = content.get(key)
+            valid = isinstance(value, expected_type)
+            if expected_type is float:
+                valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if not valid:
+                raise ValueError(
+                    f"Invalid configuration file {source}: '{key}' has to be of type "
+                    f"{expected_type.__name__}, got: {value!r}."
+                )
+
+    return validate
+
+
+def _validate_ros_parameters(content, source: str) -> None:
+    """Validates ROS parameters file: every 'ros__parameters' entry has to be a mapping."""
+    nodes = [_validate_mapping(content, source)]
+    parameters_found = False
+
+    while nodes:
+        node = nodes.pop()
+        for key, value in node.items():
+            if key == "ros__parameters":
+                if not isinstance(value, dict):
+                    raise ValueError(
+                        f"Invalid ROS parameters file {source}: 'ros__parameters' has to be "
+                        "a mapping."
+                    )
+                parameters_found = True
+            elif isinstance(value, dict):
+                nodes.append(value)
+
+    if not parameters_found:
+        raise ValueError(f"Invalid ROS parameters file {source}: no 'ros__parameters' found.")
+
+
+def _validate_components(content, source: str) -> None:
+    parse_components_config(content, source)
+
+
+class ConfigSource:
+    """
+    Configuration file of the bundle.
+
+    Args:
+        package (str): Package containing the default configuration file.
+        path (str): Path relative to the package, formatted with the bundle options.
+        validate (Callable): Function raising ValueError if the loaded content is invalid.
+        common_dir (bool): Whether the file is read from the common configuration directory if it
+            is given.
+    """
+
+    def __init__(self, package: str, path: str, validate: Callable, common_dir: bool = False):
+        self.package = package
+        self.path = path
+        self.validate = validate
+        self.common_dir = common_dir
+
+    def resolve(self, options: Dict[str, str], common_dir_path: str = "") -> str:
+        if self.common_dir and common_dir_path:
+            package_dir = os.path.join(common_dir_path, self.package)
+        else:
+            package_dir = get_package_share_directory(self.package)
+        return os.path.join(package_dir, self.path.format(**options))
+
+
+# Keys are used by launch files to select a configuration file from the bundle.
+CONFIG_SOURCES = {
+    "wheel": ConfigSource(
+        "husarion_ugv_description",
+        "config/{wheel_type}.yaml",
+        _validate_required_keys(
+            {
+                "wheel_radius": float,
+                "wheel_width": float,
+                "mount_point_offset": float,
+                "mass": float,
+                "inertia": dict,
+                "inertia_y_offset": float,
+                "mesh_package": str,
+                "folder_path": str,
+                "mecanum": bool,
+            }
+        ),
+    ),
+    "controller": ConfigSource(
+        "husarion_ugv_controller",
+        "config/{wheel_type}_controller.yaml",
+        _validate_ros_parameters,
+        common_dir=True,
+    ),
+    "components": ConfigSource(
+        "husarion_ugv_description",
+        "config/components.yaml",
+        _validate_components,
+        common_dir=True,
+    ),
+    "localization": ConfigSource(
+        "husarion_ugv_localization",
+        "config/{localization_mode}_localization{gps_postfix}.yaml",
+        _validate_ros_parameters,
+        common_dir=True,
+    ),
+    "animations": ConfigSource(
+        "husarion_ugv_lights",
+        "config/{robot_model}_animations.yaml",
+        _validate_required_keys(
+            {"panels": list, "segments": list, "segments_map": dict, "led_animations": list}
+        ),
+    ),
+    "user_animations": ConfigSource(
+        "husarion_ugv_lights",
+        "config/user_animations.yaml",
+        _validate_required_keys({"user_animations": list}),
+        common_dir=True,
+    ),
+    "lights_driver": ConfigSource(
+        "husarion_ugv_lights",
+        "config/{robot_model}_driver.yaml",
+        _validate_mapping,
+    ),
+    "lights_manager": ConfigSource(
+        "husarion_ugv_manager", "config/lights_manager.yaml", _validate_ros_parameters
+    ),
+    "safety_manager": ConfigSource(
+        "husarion_ugv_manager", "config/safety_manager.yaml", _validate_ros_parameters
+    ),
+    "shutdown_hosts": ConfigSource(
+        "husarion_ugv_manager",
+        "config/shutdown_hosts.yaml",
+        _validate_required_keys({"hosts": list}),
+        common_dir=True,
+    ),
+    "battery": ConfigSource(
+        "husarion_ugv_battery", "config/battery.yaml", _validate_ros_parameters
+    ),
+    "system_monitor": ConfigSource(
+        "husarion_ugv_diagnostics", "config/system_monitor.yaml", _validate_ros_parameters
+    ),
+}
+
+
+def _get_bundle_hash(bundle: Dict) -> str:
+    content = {key: value for key, value in bundle.items() if key != "hash"}
+    serialized = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def compile_bundle(
+    robot_model: str,
+    wheel_type: str,
+    localization_mode: str = "relative",
+    fuse_gps: bool = False,
+    common_dir_path: str = "",
+) -> Dict:
+    """
+    Resolves and validates all configuration files and returns the bundle.
+
+    Returns:
+        Dict: Bundle with the options, configuration files content and the hash of both.
+
+    Raises:
+        ValueError: If any configuration file is invalid.
+    """
+    options = {
+        "robot_model": robot_model,
+        "wheel_type": wheel_type,
+        "localization_mode": localization_mode,
+        "gps_postfix": "_with_gps" if fuse_gps else "",
+    }
+
+    configs = {}
+    for key, source in CONFIG_SOURCES.items():
+        path = source.resolve(options, common_dir_path)
+        with open(path, mode="r", encoding="utf-8") as file:
+            content = file.read()
+
+        try:
+            loaded = yaml.safe_load(content)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML in configuration file {path}: {e}")
+        source.validate(loaded, path)
+
+        configs[key] = {
+            "source": path,
+            "sha256": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+            "content": content,
+        }
+
+    bundle = {
+        "version": BUNDLE_VERSION,
+        "options": {**options, "common_dir_path": common_dir_path},
+        "configs": configs,
+    }
+    bundle["hash"] = _get_bundle_hash(bundle)
+    return bundle
+
+
+def write_bundle(bundle: Dict, bundle_path: str) -> None:
+    """Writes the bundle atomically and makes it read-only."""
+    tmp_path = bundle_path + ".tmp"
+    with open(tmp_path, mode="w", encoding="utf-8") as file:
+        json.dump(bundle, file, indent=1)
+    os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    os.replace(tmp_path, bundle_path)
+
+
+def load_bundle(bundle_path: str) -> Dict:
+    """
+    Loads the bundle, reusing the cached one while the file is unchanged.
+
+    Raises:
+        ValueError: If the bundle version is not supported or its hash doesn't match the content.
+    """
+    file_stat = os.stat(bundle_path)
+    file_id = (file_stat.st_mtime_ns, file_stat.st_size)
+
+    cached = _bundle_cache.get(bundle_path)
+    if cached is not None and cached[0] == file_id:
+        return cached[1]
+
+    with open(bundle_path, mode="r", encoding="utf-8") as file:
+        bundle = json.load(file)
+
+    if bundle.get("version") != BUNDLE_VERSION:
+        raise ValueError(
+            f"Unsupported configuration bundle version {bundle.get('version')} in {bundle_path}. "
+            f"Expected {BUNDLE_VERSION}, compile the bundle again."
+        )
+    if bundle.get("hash") != _get_bundle_hash(bundle):
+        raise ValueError(f"Configuration bundle {bundle_path} is corrupted: hash mismatch.")
+
+    _bundle_cache[bundle_path] = (file_id, bundle)
+    return bundle
+
+
+def get_bundled_config(bundle_path: str, key: str) -> Tuple[str, str]:
+    """
+    Returns content and the original file name of a configuration file from the bundle.
+
+    Raises:
+        KeyError: If there is no such configuration file in the bundle.
+    """
+    config = load_bundle(bundle_path)["configs"][key]
+    return config["content"], os.path.basename(config["source"])
+
+
+def check_bundle_options(bundle_path: str, launch_options: Dict[str, str]) -> None:
+    """
+    Checks if the bundle was compiled with the same options as the launch arguments. Options
+    missing in launch_options are not checked.
+
+    Args:
+        bundle_path (str): Path to the bundle.
+        launch_options (Dict[str, str]): Launch argument values keyed by the argument name, one of
+            robot_model, wheel_type, localization_mode, fuse_gps and common_dir_path.
+
+    Raises:
+        ValueError: If any option differs from the one the bundle was compiled with.
+    """
+    bundle_options = dict(load_bundle(bundle_path)["options"])
+    bundle_options["fuse_gps"] = str(bool(bundle_options.pop("gps_postfix", ""))).lower()
+
+    mismatches = []
+    for name, value in launch_options.items():
+        bundled = bundle_options.get(name, "")
+        if name == "fuse_gps":
+            value = value.lower()
+        elif name == "common_dir_path":
+            value = os.path.normpath(value) if value else ""
+            bundled = os.path.normpath(bundled) if bundled else ""
+        if value != bundled:
+            mismatches.append(f"{name}: '{value}' (bundle: '{bundled}')")
+
+    if mismatches:
+        raise ValueError(
+            "Launch arguments don't match the options the bundle was compiled with, compile the "
+            f"bundle again: {', '.join(mismatches)}."
+        )
+
+
+def main(args: Optional[list] = None):
+    from husarion_ugv_utils.substitutions import DEFAULT_WHEEL_TYPES
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", required=True, help="Path of the bundle file.")
+    parser.add_argument(
+        "--robot-model",
+        default=os.environ.get("ROBOT_MODEL_NAME", "panther"),
+        choices=list(DEFAULT_WHEEL_TYPES),
+    )
+    parser.add_argument(
+        "--wheel-type", default=None, help="Wheel type. Default depends on the robot model."
+    )
+    parser.add_argument("--localization-mode", default="relative", choices=["relative", "enu"])
+    parser.add_argument("--fuse-gps", action="store_true", help="Use GPS localization config.")
+    parser.add_argument("--common-dir-path", default="", help="Common configuration directory.")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only check if the existing bundle is up to date. Exits with 1 if it is not.",
+    )
+    args = parser.parse_args(args)
+
+    wheel_type = args.wheel_type or DEFAULT_WHEEL_TYPES[args.robot_model]
+    try:
+        bundle = compile_bundle(
+            args.robot_model,
+            wheel_type,
+            args.localization_mode,
+            args.fuse_gps,
+            args.common_dir_path,
+        )
+    except (OSError, ValueError) as e:
+        print(f"Failed to compile configuration bundle: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.check:
+        try:
+            current_hash = load_bundle(args.output)["hash"]
+        except (OSError, ValueError) as e:
+            print(f"Configuration bundle is invalid: {e}", file=sys.stderr)
+            sys.exit(1)
+        if current_hash != bundle["hash"]:
+            print(f"Configuration bundle {args.output} is out of date.", file=sys.stderr)
+            sys.exit(1)
+        print(f"Configuration bundle {args.output} is up to date ({bundle['hash'][:16]}).")
+        return
+
+    write_bundle(bundle, args.output)
+    print(
+        f"Compiled {len(bundle['configs'])} configuration files into {args.output} "
+        f"({bundle['hash'][:16]})."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Analyze the graph of includes, processes, timers and event handlers of a launch file statically.
+
+Usage:
+    ros2 run husarion_ugv_utils launch_graph husarion_ugv_bringup bringup.launch.py \\
+        [name:=value ...] [--format text|json|dot] [--process-runtime 1.0]
+
+The launch description is resolved like the launch service does (launch arguments, include
+chains, groups and conditions), but no process is started. From the graph the number of started
+processes and the expected critical path of the startup are computed: timers delay their actions
+by their period and actions of OnProcessStart/OnProcessExit handlers wait for the start or exit of
+their target process, which is assumed to run for --process-runtime seconds. Includes of the same
+file with the same arguments in the same ROS namespace are reported as redundant, in which case
+the exit code is 1.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ament_index_python.packages import get_package_share_directory
+from husarion_ugv_utils.supervision import SupervisedProcess
+from launch import LaunchContext, LaunchDescription, LaunchDescriptionEntity
+from launch.action import Action
+from launch.actions import (
+    EmitEvent,
+    ExecuteProcess,
+    IncludeLaunchDescription,
+    LogInfo,
+    RegisterEventHandler,
+    Shutdown,
+    TimerAction,
+)
+from launch.event_handlers import OnProcessExit, OnProcessStart
+from launch.events.process import ProcessExited, ProcessStarted
+from launch.launch_description_sources import PythonLaunchDescriptionSource
+from launch.utilities import normalize_to_list_of_substitutions, perform_substitutions
+from launch_ros.actions import Node
+
+# Event handlers whose actions are placed in the graph, with the awaited event of the target
+PROCESS_EVENTS = {
+    OnProcessStart: ("start", ProcessStarted),
+    OnProcessExit: ("exit", ProcessExited),
+}
+
+
+class GraphNode:
+    """
+    Entity of the launch graph.
+
+    Args:
+        kind (str): One of 'launch', 'include', 'process', 'timer', 'handler' or 'action'.
+        label (str): Human readable description of the entity.
+        parent (Optional[GraphNode]): Entity containing this one.
+        **attributes: Kind specific details, e.g. path and arguments of an include.
+    """
+
+    def __init__(self, kind: str, label: str, parent: Optional["GraphNode"] = None, **attributes):
+        self.kind = kind
+        self.label = label
+        self.parent = parent
+        self.attributes = attributes
+        self.children: List[GraphNode] = []
+        # Launch entity of processes and handlers, used to match handlers with their targets
+        self.entity = None
+        # Process whose event starts the actions of a handler
+        self.target: Optional[GraphNode] = None
+
+        if parent is not None:
+            parent.children.append(self)
+
+    def walk(self) -> Iterator["GraphNode"]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def include_chain(self) -> List[str]:
+        """Labels of the launch file and includes containing the entity, outermost first."""
+        node = self
+        chain = []
+        while node is not None:
+            if node.kind in ("launch", "include"):
+                chain.append(node.label)
+            node = node.parent
+        return chain[::-1]
+
+
+def _short_path(path: str) -> str:
+    """Returns the path relative to the share directory of its package, if installed."""
+    return path.split(os.sep + "share" + os.sep, 1)[-1]
+
+
+def _substitute(context: LaunchContext, value) -> str:
+    return perform_substitutions(context, normalize_to_list_of_substitutions(value))
+
+
+def _process_event(event_cls, action: Optional[ExecuteProcess]):
+    kwargs = dict(action=action, name="", cmd=[], cwd=None, env=None, pid=0)
+    if event_cls is ProcessExited:
+        kwargs["returncode"] = 0
+    return event_cls(**kwargs)
+
+
+def _is_asynchronous(entity: LaunchDescriptionEntity) -> bool:
+    """Whether the action runs a task in the launch loop, e.g. calls services of started nodes."""
+    return (
+        isinstance(entity, Action)
+        and type(entity).get_asyncio_future is not Action.get_asyncio_future
+    )
+
+
+class LaunchGraph:
+    """
+    Graph of a launch description resolved without executing any process.
+
+    Args:
+        launch_description (LaunchDescription): Launch description to analyze.
+        label (str): Label of the root of the graph, e.g. the launch file name.
+        process_runtime (float): Assumed run time in seconds of processes whose exit is awaited.
+    """
+
+    def __init__(
+        self, launch_description: LaunchDescription, label: str, process_runtime: float = 1.0
+    ):
+        self.root = GraphNode("launch", label)
+        self._context = LaunchContext()
+        self._process_runtime = process_runtime
+        self._handlers: List[GraphNode] = []
+        self._start_times: Dict[int, Tuple[float, List[str]]] = {}
+
+        self._walk([launch_description], self.root)
+        self._resolve_handler_targets()
+
+    @property
+    def processes(self) -> List[GraphNode]:
+        return [node for node in self.root.walk() if node.kind == "process"]
+
+    def _walk(self, entities: Iterable[LaunchDescriptionEntity], parent: GraphNode) -> None:
+        for entity in entities:
+            condition = getattr(entity, "condition", None)
+            if condition is not None and not condition.evaluate(self._context):
+                continue
+
+            if isinstance(entity, IncludeLaunchDescription):
+                self._add_include(entity, parent)
+            elif isinstance(entity, ExecuteProcess):
+                self._add_process(entity, parent)
+            elif isinstance(entity, SupervisedProcess):
+                self._add_process(entity.create_process(), parent, criticality=entity.criticality)
+            elif isinstance(entity, TimerAction):
+                period = entity.period
+                if not isinstance(period, (int, float)):
+                    period = _substitute(self._context, period)
+                timer = GraphNode("timer", "timer", parent, period=float(period))
+                self._walk(entity.actions, timer)
+            elif isinstance(entity, RegisterEventHandler):
+                self._add_handler(entity.event_handler, parent)
+            elif isinstance(entity, LogInfo):
+                continue
+            elif isinstance(entity, (EmitEvent, Shutdown)) or _is_asynchronous(entity):
+                GraphNode("action", type(entity).__name__, parent)
+            else:
+                self._walk(entity.visit(self._context) or [], parent)
+
+    def _add_include(self, entity: IncludeLaunchDescription, parent: GraphNode) -> None:
+        arguments = {
+            _substitute(self._context, name): _substitute(self._context, value)
+            for name, value in entity.launch_arguments
+        }
+        namespace = self._context.launch_configurations.get("ros_namespace", "")
+        entities = entity.visit(self._context) or []
+        path = entity.launch_description_source.location
+
+        include = GraphNode(
+            "include",
+            _short_path(path),
+            parent,
+            path=path,
+            arguments=arguments,
+            namespace=namespace,
+        )
+        self._walk(entities, include)
+
+    def _add_process(self, entity: ExecuteProcess, parent: GraphNode, **attributes) -> None:
+        if entity.condition is not None and not entity.condition.evaluate(self._context):
+            return
+
+        if isinstance(entity, Node):
+            entity._perform_substitutions(self._context)
+        entity.process_description.prepare(self._context, entity)
+        cmd = entity.process_description.final_cmd
+
+        if isinstance(entity, Node):
+            package = _substitute(self._context, entity.node_package)
+            executable = _substitute(self._context, entity.node_executable)
+            label = f"{package}/{executable}"
+            try:
+                name = entity.node_name
+            except RuntimeError:
+                name = Node.UNSPECIFIED_NODE_NAME
+
+            if Node.UNSPECIFIED_NODE_NAME not in name:
+                label += f" ({name})"
+            else:
+                # Unnamed nodes, e.g. controller spawners, are told apart by their first argument
+                start = next(
+                    (i + 1 for i, part in enumerate(cmd) if os.path.basename(part) == executable),
+                    len(cmd),
+                )
+                arguments = itertools.takewhile(
+                    lambda part: part != "--ros-args", itertools.islice(cmd, start, None)
+                )
+                label = " ".join([label, *itertools.islice(arguments, 1)])
+        else:
+            label = " ".join(cmd)
+
+        process = GraphNode("process", label, parent, **attributes)
+        process.entity = entity
+
+    def _add_handler(self, handler, parent: GraphNode) -> None:
+        event = next(
+            (event for cls, event in PROCESS_EVENTS.items() if isinstance(handler, cls)), None
+        )
+        if event is None:
+            GraphNode("handler", type(handler).__name__, parent)
+            return
+
+        name, event_cls = event
+        node = GraphNode("handler", f"on {name}", parent, event=name)
+        node.entity = handler
+        self._handlers.append(node)
+
+        # Actions of the handler are resolved in the context of its registration, which differs
+        # from the launch service only if they depend on the event itself
+        try:
+            entities = handler.handle(_process_event(event_cls, None), self._context)
+        except Exception as e:
+            node.label += f" (actions depend on the event: {e})"
+            return
+
+        if entities is None:
+            entities = []
+        elif not isinstance(entities, (list, tuple)):
+            entities = [entities]
+        self._walk(entities, node)
+
+    def _resolve_handler_targets(self) -> None:
+        processes = self.processes
+        for node in self._handlers:
+            event_cls = PROCESS_EVENTS[type(node.entity)][1]
+            targets = [
+                process
+                for process in processes
+                if node.entity.matches(_process_event(event_cls, process.entity))
+            ]
+            if len(targets) == 1:
+                node.target = targets[0]
+                node.label += f" of {node.target.label}"
+            else:
+                node.label += f" of {len(targets)} processes"
+
+    def start_time(self, node: GraphNode) -> Tuple[float, List[str]]:
+        """
+        Returns the expected start time of the entity and the chain of timers and process events
+        it waits for.
+        """
+        key = id(node)
+        if key in self._start_times:
+            return self._start_times[key]
+        # Guards against handlers waiting for processes they start themselves
+        self._start_times[key] = (0.0, [])
+
+        start, chain = 0.0, []
+        if node.parent is not None:
+            start, chain = self.start_time(node.parent)
+            if node.parent.kind == "timer":
+                period = node.parent.attributes["period"]
+                start, chain = start + period, chain + [f"{period:g} s timer"]
+
+        if node.target is not None:
+            target_start, target_chain = self.start_time(node.target)
+            event = node.attributes["event"]
+            if event == "exit":
+                target_start += self._process_runtime
+            if target_start >= start:
+                start, chain = target_start, target_chain + [f"{event} of {node.target.label}"]
+
+        self._start_times[key] = (start, chain)
+        return start, chain
+
+    def critical_path(self) -> Tuple[float, List[str]]:
+        """Returns the expected time until the last process starts and the chain delaying it."""
+        critical = (0.0, [])
+        for process in self.processes:
+            start, chain = self.start_time(process)
+            if start >= critical[0]:
+                critical = (start, chain + [process.label])
+        return critical
+
+    def redundant_includes(self) -> List[List[GraphNode]]:
+        """Groups of includes of the same file with the same arguments in the same namespace."""
+        includes: Dict[Tuple, List[GraphNode]] = {}
+        for node in self.root.walk():
+            if node.kind != "include":
+                continue
+            key = (
+                node.attributes["path"],
+                tuple(sorted(node.attributes["arguments"].items())),
+                node.attributes["namespace"],
+            )
+            includes.setdefault(key, []).append(node)
+        return [group for group in includes.values() if len(group) > 1]
+
+    def _describe(self, node: GraphNode) -> str:
+        if node.kind == "include" and node.attributes["arguments"]:
+            arguments = ", ".join(
+                f"{name}={value}" for name, value in node.attributes["arguments"].items()
+            )
+            return f"include {node.label} [{arguments}]"
+        if node.kind == "process":
+            description = f"process {node.label} at {self.start_time(node)[0]:.1f} s"
+            if "criticality" in node.attributes:
+                description += f" ({node.attributes['criticality']})"
+            return description
+        if node.kind == "timer":
+            return f"timer {node.attributes['period']:g} s"
+        if node.kind == "launch":
+            return node.label
+        return f"{node.kind} {node.label}"
+
+    def format_text(self) -> str:
+        lines = []
+
+        def add_lines(node: GraphNode, depth: int) -> None:
+            lines.append("  " * depth + self._describe(node))
+            for child in node.children:
+                add_lines(child, depth + 1)
+
+        add_lines(self.root, 0)
+
+        duration, chain = self.critical_path()
+        lines.append("")
+        lines.append(f"Processes: {len(self.processes)}")
+        lines.append(f"Critical path: {duration:.1f} s")
+        lines.extend(f"  {step}" for step in chain)
+
+        redundant = self.redundant_includes()
+        lines.append(f"Redundant includes: {len(redundant)}")
+        for group in redundant:
+            lines.append(f"  {self._describe(group[0])} included {len(group)} times from:")
+            lines.extend(f"    {' -> '.join(node.parent.include_chain())}" for node in group)
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict:
+        def node_dict(node: GraphNode) -> Dict:
+            data = {"kind": node.kind, "label": node.label, **node.attributes}
+            if node.kind == "process":
+                data["start_time"] = self.start_time(node)[0]
+            if node.children:
+                data["children"] = [node_dict(child) for child in node.children]
+            return data
+
+        duration, chain = self.critical_path()
+        return {
+            "graph": node_dict(self.root),
+            "processes": len(self.processes),
+            "critical_path": {"duration": duration, "chain": chain},
+            "redundant_includes": [
+                {
+                    "path": group[0].attributes["path"],
+                    "arguments": group[0].attributes["arguments"],
+                    "included_from": [node.parent.include_chain() for node in group],
+                }
+                for group in self.redundant_includes()
+            ],
+        }
+
+    def format_dot(self) -> str:
+        shapes = {
+            "launch": "box",
+            "include": "box",
+            "process": "ellipse",
+            "timer": "diamond",
+            "handler": "hexagon",
+            "action": "plaintext",
+        }
+        ids = {id(node): f"n{i}" for i, node in enumerate(self.root.walk())}
+
+        lines = ["digraph launch {", "  rankdir=LR;"]
+        for node in self.root.walk():
+            label = self._describe(node).replace('"', '\\"')
+            lines.append(f'  {ids[id(node)]} [shape={shapes[node.kind]}, label="{label}"];')
+            if node.parent is not None:
+                lines.append(f"  {ids[id(node.parent)]} -> {ids[id(node)]};")
+            if node.target is not None:
+                lines.append(
+                    f"  {ids[id(node.target)]} -> {ids[id(node)]} "
+                    f'[style=dashed, label="{node.attributes["event"]}"];'
+                )
+        lines.append("}")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("package", help="Package of the launch file.")
+    parser.add_argument("launch_file", help="Launch file name, e.g. bringup.launch.py.")
+    parser.add_argument(
+        "launch_arguments", nargs="*", help="Launch arguments in 'name:=value' format."
+    )
+    parser.add_argument("--format", choices=["text", "json", "dot"], default="text")
+    parser.add_argument(
+        "--process-runtime",
+        type=float,
+        default=1.0,
+        help="Assumed run time in seconds of processes whose exit is awaited, e.g. spawners.",
+    )
+    args = parser.parse_args()
+
+    path = os.path.join(get_package_share_directory(args.package), "launch", args.launch_file)
+    if not os.path.isfile(path):
+        sys.exit(f"Launch file not found: {path}")
+
+    launch_arguments = dict(argument.split(":=", 1) for argument in args.launch_arguments)
+    launch_description = LaunchDescription(
+        [
+            IncludeLaunchDescription(
+                PythonLaunchDescriptionSource(path), launch_arguments=launch_arguments.items()
+            )
+        ]
+    )
+
+    # Nodes write their parameters to temporary files, keep them out of the system temp dir
+    with tempfile.TemporaryDirectory(prefix="husarion_ugv_launch_graph_") as tmp_dir:
+        tempfile.tempdir = tmp_dir
+        graph = LaunchGraph(launch_description, args.launch_file, args.process_runtime)
+
+    if args.format == "json":
+        print(json.dumps(graph.to_dict(), indent=2))
+    elif args.format == "dot":
+        print(graph.format_dot())
+    else:
+        print(graph.format_text())
+
+    # Redundant includes start duplicated processes, fail so the check can be used in CI
+    sys.exit(1 if graph.redundant_includes() else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Record the fully resolved process list of a launch file and start it again without evaluating
+the launch description.
+
+Usage:
+    ros2 run husarion_ugv_utils launch_snapshot record -o /config/bringup_snapshot \\
+        husarion_ugv_bringup bringup.launch.py [name:=value ...] [--duration 30]
+    ros2 run husarion_ugv_utils launch_snapshot run /config/bringup_snapshot
+
+'record' launches the file normally and stores every started process (executable, arguments,
+parameter files, remappings, namespace, environment), its supervision policy, the start order and
+delays, composable nodes loaded into its containers, and a hash of the inputs: launch arguments,
+environment and files of the packages involved. As the launch really runs, hardware drivers are
+started while recording. 'run' starts the processes directly from the snapshot if the input hash
+still matches, otherwise it falls back to 'ros2 launch' with the recorded arguments. Composable
+nodes are loaded again every time their container starts, as the launch does.
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+SNAPSHOT_VERSION = 3
+SNAPSHOT_FILE = "snapshot.json"
+SNAPSHOT_DIR_PLACEHOLDER = "${SNAPSHOT_DIR}"
+
+# Packages whose files are included in the input hash, besides the ones of started executables
+DEFAULT_WATCHED_PACKAGES = ["husarion_ugv_*", "ros_components_description"]
+WATCHED_ENVIRONMENT_PREFIXES = ("ROBOT_", "ROS_", "RMW_", "SYSTEM_BUILD_VERSION", "AMENT_")
+
+SHUTDOWN_TIMEOUT = 10.0
+
+# husarion_ugv_utils.supervision.Criticality values, not imported so replay doesn't load launch
+CRITICAL = "critical"
+RESPAWN = "respawn"
+
+
+def _stat_tree(path: str, digest, exclude_dir: str) -> None:
+    """
+    Adds path, size and modification time of every file in the tree to the digest. Files in
+    exclude_dir are skipped.
+    """
+    if os.path.realpath(path).startswith(exclude_dir + os.sep):
+        return
+
+    if os.path.isfile(path):
+        file_stat = os.stat(path)
+        digest.update(f"{path}:{file_stat.st_size}:{file_stat.st_mtime_ns}\n".encode())
+        return
+
+    for root, dirs, files in os.walk(path):
+        if os.path.realpath(root) == exclude_dir:
+            dirs.clear()
+            continue
+        dirs.sort()
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                continue
+            digest.update(f"{file_path}:{file_stat.st_size}:{file_stat.st_mtime_ns}\n".encode())
+
+
+def get_watched_packages(patterns: List[str]) -> Dict[str, str]:
+    from ament_index_python.packages import get_packages_with_prefixes
+
+    packages = get_packages_with_prefixes()
+    return {
+        name: os.path.join(prefix, "share", name)
+        for name, prefix in sorted(packages.items())
+        if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    }
+
+
+def compute_input_hash(inputs: Dict, snapshot_dir: str) -> str:
+    """
+    Hash of everything the resolved launch tree depends on. File contents are not read, their
+    size and modification time are used instead, so the check is fast enough for the boot path.
+    The snapshot directory is excluded, as it is written after the hash is computed and may be
+    placed in a watched directory (e.g. common_dir_path).
+    """
+    exclude_dir = os.path.realpath(snapshot_dir)
+    digest = hashlib.sha256()
+    digest.update(json.dumps(inputs["launch"], sort_keys=True).encode())
+
+    for name in sorted(os.environ):
+        if name.startswith(WATCHED_ENVIRONMENT_PREFIXES):
+            digest.update(f"{name}={os.environ[name]}\n".encode())
+
+    for share_dir in get_watched_packages(inputs["packages"]).values():
+        _stat_tree(share_dir, digest, exclude_dir)
+
+    # Launch arguments pointing to files or directories (e.g. common_dir_path)
+    for value in inputs["launch"]["arguments"].values():
+        if os.path.isabs(value) and os.path.exists(value):
+            _stat_tree(value, digest, exclude_dir)
+
+    return digest.hexdigest()
+
+
+class _SnapshotFiles:
+    """Copies temporary files referenced by processes (e.g. parameter files) into the snapshot."""
+
+    def __init__(self, snapshot_dir: str):
+        self._files_dir = os.path.join(snapshot_dir, "files")
+        self._copied: Dict[str, str] = {}
+        self._pattern = re.compile(re.escape(tempfile.gettempdir()) + r"/[^\s'\",;]+")
+
+    def persist(self, text: str) -> str:
+        return self._pattern.sub(lambda match: self._persist_file(match.group(0)), text)
+
+    def _persist_file(self, path: str) -> str:
+        if not os.path.isfile(path):
+            return path
+        if path in self._copied:
+            return self._copied[path]
+
+        with open(path, mode="r", encoding="utf-8", errors="surrogateescape") as file:
+            content = file.read()
+        # Temporary files may reference other temporary files (e.g. rendered configs)
+        content = self.persist(content)
+
+        file_hash = hashlib.sha256(content.encode("utf-8", "surrogateescape")).hexdigest()[:16]
+        file_name = file_hash + os.path.splitext(path)[1]
+        os.makedirs(self._files_dir, exist_ok=True)
+        with open(os.path.join(self._files_dir, file_name), mode="w", encoding="utf-8") as file:
+            file.write(content)
+
+        snapshot_path = f"{SNAPSHOT_DIR_PLACEHOLDER}/files/{file_name}"
+        self._copied[path] = snapshot_path
+        return snapshot_path
+
+
+def record_snapshot(
+    package: str,
+    launch_file: str,
+    launch_arguments: Dict[str, str],
+    snapshot_dir: str,
+    duration: float,
+    watched_packages: List[str],
+) -> Dict:
+    """
+    Launches the file, records started processes for the given duration and writes the snapshot.
+
+    Returns:
+        Dict: The snapshot.
+    """
+    from husarion_ugv_utils.supervision import get_supervisor
+    from launch import LaunchDescription, LaunchService
+    from launch.actions import (
+        IncludeLaunchDescription,
+        RegisterEventHandler,
+        Shutdown,
+        TimerAction,
+    )
+    from launch.event_handlers import OnProcessExit, OnProcessStart
+    from launch.launch_description_sources import AnyLaunchDescriptionSource
+    from launch_ros.actions import ComposableNodeContainer, LoadComposableNodes
+    from ros2launch.api import get_share_file_path_from_package
+    from rosidl_runtime_py import message_to_ordereddict
+
+    launch_file_path = get_share_file_path_from_package(
+        package_name=package, file_name=launch_file
+    )
+
+    start_time = time.monotonic()
+    processes: List[Dict] = []
+    indices: Dict[int, int] = {}
+    supervised: Dict[int, int] = {}
+    exited: List[int] = []
+    composable_nodes: Dict[str, List[Dict]] = {}
+
+    # Files referenced by processes have to be copied before the launch removes them
+    shutil.rmtree(os.path.join(snapshot_dir, "files"), ignore_errors=True)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    files = _SnapshotFiles(snapshot_dir)
+
+    def on_start(event, context):
+        supervisor = get_supervisor(event.action)
+        if supervisor is not None and id(supervisor) in supervised:
+            # Restarted by its supervisor, replay applies the same policy
+            indices[id(event.action)] = supervised[id(supervisor)]
+            return
+
+        indices[id(event.action)] = len(processes)
+        if supervisor is not None:
+            supervised[id(supervisor)] = len(processes)
+        container = (
+            event.action.node_name if isinstance(event.action, ComposableNodeContainer) else None
+        )
+
+        env = event.env or os.environ
+        processes.append(
+            {
+                "name": event.name,
+                "cmd": [files.persist(arg) for arg in event.cmd],
+                "cwd": event.cwd,
+                "env": {
+                    key: files.persist(value)
+                    for key, value in env.items()
+                    if os.environ.get(key) != value
+                },
+                "start_time": round(time.monotonic() - start_time, 3),
+                # Processes that exited before this one started (e.g. chained controller spawners)
+                "after": list(exited),
+                "exits": False,
+                "supervision": (
+                    {"criticality": supervisor.criticality, **supervisor.restart_policy}
+                    if supervisor is not None
+                    else None
+                ),
+                "container": container,
+            }
+        )
+
+    # launch_ros emits no event for loaded composable nodes, so requests are recorded when sent
+    load_node = LoadComposableNodes._load_node
+
+    def record_load_node(action, request, context):
+        load_node(action, request, context)
+        container = action._LoadComposableNodes__final_target_container_name
+        fields = json.loads(files.persist(json.dumps(message_to_ordereddict(request))))
+        requests = composable_nodes.setdefault(container, [])
+        # Nodes are loaded again when a respawned container restarts
+        if fields not in requests:
+            requests.append(fields)
+
+    def on_exit(event, context):
+        index = indices.get(id(event.action))
+        supervisor = get_supervisor(event.action)
+        if index is None or (supervisor and supervisor.criticality == RESPAWN):
+            return
+        processes[index]["exits"] = True
+        exited.append(index)
+
+    launch_description = LaunchDescription(
+        [
+            RegisterEventHandler(OnProcessStart(on_start=on_start)),
+            RegisterEventHandler(OnProcessExit(on_exit=on_exit)),
+            IncludeLaunchDescription(
+                AnyLaunchDescriptionSource(launch_file_path),
+                launch_arguments=launch_arguments.items(),
+            ),
+            TimerAction(period=duration, actions=[Shutdown(reason="Launch snapshot recorded")]),
+        ]
+    )
+
+    launch_service = LaunchService()
+    launch_service.include_launch_description(launch_description)
+    LoadComposableNodes._load_node = record_load_node
+    try:
+        launch_service.run()
+    finally:
+        LoadComposableNodes._load_node = load_node
+
+    for process in processes:
+        process["composable_nodes"] = composable_nodes.pop(process["container"], [])
+    for container in composable_nodes:
+        print(
+            f"Warning: composable nodes loaded into {container}, which is not started by the "
+            "launch, are not part of the snapshot.",
+            file=sys.stderr,
+        )
+
+    inputs = {
+        "launch": {"package": package, "file": launch_file, "arguments": launch_arguments},
+        "packages": sorted(
+            set(watched_packages)
+            | {package}
+            | {
+                match.group(1)
+                for process in processes
+                for match in [re.search(r"/lib/([^/]+)/", process["cmd"][0])]
+                if match
+            }
+        ),
+    }
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "inputs": inputs,
+        "input_hash": compute_input_hash(inputs, snapshot_dir),
+        "processes": processes,
+    }
+
+    with open(os.path.join(snapshot_dir, SNAPSHOT_FILE), mode="w", encoding="utf-8") as file:
+        json.dump(snapshot, file, indent=1)
+    return snapshot
+
+
+def load_snapshot(snapshot_dir: str) -> Optional[Dict]:
+    """Returns the snapshot if it exists and its inputs didn't change, otherwise None."""
+    try:
+        with open(os.path.join(snapshot_dir, SNAPSHOT_FILE), mode="r", encoding="utf-8") as file:
+            snapshot = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    if compute_input_hash(snapshot["inputs"], snapshot_dir) != snapshot["input_hash"]:
+        return None
+    return snapshot
+
+
+def load_composable_nodes(container: str, requests_path: str) -> int:
+    """
+    Loads recorded composable nodes into the container once its load service is available.
+
+    Returns:
+        int: Exit code, non-zero if any of the nodes failed to load.
+    """
+    import rclpy
+    from composition_interfaces.srv import LoadNode
+    from rosidl_runtime_py.set_message import set_message_fields
+
+    with open(requests_path, mode="r", encoding="utf-8") as file:
+        requests = json.load(file)
+
+    rclpy.init()
+    node = rclpy.create_node(f"launch_snapshot_loader_{os.getpid()}")
+    client = node.create_client(LoadNode, f"{container}/_container/load_node")
+    failures = 0
+    try:
+        while not client.wait_for_service(timeout_sec=1.0):
+            print(f"[INFO] [launch_snapshot]: waiting for '{client.srv_name}' service")
+
+        for fields in requests:
+            request = LoadNode.Request()
+            set_message_fields(request, fields)
+            future = client.call_async(request)
+            rclpy.spin_until_future_complete(node, future)
+            response = future.result()
+            if response.success:
+                print(
+                    f"[INFO] [launch_snapshot]: loaded node '{response.full_node_name}' in "
+                    f"container '{container}'"
+                )
+            else:
+                failures += 1
+                print(
+                    f"[ERROR] [launch_snapshot]: failed to load node '{request.node_name}' of "
+                    f"type '{request.plugin_name}' in container '{container}': "
+                    f"{response.error_message}",
+                    file=sys.stderr,
+                )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.destroy_node()
+        rclpy.try_shutdown()
+
+    return 1 if failures else 0
+
+
+def _stop_processes(processes: Dict[int, subprocess.Popen]) -> None:
+    running = [process for process in processes.values() if process.poll() is None]
+    for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGKILL):
+        for process in running:
+            process.send_signal(sig)
+
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+        while time.monotonic() < deadline and any(p.poll() is None for p in running):
+            time.sleep(0.05)
+
+        running = [process for process in running if process.poll() is None]
+        if not running:
+            return
+
+
+def _prepare_runtime_dir(snapshot_dir: str) -> str:
+    """
+    Copies snapshot files into a temporary directory, resolving references between them, so the
+    snapshot itself stays relocatable.
+    """
+    runtime_dir = tempfile.mkdtemp(prefix="husarion_ugv_snapshot_")
+    files_dir = os.path.join(snapshot_dir, "files")
+    if not os.path.isdir(files_dir):
+        return runtime_dir
+
+    os.makedirs(os.path.join(runtime_dir, "files"))
+    for file_name in os.listdir(files_dir):
+        with open(os.path.join(files_dir, file_name), mode="r", encoding="utf-8") as file:
+            content = file.read().replace(SNAPSHOT_DIR_PLACEHOLDER, runtime_dir)
+        with open(
+            os.path.join(runtime_dir, "files", file_name), mode="w", encoding="utf-8"
+        ) as file:
+            file.write(content)
+    return runtime_dir
+
+
+def replay_snapshot(snapshot: Dict, snapshot_dir: str) -> int:
+    """
+    Starts processes from the snapshot in the recorded order. A process is started after its
+    recorded delay and once all processes that exited before its start during recording have
+    exited. Recorded supervision policies are applied: exit of a critical process stops all
+    processes, respawned processes are restarted with the same backoff as in the launch. Exit of
+    other processes is only logged, as in the launch. Recorded composable nodes are loaded every
+    time their container starts.
+
+    Returns:
+        int: Exit code, non-zero if a critical process exited.
+    """
+    entries = snapshot["processes"]
+    runtime_dir = _prepare_runtime_dir(snapshot_dir)
+
+    def resolve(value: str) -> str:
+        return value.replace(SNAPSHOT_DIR_PLACEHOLDER, runtime_dir)
+
+    shutdown_requested = []
+    signal.signal(signal.SIGINT, lambda *_: shutdown_requested.append(True))
+    signal.signal(signal.SIGTERM, lambda *_: shutdown_requested.append(True))
+
+    processes: Dict[int, subprocess.Popen] = {}
+    loaders: Dict[int, subprocess.Popen] = {}
+    started: Dict[int, float] = {}
+    exited: Dict[int, int] = {}
+    restarts: Dict[int, float] = {}
+    delays = {
+        index: entry["supervision"]["initial_delay"]
+        for index, entry in enumerate(entries)
+        if entry["supervision"]
+    }
+    pending = list(range(len(entries)))
+    exit_code = 0
+    start_time = time.monotonic()
+
+    def start(index: int) -> None:
+        entry = entries[index]
+        env = {**os.environ, **{k: resolve(v) for k, v in entry["env"].items()}}
+        processes[index] = subprocess.Popen(
+            [resolve(arg) for arg in entry["cmd"]], cwd=entry["cwd"], env=env
+        )
+        started[index] = time.monotonic()
+        print(f"[INFO] [launch_snapshot]: process started [{entry['name']}]")
+
+        if entry["composable_nodes"]:
+            requests_path = os.path.join(runtime_dir, f"composable_nodes_{index}.json")
+            with open(requests_path, mode="w", encoding="utf-8") as file:
+                file.write(resolve(json.dumps(entry["composable_nodes"])))
+            loaders[index] = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "husarion_ugv_utils.launch_snapshot",
+                    "load",
+                    entry["container"],
+                    requests_path,
+                ]
+            )
+
+    try:
+        while not shutdown_requested:
+            now = time.monotonic() - start_time
+            for index in list(pending):
+                entry = entries[index]
+                if now < entry["start_time"] or not all(i in exited for i in entry["after"]):
+                    continue
+                pending.remove(index)
+                start(index)
+
+            for index, restart_time in list(restarts.items()):
+                if now >= restart_time:
+                    del restarts[index]
+                    start(index)
+
+            for index, process in list(processes.items()):
+                if index in exited or index in restarts or process.poll() is None:
+                    continue
+
+                entry = entries[index]
+                supervision = entry["supervision"] or {}
+                uptime = time.monotonic() - started[index]
+                if index in loaders:
+                    _stop_processes({index: loaders.pop(index)})
+                print(
+                    f"[INFO] [launch_snapshot]: process [{entry['name']}] exited "
+                    f"[{process.returncode}]"
+                )
+
+                if supervision.get("criticality") == RESPAWN:
+                    if uptime >= supervision["stable_time"]:
+                        delays[index] = supervision["initial_delay"]
+                    restarts[index] = now + delays[index]
+                    print(
+                        f"[WARN] [launch_snapshot]: restarting [{entry['name']}] in "
+                        f"{delays[index] * 1000.0:.0f} ms"
+                    )
+                    delays[index] = min(
+                        delays[index] * supervision["backoff_factor"], supervision["max_delay"]
+                    )
+                    continue
+
+                exited[index] = process.returncode
+                if supervision.get("criticality") == CRITICAL:
+                    exit_code = process.returncode or 1
+                    shutdown_requested.append(True)
+
+            if not pending and not restarts and len(exited) == len(entries):
+                break
+            time.sleep(0.02)
+    finally:
+        _stop_processes(loaders)
+        _stop_processes(processes)
+        shutil.rmtree(runtime_dir, ignore_errors=True)
+
+    return exit_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Record a snapshot of a launch file.")
+    record_parser.add_argument("package", help="Package containing the launch file.")
+    record_parser.add_argument("launch_file", help="Name of the launch file.")
+    record_parser.add_argument(
+        "launch_arguments", nargs="*", help="Launch arguments in 'name:=value' format."
+    )
+    record_parser.add_argument("-o", "--output", required=True, help="Snapshot directory.")
+    record_parser.add_argument(
+        "--duration",
+        type=float,
+        default=30.0,
+        help="Time in seconds to record started processes. Has to cover all delayed actions.",
+    )
+    record_parser.add_argument(
+        "--watch",
+        nargs="*",
+        default=DEFAULT_WATCHED_PACKAGES,
+        help="Patterns of packages whose files are included in the input hash.",
+    )
+
+    run_parser = subparsers.add_parser("run", help="Start processes from a snapshot.")
+    run_parser.add_argument("snapshot", help="Snapshot directory.")
+
+    load_parser = subparsers.add_parser(
+        "load", help="Load recorded composable nodes into a container, used by 'run'."
+    )
+    load_parser.add_argument("container", help="Fully qualified name of the container.")
+    load_parser.add_argument("requests", help="Path to the recorded load requests.")
+
+    args = parser.parse_args()
+
+    if args.command == "load":
+        sys.exit(load_composable_nodes(args.container, args.requests))
+
+    if args.command == "record":
+        launch_arguments = dict(argument.split(":=", 1) for argument in args.launch_arguments)
+        snapshot = record_snapshot(
+            args.package,
+            args.launch_file,
+            launch_arguments,
+            args.output,
+            args.duration,
+            args.watch,
+        )
+        print(
+            f"Recorded {len(snapshot['processes'])} processes into {args.output} "
+            f"({snapshot['input_hash'][:16]})."
+        )
+        return
+
+    snapshot = load_snapshot(args.snapshot)
+    if snapshot is None:
+        try:
+            with open(os.path.join(args.snapshot, SNAPSHOT_FILE), encoding="utf-8") as file:
+                launch = json.load(file)["inputs"]["launch"]
+        except (OSError, ValueError, KeyError):
+            print(f"Invalid launch snapshot {args.snapshot}.", file=sys.stderr)
+            sys.exit(1)
+
+        print("Launch snapshot is out of date, falling back to 'ros2 launch'.", file=sys.stderr)
+        arguments = [f"{name}:={value}" for name, value in launch["arguments"].items()]
+        os.execvp("ros2", ["ros2", "launch", launch["package"], launch["file"], *arguments])
+
+    sys.exit(replay_snapshot(snapshot, args.snapshot))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run a node with its output rate limited, deduplicated and logged to compressed JSON lines files.
+
+Usage: ros2 run husarion_ugv_utils log_pipeline --name <name> [--directory <dir>] [--rate 50]
+    [--burst 200] [--max-bytes 10485760] [--backups 5] -- <command> [<args> ...]
+
+Output of the command is read asynchronously. Lines passing the rate limit are echoed to the
+screen and written as records ({"t", "node", "stream", "level", "msg"}) to '<name>.jsonl.gz'.
+Warnings and errors are never rate limited. Consecutive duplicates (ignoring ROS timestamps) are
+collapsed into a single record with a 'repeated' count. Files are rotated by compressed size.
+Exits with the exit code of the command.
+"""
+
+import argparse
+import asyncio
+import ctypes
+import gzip
+import json
+import os
+import re
+import signal
+import sys
+import time
+from typing import List, Optional
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+ROS_LEVEL = re.compile(r"^\[(DEBUG|INFO|WARN|ERROR|FATAL)\]")
+ROS_TIMESTAMP = re.compile(r"\[\d+\.\d+\]")
+UNLIMITED_LEVELS = ("WARN", "ERROR", "FATAL")
+
+FLUSH_PERIOD = 1.0
+LINE_LIMIT = 1024 * 1024
+PR_SET_PDEATHSIG = 1
+
+
+def get_default_directory() -> str:
+    log_dir = os.environ.get("ROS_LOG_DIR")
+    if not log_dir:
+        ros_home = os.environ.get("ROS_HOME", os.path.expanduser("~/.ros"))
+        log_dir = os.path.join(ros_home, "log")
+    return os.path.join(log_dir, "husarion_ugv")
+
+
+class TokenBucket:
+    """
+    Rate limiter allowing short bursts above the average rate.
+
+    Args:
+        rate (float): Average number of lines per second.
+        burst (int): Maximum number of lines passed at once.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_update = time.monotonic()
+
+    def consume(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_update) * self.rate)
+        self._last_update = now
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+
+class RotatingJsonLinesFile:
+    """
+    Gzip compressed JSON lines file, rotated when its compressed size exceeds the limit. Rotated
+    files are named '<name>.<n>.jsonl.gz', the oldest are removed.
+
+    Args:
+        directory (str): Directory of log files.
+        name (str): Base name of log files.
+        max_bytes (int): Compressed size after which the file is rotated.
+        backups (int): Number of rotated files kept.
+    """
+
+    def __init__(self, directory: str, name: str, max_bytes: int, backups: int):
+        self.directory = directory
+        self.name = name
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file: Optional[gzip.GzipFile] = None
+        self._raw = None
+
+        os.makedirs(directory, exist_ok=True)
+        # Each run starts a new file, the previous one becomes the first backup
+        if os.path.exists(self._path(0)):
+            self._rotate()
+        self._open()
+
+    def _path(self, index: int) -> str:
+        suffix = f".{index}" if index else ""
+        return os.path.join(self.directory, f"{self.name}{suffix}.jsonl.gz")
+
+    def _open(self) -> None:
+        self._raw = open(self._path(0), mode="wb")
+        self._file = gzip.GzipFile(fileobj=self._raw, mode="wb")
+
+    def _rotate(self) -> None:
+        if self.backups == 0:
+            os.remove(self._path(0))
+            return
+
+        for index in range(self.backups - 1, -1, -1):
+            if os.path.exists(self._path(index)):
+                os.replace(self._path(index), self._path(index + 1))
+
+    def write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def flush(self) -> None:
+        self._file.flush()
+        if self._raw.tell() >= self.max_bytes:
+            self.close()
+            self._rotate()
+            self._open()
+
+    def close(self) -> None:
+        self._file.close()
+        self._raw.close()
+
+
+class LogPipeline:
+    """
+    Filters output lines of a single node and writes them to the screen and the log file.
+
+    Args:
+        node (str): Name of the node stored in records.
+        sink (RotatingJsonLinesFile): Log file.
+        rate (float): Average number of lines per second passed by the rate limit.
+        burst (int): Maximum number of lines passed at once by the rate limit.
+    """
+
+    def __init__(self, node: str, sink: RotatingJsonLinesFile, rate: float, burst: int):
+        self.node = node
+        self.sink = sink
+        self._bucket = TokenBucket(rate, burst)
+        self._suppressed = 0
+        self._last_key = {}
+        self._last_record = {}
+        self._repeated = {}
+
+    def process(self, stream: str, line: bytes) -> None:
+        text = ANSI_ESCAPE.sub("", line.decode("utf-8", errors="replace")).rstrip("\r\n")
+        match = ROS_LEVEL.match(text)
+        level = match.group(1) if match else ("ERROR" if stream == "stderr" else "INFO")
+
+        key = ROS_TIMESTAMP.sub("", text)
+        if key == self._last_key.get(stream):
+            self._repeated[stream] += 1
+            return
+        self._flush_repeated(stream)
+        self._last_key[stream] = key
+        self._last_record[stream] = (level, text)
+        self._repeated[stream] = 0
+
+        if level not in UNLIMITED_LEVELS and not self._bucket.consume():
+            self._suppressed += 1
+            return
+        self._flush_suppressed()
+
+        self._write(stream, level, text)
+        self._echo(stream, line)
+
+    def flush(self) -> None:
+        for stream in self._repeated:
+            self._flush_repeated(stream)
+            # Don't collapse lines across flushes, so repeats are reported periodically
+            self._last_key[stream] = None
+        self._flush_suppressed()
+        sys.stdout.buffer.flush()
+        sys.stderr.buffer.flush()
+        self.sink.flush()
+
+    def _flush_repeated(self, stream: str) -> None:
+        repeated = self._repeated.get(stream, 0)
+        if repeated:
+            level, text = self._last_record[stream]
+            self._write(stream, level, text, repeated=repeated)
+            self._echo("stdout", f"[log_pipeline] last message repeated {repeated} times\n")
+            self._repeated[stream] = 0
+
+    def _flush_suppressed(self) -> None:
+        if self._suppressed:
+            message = f"[log_pipeline] {self._suppressed} lines of {self.node} suppressed"
+            self._write("stdout", "WARN", message, suppressed=self._suppressed)
+            self._echo("stdout", message + "\n")
+            self._suppressed = 0
+
+    def _echo(self, stream: str, line) -> None:
+        output = sys.stderr if stream == "stderr" else sys.stdout
+        output.buffer.write(line if isinstance(line, bytes) else line.encode("utf-8"))
+
+    def _write(self, stream: str, level: str, message: str, **extra) -> None:
+        record = {"t": time.time(), "node": self.node, "stream": stream, "level": level}
+        record["msg"] = message
+        record.update(extra)
+        self.sink.write(record)
+
+
+def _set_parent_death_signal() -> None:
+    # Child runs in its own session, so it has to be stopped if the pipeline is killed
+    try:
+        ctypes.CDLL("libc.so.6").prctl(PR_SET_PDEATHSIG, signal.SIGTERM)
+    except (OSError, AttributeError):
+        pass
+
+
+async def _read_stream(stream: str, reader: asyncio.StreamReader, pipeline: LogPipeline):
+    while True:
+        try:
+            line = await reader.readline()
+        except ValueError:
+            # Line longer than the limit is discarded by the reader
+            continue
+        if not line:
+            return
+        pipeline.process(stream, line)
+
+
+async def _flush_periodically(pipeline: LogPipeline):
+    while True:
+        await asyncio.sleep(FLUSH_PERIOD)
+        pipeline.flush()
+
+
+async def run(command: List[str], pipeline: LogPipeline) -> int:
+    env = dict(os.environ, PYTHONUNBUFFERED="1", RCUTILS_LOGGING_BUFFERED_STREAM="0")
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+        limit=LINE_LIMIT,
+        # Signals from the terminal are forwarded, so the node doesn't receive them twice
+        start_new_session=True,
+        preexec_fn=_set_parent_death_signal,
+    )
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, process.send_signal, signum)
+
+    flush_task = asyncio.create_task(_flush_periodically(pipeline))
+    await asyncio.gather(
+        _read_stream("stdout", process.stdout, pipeline),
+        _read_stream("stderr", process.stderr, pipeline),
+    )
+    return_code = await process.wait()
+
+    flush_task.cancel()
+    pipeline.flush()
+    return return_code if return_code >= 0 else 128 - return_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--name", required=True, help="Name of the node and its log files.")
+    parser.add_argument(
+        "--directory", default=get_default_directory(), help="Directory of log files."
+    )
+    parser.add_argument("--rate", type=float, default=50.0, help="Average lines per second.")
+    parser.add_argument("--burst", type=int, default=200, help="Maximum lines passed at once.")
+    parser.add_argument(
+        "--max-bytes", type=int, default=10 * 1024 * 1024, help="Compressed size of a log file."
+    )
+    parser.add_argument("--backups", type=int, default=5, help="Number of rotated log files.")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="Command to run.")
+    args = parser.parse_args()
+
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("no command given")
+
+    file_name = args.name.strip("/").replace("/", ".")
+    sink = RotatingJsonLinesFile(args.directory, file_name, args.max_bytes, args.backups)
+    pipeline = LogPipeline(args.name, sink, args.rate, args.burst)
+    try:
+        return_code = asyncio.run(run(command, pipeline))
+    finally:
+        sink.close()
+    sys.exit(return_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,14 +14,54 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import List
+
+from husarion_ugv_utils.substitutions import _MemoizedSubstitution
 from launch.some_substitutions_type import SomeSubstitutionsType
-from launch.substitutions import PythonExpression
 
 
-def limit_log_level_to_info(unit: SomeSubstitutionsType, log_level: SomeSubstitutionsType):
-    log_level = PythonExpression(["'", log_level, "'.upper()'"])
+class LimitedLogLevel(_MemoizedSubstitution):
+    """
+    Substitution that returns the '<unit>:=<level>' log level argument of a logger unit. The level
+    is limited to INFO if the launch log level is DEBUG, otherwise it is the launch log level.
+    """
+
+    def __init__(self, unit: SomeSubstitutionsType, log_level: SomeSubstitutionsType):
+        super().__init__(unit, log_level)
+
+    def _compute(self, unit: str, log_level: str) -> str:
+        log_level = log_level.upper()
+        return f"{unit}:={'INFO' if log_level == 'DEBUG' else log_level}"
+
+
+class LogLevelPolicy:
+    """
+    Log level policy of nodes in a launch file. Verbose units (e.g. 'rcl') are limited to INFO
+    when the launch log level is DEBUG. Effective levels are computed once per launch and shared
+    by all nodes.
+
+    Args:
+        log_level (SomeSubstitutionsType): Launch log level.
+    """
 
-    if PythonExpression(["'", log_level, "' == 'DEBUG'"]):
-        return PythonExpression(["'", unit, "' + ':=' + 'INFO'"])
-    else:
-        return PythonExpression(["'", unit, "' + ':=' + ", log_level])
+    LIMITED_UNITS = ("rcl",)
+
+    def __init__(self, log_level: SomeSubstitutionsType):
+        self.log_level = log_level
+
+    def arguments(self, *limited_units: SomeSubstitutionsType) -> List[SomeSubstitutionsType]:
+        """
+        Returns ROS arguments setting the node log level.
+
+        Args:
+            limited_units (SomeSubstitutionsType): Logger units limited to INFO in addition to
+                LIMITED_UNITS.
+        """
+        arguments = ["--ros-args", "--log-level", self.log_level]
+        for unit in (*self.LIMITED_UNITS, *limited_units):
+            arguments += ["--log-level", LimitedLogLevel(unit, self.log_level)]
+        return arguments
+
+
+def limit_log_level_to_info(unit: SomeSubstitutionsType, log_level: SomeSubstitutionsType):
+    return LimitedLogLevel(unit, log_level)
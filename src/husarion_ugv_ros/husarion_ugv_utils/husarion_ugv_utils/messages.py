@@ -15,12 +15,13 @@
 # limitations under the License.
 
 import textwrap
-from typing import Dict
+from typing import Dict, Optional
 
-import click
+from husarion_ugv_utils.robot_metadata import DRIVER_PACKAGE
+from husarion_ugv_utils.substitutions import PackageVersion
 from launch.actions import LogInfo
 from launch.some_substitutions_type import SomeSubstitutionsType
-from launch.substitutions import Command, PythonExpression
+from launch.substitutions import PythonExpression
 
 LYNX_ASCII = r"""
      _
@@ -41,8 +42,22 @@ PANTHER_ASCII = r"""
 
     """  # noqa: W605
 
-LYNX_TEXT = click.style(textwrap.dedent(LYNX_ASCII), bold=True)
-PANTHER_TEXT = click.style(textwrap.dedent(PANTHER_ASCII), bold=True)
+# ANSI escape codes, equivalent to click.style() without importing click at launch startup
+ANSI_COLORS = {"red": 31, "green": 32, "yellow": 33, "blue": 34}
+ANSI_BOLD = "\033[1m"
+ANSI_RESET = "\033[0m"
+
+
+def style(text: str, bold: bool = False, fg: Optional[str] = None) -> str:
+    """Style text for the terminal, the same way as click.style()."""
+    prefix = f"\033[{ANSI_COLORS[fg]}m" if fg else ""
+    if bold:
+        prefix += ANSI_BOLD
+    return prefix + text + ANSI_RESET
+
+
+LYNX_TEXT = style(textwrap.dedent(LYNX_ASCII), bold=True)
+PANTHER_TEXT = style(textwrap.dedent(PANTHER_ASCII), bold=True)
 
 
 class ErrorMessages:
@@ -62,6 +77,13 @@ class ErrorMessages:
         """
     )
 
+    PREFLIGHT_CHECK_FAILED = textwrap.dedent(
+        r"""
+
+        WARNING: Pre-flight check failed. Some robot features may not work correctly.
+        """
+    )
+
 
 def flatten(lst):
     """Flatten a nested list into a single list."""
@@ -81,7 +103,7 @@ def welcome_msg(
     additional_stats: Dict = {},
 ):
     """Generate a welcome message with robot information and stats."""
-    pkg_version = Command(command="ros2 pkg xml -t version husarion_ugv")
+    pkg_version = PackageVersion(DRIVER_PACKAGE)
 
     robot_model_expr = PythonExpression(
         [f"r'''{LYNX_TEXT}''' if '", robot_model, f"' == 'lynx' else r'''{PANTHER_TEXT}'''"]
@@ -97,23 +119,20 @@ def welcome_msg(
         "Bug Tracker": "https://github.com/husarion/husarion_ugv_ros/issues",
     }
 
-    nested_list_of_stats = [
-        item
-        for name, value in stats_to_show.items()
-        for item in (f"{click.style(name, bold=True)}: ", value, "\n")
-    ]
-    stats_msg = flatten(nested_list_of_stats)
-
-    stats_msg.insert(0, robot_model_expr)
+    stats_msg = [robot_model_expr]
+    for name, value in stats_to_show.items():
+        stats_msg.append(f"{style(name, bold=True)}: ")
+        stats_msg.extend(flatten(value))
+        stats_msg.append("\n")
 
     return LogInfo(msg=stats_msg)
 
 
 def error_msg(error: str):
     """Generate an error message."""
-    return LogInfo(msg=click.style(error, bold=True, fg="red"))
+    return LogInfo(msg=style(error, bold=True, fg="red"))
 
 
 def warning_msg(warning: str):
     """Generate a warning message."""
-    return LogInfo(msg=click.style(warning, bold=True, fg="yellow"))
+    return LogInfo(msg=style(warning, bold=True, fg="yellow"))
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run pre-flight compatibility checks of the robot software and hardware.
+
+Usage: ros2 run husarion_ugv_utils preflight_check [--min-os-version v2.2.0] [--no-cache]
+
+Probes run concurrently, each with its own timeout. Results of probes with a TTL are cached on
+disk for the current boot, so repeated launches don't probe the hardware again.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from husarion_ugv_utils.robot_metadata import get_robot_metadata
+from husarion_ugv_utils.version_check import check_version_compatibility
+
+PHIDGETS_USB_VENDOR_ID = "06c2"
+IFF_UP = 0x1
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "husarion_ugv",
+    "preflight.json",
+)
+
+
+class ProbeResult:
+    """
+    Class representing the result of a single pre-flight probe.
+    """
+
+    def __init__(self, name: str, compatible: bool, value: str, message: str = ""):
+        self.name = name
+        self.compatible = compatible
+        self.value = value
+        self.message = message
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "compatible": self.compatible,
+            "value": self.value,
+            "message": self.message,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ProbeResult":
+        return cls(data["name"], data["compatible"], data["value"], data["message"])
+
+
+class Probe:
+    """
+    Pre-flight probe.
+
+    Args:
+        name (str): Name of the probe.
+        function (Callable[[], Tuple[bool, str, str]]): Function returning whether the probed
+            item is compatible, its value and a message describing the problem.
+        timeout (float): Time in seconds after which the probe is reported as failed.
+        ttl (float): Time in seconds the result is cached on disk. Results are never reused
+            after a reboot. Zero disables caching.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        function: Callable[[], Tuple[bool, str, str]],
+        timeout: float = 1.0,
+        ttl: float = 0.0,
+    ):
+        self.name = name
+        self.function = function
+        self.timeout = timeout
+        self.ttl = ttl
+
+
+class CompatibilityReport:
+    """
+    Results of all pre-flight probes.
+    """
+
+    def __init__(self, results: List[ProbeResult], duration: float):
+        self.results = results
+        self.duration = duration
+
+    @property
+    def compatible(self) -> bool:
+        return all(result.compatible for result in self.results)
+
+    @property
+    def incompatible(self) -> List[ProbeResult]:
+        return [result for result in self.results if not result.compatible]
+
+    def format(self) -> str:
+        lines = [
+            f"{result.name:<16} {'OK' if result.compatible else 'FAILED':<8} {result.value}"
+            + (f" ({result.message})" if not result.compatible else "")
+            for result in self.results
+        ]
+        lines.append(f"Pre-flight checks finished in {self.duration * 1000.0:.1f} ms.")
+        return "\n".join(lines)
+
+
+def probe_os_version(min_required_version: str) -> Tuple[bool, str, str]:
+    version = get_robot_metadata().os_version
+    return (
+        check_version_compatibility(version, min_required_version),
+        version,
+        f"Current version: {version}, required: {min_required_version}",
+    )
+
+
+def probe_kernel() -> Tuple[bool, str, str]:
+    """
+    There is no minimum kernel version the driver requires, only SocketCAN support, so its
+    presence is checked and the kernel release is reported.
+    """
+    release = platform.release()
+    return (
+        os.path.exists("/proc/net/can"),
+        release,
+        f"SocketCAN is not available in kernel {release}",
+    )
+
+
+def probe_can_interface(interface: str) -> Tuple[bool, str, str]:
+    """
+    Motor controllers firmware can't be read before the CANopen master is started, so only the
+    CAN interface used to communicate with them is checked.
+    """
+    try:
+        with open(f"/sys/class/net/{interface}/flags", mode="r", encoding="utf-8") as file:
+            flags = int(file.read().strip(), 16)
+    except (OSError, ValueError):
+        return False, "missing", f"CAN interface {interface} not found"
+
+    up = bool(flags & IFF_UP)
+    return up, "up" if up else "down", f"CAN interface {interface} is down"
+
+
+def probe_phidget_imu() -> Tuple[bool, str, str]:
+    """
+    Phidget firmware version can only be read through the Phidget22 library once the device is
+    opened by the IMU driver, so only presence of the device on USB is checked.
+    """
+    for vendor_path in glob.glob("/sys/bus/usb/devices/*/idVendor"):
+        try:
+            with open(vendor_path, mode="r", encoding="utf-8") as file:
+                if file.read().strip() != PHIDGETS_USB_VENDOR_ID:
+                    continue
+            product_path = os.path.join(os.path.dirname(vendor_path), "product")
+            with open(product_path, mode="r", encoding="utf-8") as file:
+                return True, file.read().strip(), ""
+        except OSError:
+            continue
+
+    return False, "missing", "Phidget IMU not found on USB"
+
+
+def probe_container_image() -> Tuple[bool, str, str]:
+    """
+    Images are not versioned separately from the driver, whose version is shown at startup, so
+    only the build type of the image is checked.
+    """
+    build_type = os.environ.get("HUSARION_ROS_BUILD_TYPE", "hardware")
+    environment = "container" if os.path.exists("/.dockerenv") else "host"
+    return (
+        build_type == "hardware",
+        f"{build_type} ({environment})",
+        f"Image built for '{build_type}' can't run the robot hardware",
+    )
+
+
+def get_default_probes(
+    min_required_os_version: str, can_interface: str = "robot_can"
+) -> List[Probe]:
+    return [
+        Probe("os_version", lambda: probe_os_version(min_required_os_version)),
+        Probe("kernel", probe_kernel, ttl=86400.0),
+        Probe("roboteq_can", lambda: probe_can_interface(can_interface)),
+        Probe("phidget_imu", probe_phidget_imu, ttl=300.0),
+        Probe("container_image", probe_container_image),
+    ]
+
+
+def _get_boot_id() -> str:
+    try:
+        with open("/proc/sys/kernel/random/boot_id", mode="r", encoding="utf-8") as file:
+            return file.read().strip()
+    except OSError:
+        return ""
+
+
+def _load_cache(cache_path: str) -> Dict:
+    try:
+        with open(cache_path, mode="r", encoding="utf-8") as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(cache, dict) or cache.get("boot_id") != _get_boot_id():
+        return {}
+    return cache.get("results", {})
+
+
+def _save_cache(cache_path: str, results: Dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, mode="w", encoding="utf-8") as file:
+            json.dump({"boot_id": _get_boot_id(), "results": results}, file)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Cache is an optimization only, e.g. home directory may be read-only
+        pass
+
+
+def run_preflight_checks(
+    probes: List[Probe], cache_path: Optional[str] = DEFAULT_CACHE_PATH
+) -> CompatibilityReport:
+    """
+    Runs probes concurrently and returns the compatibility report. Probes that don't finish
+    within their timeout are reported as incompatible.
+
+    Args:
+        probes (List[Probe]): Probes to run.
+        cache_path (Optional[str]): Path to the results cache. None disables caching.
+    """
+    start = time.monotonic()
+    cache = _load_cache(cache_path) if cache_path else {}
+    results: Dict[str, ProbeResult] = {}
+    threads: Dict[str, threading.Thread] = {}
+
+    def run_probe(probe: Probe) -> None:
+        try:
+            compatible, value, message = probe.function()
+            results[probe.name] = ProbeResult(probe.name, compatible, value, message)
+        except Exception as e:
+            results[probe.name] = ProbeResult(probe.name, False, "error", str(e))
+
+    for probe in probes:
+        cached = cache.get(probe.name)
+        if probe.ttl > 0.0 and cached and time.time() - cached["timestamp"] < probe.ttl:
+            results[probe.name] = ProbeResult.from_dict(cached["result"])
+            continue
+
+        # Daemon threads, so a hanging probe doesn't block the process exit
+        thread = threading.Thread(target=run_probe, args=(probe,), daemon=True)
+        thread.start()
+        threads[probe.name] = thread
+
+    for probe in probes:
+        thread = threads.get(probe.name)
+        if thread is None:
+            continue
+
+        thread.join(max(0.0, start + probe.timeout - time.monotonic()))
+        if thread.is_alive():
+            results[probe.name] = ProbeResult(
+                probe.name, False, "timeout", f"Probe timed out after {probe.timeout:.1f} s"
+            )
+        elif probe.ttl > 0.0:
+            cache[probe.name] = {"timestamp": time.time(), "result": results[probe.name].to_dict()}
+
+    if cache_path and any(probe.ttl > 0.0 for probe in probes if probe.name in threads):
+        _save_cache(cache_path, cache)
+
+    return CompatibilityReport([results[probe.name] for probe in probes], time.monotonic() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--min-os-version", default="v2.2.0", help="Minimum required OS version.")
+    parser.add_argument(
+        "--can-interface", default="robot_can", help="CAN interface of motor drivers."
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Don't use cached results.")
+    args = parser.parse_args()
+
+    report = run_preflight_checks(
+        get_default_probes(args.min_os_version, args.can_interface),
+        cache_path=None if args.no_cache else DEFAULT_CACHE_PATH,
+    )
+    print(report.format())
+    if not report.compatible:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+import launch.logging
+from launch.action import Action
+from launch.event import Event
+from launch.event_handler import EventHandler
+from launch.launch_context import LaunchContext
+from launch_ros.ros_adapters import get_ros_node
+from rclpy.node import Node
+
+
+class ReadinessCondition:
+    """
+    Base class of conditions checked against the ROS graph of the launch process.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def describe(self) -> str:
+        return f"{type(self).__name__}({self.name})"
+
+    def is_met(self, node: Node) -> bool:
+        raise NotImplementedError
+
+
+class NodeAvailable(ReadinessCondition):
+    """
+    Condition met when a node with the fully qualified name (e.g. '/lights_driver') is discovered.
+    """
+
+    def is_met(self, node: Node) -> bool:
+        return self.name in node.get_fully_qualified_node_names()
+
+
+class ServiceAvailable(ReadinessCondition):
+    """
+    Condition met when a server of the service is discovered.
+    """
+
+    def is_met(self, node: Node) -> bool:
+        service_name = node.resolve_service_name(self.name)
+        return any(name == service_name for name, _ in node.get_service_names_and_types())
+
+
+class TopicPublished(ReadinessCondition):
+    """
+    Condition met when at least one publisher of the topic is discovered.
+    """
+
+    def is_met(self, node: Node) -> bool:
+        return node.count_publishers(self.name) > 0
+
+
+class ReadinessEvent(Event):
+    """Event emitted by ReadyWhen once its conditions are met or timed out."""
+
+    name = "husarion_ugv_utils.readiness.ReadinessEvent"
+
+    def __init__(self, action: "ReadyWhen"):
+        super().__init__()
+        self.action = action
+
+
+class ReadyWhen(Action):
+    """
+    Action that executes actions, ReadyToTest by default, as soon as all readiness conditions are
+    met, instead of after a fixed delay. Conditions are checked against the local graph cache of
+    the ROS node of the launch process, so polling doesn't generate network traffic. Time after
+    which each condition was met is logged.
+
+    Args:
+        conditions (List[ReadinessCondition]): Conditions to wait for.
+        timeout (float): Time in seconds after which unmet conditions are reported as errors and
+            the actions are executed anyway, so tests fail with their own assertions.
+        actions (Optional[List[Action]]): Actions to execute. Defaults to [ReadyToTest()].
+        period (float): Period in seconds of checking the conditions.
+    """
+
+    def __init__(
+        self,
+        conditions: List[ReadinessCondition],
+        timeout: float = 30.0,
+        actions: Optional[List[Action]] = None,
+        period: float = 0.02,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        if actions is None:
+            # Imported here, launch_testing is provided by test dependencies of the user package
+            from launch_testing.actions import ReadyToTest
+
+            actions = [ReadyToTest()]
+
+        self._conditions = conditions
+        self._timeout = timeout
+        self._actions = actions
+        self._period = period
+        self._durations: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._logger = launch.logging.get_logger("readiness")
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        """Time in seconds after which each met condition was met, keyed by its description."""
+        return dict(self._durations)
+
+    def describe_conditional_sub_entities(self) -> List[Tuple[str, List[Action]]]:
+        # Actions are executed by an event handler, expose them so launch_testing finds ReadyToTest
+        return [("on readiness", self._actions)]
+
+    def execute(self, context: LaunchContext) -> Optional[List[Action]]:
+        context.register_event_handler(
+            EventHandler(
+                matcher=lambda event: isinstance(event, ReadinessEvent) and event.action is self,
+                entities=self._actions,
+                handle_once=True,
+            )
+        )
+        self._task = context.asyncio_loop.create_task(self._wait_for_conditions(context))
+        return None
+
+    def get_asyncio_future(self) -> Optional[asyncio.Future]:
+        return self._task
+
+    async def _wait_for_conditions(self, context: LaunchContext) -> None:
+        node = get_ros_node(context)
+        start = time.monotonic()
+        pending = list(self._conditions)
+
+        while pending:
+            elapsed = time.monotonic() - start
+            for condition in [condition for condition in pending if condition.is_met(node)]:
+                self._durations[condition.describe()] = elapsed
+                self._logger.info(f"{condition.describe()} met after {elapsed:.3f} s.")
+                pending.remove(condition)
+
+            if pending and elapsed > self._timeout:
+                unmet = ", ".join(condition.describe() for condition in pending)
+                self._logger.error(f"Readiness timed out after {self._timeout:.1f} s: {unmet}.")
+                break
+
+            if pending:
+                await asyncio.sleep(self._period)
+
+        if not pending:
+            self._logger.info(f"Ready after {time.monotonic() - start:.3f} s.")
+        await context.emit_event(ReadinessEvent(self))
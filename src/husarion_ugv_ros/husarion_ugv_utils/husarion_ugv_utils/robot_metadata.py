@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import os
+import xml.etree.ElementTree as ET
+
+DRIVER_PACKAGE = "husarion_ugv"
+
+
+class RobotMetadata:
+    """
+    Class representing robot information shown at startup and reported by diagnostics.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        serial_number: str,
+        hardware_version: str,
+        driver_version: str,
+        os_version: str,
+    ):
+        self.model = model
+        self.serial_number = serial_number
+        self.hardware_version = hardware_version
+        self.driver_version = driver_version
+        self.os_version = os_version
+
+
+@functools.lru_cache(maxsize=None)
+def get_package_version(package: str) -> str:
+    """
+    Returns the version from package.xml of an installed package. The result is cached for the
+    lifetime of the process.
+
+    Raises:
+        ValueError: If the package is not found or its package.xml has no version.
+    """
+    from ament_index_python.packages import (
+        PackageNotFoundError,
+        get_package_share_directory,
+    )
+
+    try:
+        package_xml = os.path.join(get_package_share_directory(package), "package.xml")
+    except PackageNotFoundError:
+        raise ValueError(f"Package '{package}' not found.")
+
+    try:
+        version = ET.parse(package_xml).getroot().findtext("version")
+    except (OSError, ET.ParseError) as e:
+        raise ValueError(f"Failed to read {package_xml}: {e}")
+
+    if not version:
+        raise ValueError(f"No version in {package_xml}.")
+    return version.strip()
+
+
+@functools.lru_cache(maxsize=None)
+def get_robot_metadata() -> RobotMetadata:
+    """
+    Returns robot metadata read from the environment and the installed driver package. It is
+    resolved once and cached for the lifetime of the process.
+    """
+    try:
+        driver_version = get_package_version(DRIVER_PACKAGE)
+    except ValueError:
+        driver_version = "unknown"
+
+    return RobotMetadata(
+        model=os.environ.get("ROBOT_MODEL_NAME", "panther"),
+        serial_number=os.environ.get("ROBOT_SERIAL_NO", "----"),
+        hardware_version=os.environ.get("ROBOT_VERSION", "1.0"),
+        driver_version=driver_version,
+        os_version=os.environ.get("SYSTEM_BUILD_VERSION", "v0.0.0"),
+    )
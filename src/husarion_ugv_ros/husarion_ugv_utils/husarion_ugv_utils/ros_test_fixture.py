@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import atexit
+import collections
+import itertools
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Set, Tuple
+
+import rclpy
+import rclpy.qos
+from rclpy.client import Client
+from rclpy.executors import SingleThreadedExecutor
+from rclpy.service import Service
+
+DEFAULT_NODE_NAME = "husarion_ugv_test_node"
+
+
+class TopicCache:
+    """
+    Messages received on a topic since the subscription was created.
+
+    Args:
+        max_messages (int): Number of the most recent messages kept.
+    """
+
+    def __init__(self, max_messages: int = 10):
+        self.messages: Deque[Any] = collections.deque(maxlen=max_messages)
+        self.count = 0
+        self._condition = threading.Condition()
+
+    @property
+    def last(self) -> Optional[Any]:
+        with self._condition:
+            return self.messages[-1] if self.messages else None
+
+    def add(self, msg: Any) -> None:
+        with self._condition:
+            self.messages.append(msg)
+            self.count += 1
+            self._condition.notify_all()
+
+    def wait_for(
+        self, predicate: Optional[Callable[[Any], bool]] = None, timeout: float = 5.0
+    ) -> Optional[Any]:
+        """
+        Returns the most recent cached message matching the predicate, waiting for a new one if
+        none is cached yet. Returns None on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            checked = 0
+            while True:
+                # Only messages not checked yet are tested, newest first
+                new_messages = min(self.count - checked, len(self.messages))
+                for msg in itertools.islice(reversed(self.messages), new_messages):
+                    if predicate is None or predicate(msg):
+                        return msg
+                checked = self.count
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0.0 or not self._condition.wait(remaining):
+                    return None
+
+
+class SharedTestNode:
+    """
+    Session-scoped ROS node for integration tests. The node is spun by a background executor and
+    created once per test process, so subscriptions, clients and services are discovered once
+    and can be borrowed by all test cases instead of being created in each setUp.
+
+    Use SharedTestNode.get() to obtain the instance.
+    """
+
+    _instance: Optional["SharedTestNode"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, name: str = DEFAULT_NODE_NAME):
+        self._owns_context = not rclpy.ok()
+        if self._owns_context:
+            rclpy.init()
+
+        self.node = rclpy.create_node(name)
+        self._executor = SingleThreadedExecutor()
+        self._executor.add_node(self.node)
+        self._thread = threading.Thread(target=self._executor.spin, daemon=True)
+        self._thread.start()
+
+        self._lock = threading.Lock()
+        self._topics: Dict[str, TopicCache] = {}
+        self._clients: Dict[str, Client] = {}
+        self._services: Dict[str, Service] = {}
+        self._service_callbacks: Dict[str, Callable] = {}
+
+    @classmethod
+    def get(cls, name: str = DEFAULT_NODE_NAME) -> "SharedTestNode":
+        """Returns the node of the test process, creating it on the first call."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(name)
+                atexit.register(cls._instance.shutdown)
+            return cls._instance
+
+    def subscribe(
+        self,
+        topic: str,
+        msg_type: Any,
+        qos_profile: rclpy.qos.QoSProfile = rclpy.qos.qos_profile_system_default,
+        max_messages: int = 10,
+    ) -> TopicCache:
+        """Returns the cache of the topic, subscribing to it on the first call."""
+        with self._lock:
+            cache = self._topics.get(topic)
+            if cache is None:
+                cache = TopicCache(max_messages)
+                self.node.create_subscription(msg_type, topic, cache.add, qos_profile)
+                self._topics[topic] = cache
+            return cache
+
+    def client(self, srv_type: Any, srv_name: str) -> Client:
+        """Returns the client of the service, creating it on the first call."""
+        with self._lock:
+            client = self._clients.get(srv_name)
+            if client is None:
+                client = self.node.create_client(
+                    srv_type, srv_name, qos_profile=rclpy.qos.qos_profile_services_default
+                )
+                self._clients[srv_name] = client
+            return client
+
+    def service(self, srv_type: Any, srv_name: str, callback: Callable) -> Service:
+        """
+        Returns the service server, creating it on the first call. The server is kept between test
+        cases, calling this again only replaces the callback.
+        """
+        with self._lock:
+            self._service_callbacks[srv_name] = callback
+            service = self._services.get(srv_name)
+            if service is None:
+                service = self.node.create_service(
+                    srv_type,
+                    srv_name,
+                    lambda request, response: self._service_callbacks[srv_name](request, response),
+                    qos_profile=rclpy.qos.qos_profile_services_default,
+                )
+                self._services[srv_name] = service
+            return service
+
+    def call(self, client: Client, request: Any, timeout: float = 5.0) -> Optional[Any]:
+        """Calls the service and waits for the response. Returns None on timeout."""
+        deadline = time.monotonic() + timeout
+        if not client.wait_for_service(timeout_sec=timeout):
+            return None
+
+        future = client.call_async(request)
+        done = threading.Event()
+        future.add_done_callback(lambda _: done.set())
+        if not done.wait(max(0.0, deadline - time.monotonic())):
+            client.remove_pending_request(future)
+            return None
+        return future.result()
+
+    def wait_for_topics(self, topics: Iterable[Tuple[str, Any]], timeout: float = 5.0) -> Set[str]:
+        """
+        Waits until a message is received on each topic, including messages received before the
+        call. Returns names of topics with messages.
+        """
+        caches = {topic: self.subscribe(topic, msg_type) for topic, msg_type in topics}
+        deadline = time.monotonic() + timeout
+        for cache in caches.values():
+            cache.wait_for(timeout=max(0.0, deadline - time.monotonic()))
+        return {topic for topic, cache in caches.items() if cache.count}
+
+    def wait_until(self, condition: Callable[[], bool], timeout: float = 5.0) -> bool:
+        """Waits until the condition, updated by node callbacks, is true."""
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def shutdown(self) -> None:
+        self._executor.shutdown()
+        self.node.destroy_node()
+        if self._owns_context and rclpy.ok():
+            rclpy.shutdown()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run simulation test scenarios in parallel, each in an isolated headless simulation.
+
+Usage: ros2 run husarion_ugv_utils sim_test_farm <scenarios.yaml> [--jobs 2]
+    [--cores-per-stack 4] [--domain-id-base 10] [--output-dir <dir>]
+
+Every scenario gets its own stack: headless gz_sim.launch.py, the /clock bridge and
+simulate_robot.launch.py, started with a separate ROS_DOMAIN_ID, GZ_PARTITION, ROS and Gazebo
+home and log directories, and pinned to its own set of CPU cores. The scenario command is started
+in the same environment once the ready topic publishes. Scenarios file format:
+
+scenarios:
+  - name: panther_smoke                 # required, unique
+    launch_arguments:                   # arguments of simulate_robot.launch.py
+      robot_model: panther
+    gz_world: /path/to/world.sdf        # optional
+    ready_topic: odometry/wheels        # default, relative to the robot namespace
+    command: [ros2, topic, echo, --once, odometry/filtered]  # optional, passes if exits with 0
+    startup_timeout: 120.0
+    timeout: 300.0
+
+Without a command a scenario passes when its stack becomes ready. Logs of each scenario and
+'report.json' with timings and results of all scenarios are written to the output directory.
+Exits with 1 if any scenario failed.
+"""
+
+import argparse
+import json
+import os
+import queue
+import signal
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import yaml
+from ament_index_python.packages import get_package_share_directory
+
+# Domain IDs above 101 may collide with ephemeral ports on Linux
+MAX_DOMAIN_ID = 101
+
+
+class Scenario:
+    """
+    Simulation test scenario.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        launch_arguments: Optional[Dict[str, str]] = None,
+        gz_world: str = "",
+        ready_topic: str = "odometry/wheels",
+        command: Optional[List[str]] = None,
+        startup_timeout: float = 120.0,
+        timeout: float = 300.0,
+    ):
+        self.name = name
+        self.launch_arguments = {
+            key: str(value) for key, value in (launch_arguments or {}).items()
+        }
+        self.gz_world = gz_world
+        self.ready_topic = ready_topic
+        self.command = command
+        self.startup_timeout = startup_timeout
+        self.timeout = timeout
+
+    @property
+    def namespaced_ready_topic(self) -> str:
+        namespace = self.launch_arguments.get("namespace", "").strip("/")
+        return f"/{namespace}/{self.ready_topic}" if namespace else f"/{self.ready_topic}"
+
+
+class Slot:
+    """
+    Isolated resources of a single simulation stack.
+    """
+
+    def __init__(self, index: int, domain_id: int, cores: List[int]):
+        self.index = index
+        self.domain_id = domain_id
+        self.cores = cores
+
+
+class ScenarioResult:
+    """
+    Result and timings of a single scenario.
+    """
+
+    def __init__(self, name: str, slot: Slot, output_dir: str):
+        self.name = name
+        self.slot = slot
+        self.output_dir = output_dir
+        self.result = "not_started"
+        self.startup_time: Optional[float] = None
+        self.test_time: Optional[float] = None
+        self.total_time = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return self.result == "passed"
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "result": self.result,
+            "startup_time": self.startup_time,
+            "test_time": self.test_time,
+            "total_time": self.total_time,
+            "domain_id": self.slot.domain_id,
+            "cores": self.slot.cores,
+            "output_dir": self.output_dir,
+        }
+
+
+def load_scenarios(path: str) -> List[Scenario]:
+    with open(path, mode="r", encoding="utf-8") as file:
+        data = yaml.safe_load(file) or {}
+
+    scenarios = [Scenario(**scenario) for scenario in data.get("scenarios", [])]
+    names = [scenario.name for scenario in scenarios]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicated scenario names: {', '.join(sorted(duplicates))}.")
+    return scenarios
+
+
+def stack_environment(slot: Slot, scenario_dir: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        {
+            "ROS_DOMAIN_ID": str(slot.domain_id),
+            "ROS_AUTOMATIC_DISCOVERY_RANGE": "LOCALHOST",
+            "ROS_HOME": os.path.join(scenario_dir, "ros"),
+            "ROS_LOG_DIR": os.path.join(scenario_dir, "log"),
+            "GZ_PARTITION": f"sim_test_farm_{os.getpid()}_{slot.index}",
+            "GZ_IP": "127.0.0.1",
+            "GZ_HOMEDIR": os.path.join(scenario_dir, "gz"),
+        }
+    )
+    return env
+
+
+def stack_commands(scenario: Scenario) -> Dict[str, List[str]]:
+    gz_sim = [
+        "ros2",
+        "launch",
+        "husarion_gz_worlds",
+        "gz_sim.launch.py",
+        "gz_headless_mode:=True",
+        "gz_gui:=",
+        "gz_log_level:=1",
+    ]
+    if scenario.gz_world:
+        gz_sim.append(f"gz_world:={scenario.gz_world}")
+
+    clock_bridge_config = os.path.join(
+        get_package_share_directory("husarion_ugv_gazebo"), "config", "gz_bridge.yaml"
+    )
+    return {
+        "gz_sim": gz_sim,
+        "clock_bridge": [
+            "ros2",
+            "run",
+            "ros_gz_bridge",
+            "parameter_bridge",
+            "--ros-args",
+            "-p",
+            f"config_file:={clock_bridge_config}",
+        ],
+        "simulate_robot": [
+            "ros2",
+            "launch",
+            "husarion_ugv_gazebo",
+            "simulate_robot.launch.py",
+            *[f"{key}:={value}" for key, value in scenario.launch_arguments.items()],
+        ],
+    }
+
+
+def start_process(
+    command: List[str], env: Dict[str, str], cores: List[int], log_path: str
+) -> subprocess.Popen:
+    # Affinity is set by taskset before exec, so it is inherited by the whole process tree
+    # without running Python code in the forked child
+    taskset = ["taskset", "--cpu-list", ",".join(str(core) for core in cores)]
+    with open(log_path, mode="wb") as log_file:
+        return subprocess.Popen(
+            taskset + command,
+            env=env,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            # Own process group, so the whole launch tree is stopped
+            start_new_session=True,
+        )
+
+
+def _signal_group(process: subprocess.Popen, signum: int) -> None:
+    try:
+        os.killpg(process.pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def stop_processes(processes: List[subprocess.Popen], timeout: float = 15.0) -> None:
+    # Children may outlive the group leader, so the group is signaled even if the leader exited
+    for process in processes:
+        _signal_group(process, signal.SIGINT)
+
+    deadline = time.monotonic() + timeout
+    for process in processes:
+        try:
+            process.wait(max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            _signal_group(process, signal.SIGKILL)
+            process.wait()
+
+
+def wait_for_process(
+    process: subprocess.Popen, timeout: float, stack: List[subprocess.Popen]
+) -> Optional[int]:
+    """
+    Waits for the process to exit and returns its exit code. Returns None on timeout or when any
+    process of the stack exits first.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return process.wait(min(0.5, max(0.0, deadline - time.monotonic())))
+        except subprocess.TimeoutExpired:
+            if any(stack_process.poll() is not None for stack_process in stack):
+                return None
+    return None
+
+
+def run_scenario(scenario: Scenario, slot: Slot, output_dir: str) -> ScenarioResult:
+    scenario_dir = os.path.join(output_dir, scenario.name)
+    result = ScenarioResult(scenario.name, slot, scenario_dir)
+    env = stack_environment(slot, scenario_dir)
+    for key in ("ROS_HOME", "ROS_LOG_DIR", "GZ_HOMEDIR"):
+        os.makedirs(env[key], exist_ok=True)
+
+    start = time.monotonic()
+    processes = []
+    try:
+        for name, command in stack_commands(scenario).items():
+            log_path = os.path.join(scenario_dir, f"{name}.log")
+            processes.append(start_process(command, env, slot.cores, log_path))
+
+        ready_probe = start_process(
+            ["ros2", "topic", "echo", "--once", scenario.namespaced_ready_topic],
+            env,
+            slot.cores,
+            os.path.join(scenario_dir, "ready_probe.log"),
+        )
+        return_code = wait_for_process(ready_probe, scenario.startup_timeout, processes)
+        if return_code != 0:
+            stop_processes([ready_probe])
+            result.result = "not_ready"
+            return result
+        result.startup_time = time.monotonic() - start
+
+        if scenario.command:
+            test_start = time.monotonic()
+            test = start_process(
+                scenario.command, env, slot.cores, os.path.join(scenario_dir, "test.log")
+            )
+            return_code = wait_for_process(test, scenario.timeout, processes)
+            result.test_time = time.monotonic() - test_start
+            if return_code is None:
+                stop_processes([test])
+                result.result = "timeout"
+                return result
+            result.result = "passed" if return_code == 0 else "failed"
+        else:
+            result.result = "passed"
+
+        if any(process.poll() is not None for process in processes):
+            result.result = "stack_exited"
+        return result
+    except (OSError, ValueError) as e:
+        result.result = f"error: {e}"
+        return result
+    finally:
+        stop_processes(processes)
+        # The ros2 CLI daemon started by the ready probe is specific to the domain ID
+        subprocess.run(["ros2", "daemon", "stop"], env=env, capture_output=True, check=False)
+        result.total_time = time.monotonic() - start
+
+
+def make_slots(jobs: int, cores_per_stack: int, domain_id_base: int) -> List[Slot]:
+    cores = sorted(os.sched_getaffinity(0))
+    if domain_id_base + jobs - 1 > MAX_DOMAIN_ID:
+        raise ValueError(f"Domain IDs exceed {MAX_DOMAIN_ID}, use fewer jobs or a lower base.")
+
+    return [
+        Slot(
+            index,
+            domain_id_base + index,
+            [cores[(index * cores_per_stack + i) % len(cores)] for i in range(cores_per_stack)],
+        )
+        for index in range(jobs)
+    ]
+
+
+def run_farm(
+    scenarios: List[Scenario], slots: List[Slot], output_dir: str
+) -> List[ScenarioResult]:
+    free_slots: "queue.Queue[Slot]" = queue.Queue()
+    for slot in slots:
+        free_slots.put(slot)
+
+    def run(scenario: Scenario) -> ScenarioResult:
+        slot = free_slots.get()
+        try:
+            result = run_scenario(scenario, slot, output_dir)
+        finally:
+            free_slots.put(slot)
+        print(
+            f"{result.name:<32} {result.result:<14} domain {slot.domain_id:<4}"
+            f" total {result.total_time:7.1f} s",
+            flush=True,
+        )
+        return result
+
+    with ThreadPoolExecutor(max_workers=len(slots)) as executor:
+        return list(executor.map(run, scenarios))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scenarios", help="Path to the scenarios YAML file.")
+    parser.add_argument(
+        "--cores-per-stack", type=int, default=4, help="CPU cores assigned to each stack."
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of parallel stacks. Defaults to the number of cores / cores per stack.",
+    )
+    parser.add_argument(
+        "--domain-id-base", type=int, default=10, help="ROS_DOMAIN_ID of the first stack."
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=os.path.join(os.getcwd(), time.strftime("sim_test_farm_%Y%m%d_%H%M%S")),
+        help="Directory of logs and the report.",
+    )
+    args = parser.parse_args()
+
+    scenarios = load_scenarios(args.scenarios)
+    jobs = args.jobs or max(1, len(os.sched_getaffinity(0)) // args.cores_per_stack)
+    slots = make_slots(min(jobs, len(scenarios)) or 1, args.cores_per_stack, args.domain_id_base)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.monotonic()
+    results = run_farm(scenarios, slots, args.output_dir)
+    duration = time.monotonic() - start
+
+    report = {
+        "duration": duration,
+        "jobs": len(slots),
+        "passed": sum(result.passed for result in results),
+        "failed": sum(not result.passed for result in results),
+        "scenarios": [result.to_dict() for result in results],
+    }
+    report_path = os.path.join(args.output_dir, "report.json")
+    with open(report_path, mode="w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+    sequential = sum(result.total_time for result in results)
+    print(
+        f"\n{report['passed']} passed, {report['failed']} failed in {duration:.1f} s "
+        f"({sequential:.1f} s sequentially, {len(slots)} jobs). Report: {report_path}"
+    )
+    if report["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import atexit
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from typing import Dict, Optional, Tuple
+
+from launch.condition import Condition
+from launch.launch_context import LaunchContext
+from launch.some_substitutions_type import SomeSubstitutionsType
+from launch.substitution import Substitution
+from launch.substitutions.substitution_failure import SubstitutionFailure
+from launch.utilities import normalize_to_list_of_substitutions, perform_substitutions
+
+DEFAULT_WHEEL_TYPES = {"lynx": "WH05", "panther": "WH01"}
+SUBSTITUTIONS_CACHE_KEY = "husarion_ugv_substitutions"
+# Launch arguments that select configuration files, checked against the bundle options
+BUNDLE_OPTION_ARGUMENTS = (
+    "robot_model",
+    "wheel_type",
+    "localization_mode",
+    "fuse_gps",
+    "common_dir_path",
+)
+
+_source_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_render_cache: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], str] = {}
+_output_dir: Optional[str] = None
+
+
+def _get_output_dir() -> str:
+    global _output_dir
+    if _output_dir is None:
+        _output_dir = tempfile.mkdtemp(prefix="husarion_ugv_configs_")
+        atexit.register(shutil.rmtree, _output_dir, ignore_errors=True)
+    return _output_dir
+
+
+def _read_source(source_path: str) -> str:
+    """Read a template file, reusing the cached content while the file is unchanged."""
+    stat = os.stat(source_path)
+    file_id = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _source_cache.get(source_path)
+    if cached is not None and cached[0] == file_id:
+        return cached[1]
+
+    with open(source_path, mode="r", encoding="utf-8") as file:
+        content = file.read()
+
+    _source_cache[source_path] = (file_id, content)
+    return content
+
+
+def replace_placeholders(content: str, replacements: Dict[str, str]) -> str:
+    """
+    Replace all placeholders in a single pass. When placeholders overlap (e.g. '<namespace>/' and
+    '<namespace>') the longest one wins, and replaced text is never matched again.
+    """
+    if not replacements:
+        return content
+
+    placeholders = sorted(replacements, key=len, reverse=True)
+    pattern = re.compile("|".join(re.escape(placeholder) for placeholder in placeholders))
+    return pattern.sub(lambda match: replacements[match.group(0)], content)
+
+
+def render_template(source_path: str, replacements: Dict[str, str]) -> str:
+    """
+    Render a template file with the given replacements and return the path to the result.
+
+    Results are memoized by the source content and replacement values. Files with identical
+    rendered content (e.g. the same config used by many robots) share one output file. All
+    output files are removed when the process exits.
+
+    Args:
+        source_path (str): Path to the template file.
+        replacements (Dict[str, str]): Mapping of placeholders to their values.
+
+    Returns:
+        str: Path to the rendered file.
+    """
+    content = _read_source(source_path)
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    key = (content_hash, tuple(sorted(replacements.items())))
+
+    output_path = _render_cache.get(key)
+    if output_path is not None and os.path.exists(output_path):
+        return output_path
+
+    rendered = replace_placeholders(content, replacements)
+    _, extension = os.path.splitext(source_path)
+    output_path = write_config(rendered, extension)
+
+    _render_cache[key] = output_path
+    return output_path
+
+
+def write_config(content: str, extension: str = ".yaml") -> str:
+    """
+    Write generated config content and return its path. Identical content is written only once.
+    All output files are removed when the process exits.
+    """
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+    output_path = os.path.join(_get_output_dir(), content_hash + extension)
+
+    if not os.path.exists(output_path):
+        tmp_path = output_path + ".tmp"
+        with open(tmp_path, mode="w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(tmp_path, output_path)
+
+    return output_path
+
+
+class ReplaceString(Substitution):
+    """
+    Substitution that replaces placeholders in a file and returns the path to the rendered file.
+
+    Drop-in replacement for nav2_common.launch.ReplaceString. All placeholders are rendered in
+    one pass, results are memoized and reused across robots, and no new temporary file is
+    created for already rendered content.
+    """
+
+    def __init__(
+        self,
+        source_file: SomeSubstitutionsType,
+        replacements: Dict[str, SomeSubstitutionsType],
+        condition: Optional[Condition] = None,
+    ) -> None:
+        super().__init__()
+
+        self._source_file = normalize_to_list_of_substitutions(source_file)
+        self._replacements = {
+            key: normalize_to_list_of_substitutions(value) for key, value in replacements.items()
+        }
+        self._condition = condition
+
+    @property
+    def name(self):
+        return self._source_file
+
+    @property
+    def condition(self):
+        return self._condition
+
+    def describe(self) -> str:
+        return ""
+
+    def perform(self, context: LaunchContext) -> str:
+        source_path = perform_substitutions(context, self._source_file)
+        if self._condition is not None and not self._condition.evaluate(context):
+            return source_path
+
+        replacements = {
+            key: perform_substitutions(context, value) for key, value in self._replacements.items()
+        }
+        return render_template(source_path, replacements)
+
+
+class _MemoizedSubstitution(Substitution):
+    """
+    Base class of substitutions computed from other substitutions with plain Python, without
+    eval. Results are memoized per launch context, keyed by the type and the performed values.
+    """
+
+    def __init__(self, *values: SomeSubstitutionsType) -> None:
+        super().__init__()
+
+        self._values = tuple(normalize_to_list_of_substitutions(value) for value in values)
+
+    def describe(self) -> str:
+        values = ", ".join(
+            " + ".join(substitution.describe() for substitution in value) for value in self._values
+        )
+        return f"{type(self).__name__}({values})"
+
+    def _compute(self, *values: str) -> str:
+        raise NotImplementedError
+
+    def perform(self, context: LaunchContext) -> str:
+        values = tuple(perform_substitutions(context, value) for value in self._values)
+
+        cache = context.get_locals_as_dict().get(SUBSTITUTIONS_CACHE_KEY)
+        if cache is None:
+            cache = {}
+            context.extend_globals({SUBSTITUTIONS_CACHE_KEY: cache})
+
+        key = (type(self), values)
+        result = cache.get(key)
+        if result is None:
+            result = self._compute(*values)
+            cache[key] = result
+        return result
+
+
+class NamespacedPrefix(_MemoizedSubstitution):
+    """
+    Substitution that returns the namespace followed by the separator (e.g. 'robot/'), or an empty
+    string if the namespace is empty.
+    """
+
+    def __init__(self, namespace: SomeSubstitutionsType, separator: SomeSubstitutionsType = "/"):
+        super().__init__(namespace, separator)
+
+    def _compute(self, namespace: str, separator: str) -> str:
+        return namespace + separator if namespace else ""
+
+
+class NamespacedFrame(_MemoizedSubstitution):
+    """
+    Substitution that returns the frame prefixed with the namespace (e.g. 'robot/odom'), or the
+    frame itself if the namespace is empty.
+    """
+
+    def __init__(self, namespace: SomeSubstitutionsType, frame: SomeSubstitutionsType):
+        super().__init__(namespace, frame)
+
+    def _compute(self, namespace: str, frame: str) -> str:
+        return namespace + "/" + frame if namespace else frame
+
+
+class NamespacedLogUnit(_MemoizedSubstitution):
+    """
+    Substitution that returns the logger name of a node in the namespace (e.g.
+    'robot.controller_manager'), or the node logger name if the namespace is empty.
+    """
+
+    def __init__(self, namespace: SomeSubstitutionsType, unit: SomeSubstitutionsType):
+        super().__init__(namespace, unit)
+
+    def _compute(self, namespace: str, unit: str) -> str:
+        return namespace + "." + unit if namespace else unit
+
+
+class DefaultWheelType(_MemoizedSubstitution):
+    """
+    Substitution that returns the default wheel type of the robot model.
+    """
+
+    def __init__(self, robot_model: SomeSubstitutionsType):
+        super().__init__(robot_model)
+
+    def _compute(self, robot_model: str) -> str:
+        try:
+            return DEFAULT_WHEEL_TYPES[robot_model]
+        except KeyError:
+            raise SubstitutionFailure(
+                f"Unknown robot model '{robot_model}'. "
+                f"Expected one of: {', '.join(DEFAULT_WHEEL_TYPES)}."
+            )
+
+
+class PackageVersion(_MemoizedSubstitution):
+    """
+    Substitution that returns the version of an installed package read from its package.xml.
+    Faster equivalent of Command("ros2 pkg xml -t version <package>"), cached for the session.
+    """
+
+    def __init__(self, package: SomeSubstitutionsType):
+        super().__init__(package)
+
+    def _compute(self, package: str) -> str:
+        from husarion_ugv_utils.robot_metadata import get_package_version
+
+        try:
+            return get_package_version(package)
+        except ValueError as e:
+            raise SubstitutionFailure(f"Failed to get version of package '{package}': {e}")
+
+
+class LogPipelinePrefix(_MemoizedSubstitution):
+    """
+    Substitution that returns the launch prefix running a node through the log_pipeline
+    executable, or an empty string if the pipeline is disabled. Use as the 'prefix' of a Node.
+    """
+
+    def __init__(self, enabled: SomeSubstitutionsType, name: SomeSubstitutionsType):
+        super().__init__(enabled, name)
+
+    def _compute(self, enabled: str, name: str) -> str:
+        if enabled.lower() != "true":
+            return ""
+
+        from ament_index_python.packages import get_package_prefix
+
+        executable = os.path.join(
+            get_package_prefix("husarion_ugv_utils"), "lib", "husarion_ugv_utils", "log_pipeline"
+        )
+        return f"{executable} --name {name} --"
+
+
+class BundledConfig(Substitution):
+    """
+    Substitution that returns the path to a configuration file from the configuration bundle
+    compiled with husarion_ugv_utils.config_bundle. If the bundle path is empty, the default
+    path is returned, so the bundle is optional.
+
+    The bundle has to be compiled with the same options as the current launch arguments
+    (robot_model, wheel_type, localization_mode, fuse_gps, common_dir_path), otherwise the
+    substitution fails. Nodes take file paths, so the bundled content is written once to the
+    temporary config directory. The bundle guarantees that a validated, consistent set of files
+    is used, it doesn't reduce file I/O.
+
+    Args:
+        bundle_path (SomeSubstitutionsType): Path to the configuration bundle.
+        key (str): Key of the configuration file in the bundle (e.g. 'controller').
+        default (SomeSubstitutionsType): Path used when no bundle is given.
+    """
+
+    def __init__(
+        self,
+        bundle_path: SomeSubstitutionsType,
+        key: str,
+        default: SomeSubstitutionsType,
+    ) -> None:
+        super().__init__()
+
+        self._bundle_path = normalize_to_list_of_substitutions(bundle_path)
+        self._key = key
+        self._default = normalize_to_list_of_substitutions(default)
+
+    def describe(self) -> str:
+        return f"BundledConfig({self._key})"
+
+    def perform(self, context: LaunchContext) -> str:
+        bundle_path = perform_substitutions(context, self._bundle_path)
+        if bundle_path == "":
+            return perform_substitutions(context, self._default)
+
+        # Imported here, so launch files not using a bundle don't load YAML and ament_index
+        from husarion_ugv_utils.config_bundle import (
+            check_bundle_options,
+            get_bundled_config,
+        )
+
+        launch_options = {
+            name: context.launch_configurations[name]
+            for name in BUNDLE_OPTION_ARGUMENTS
+            if name in context.launch_configurations
+        }
+
+        try:
+            check_bundle_options(bundle_path, launch_options)
+            content, file_name = get_bundled_config(bundle_path, self._key)
+        except (OSError, ValueError, KeyError) as e:
+            raise SubstitutionFailure(
+                f"Failed to get '{self._key}' configuration from bundle {bundle_path}: {e}"
+            )
+
+        _, extension = os.path.splitext(file_name)
+        return write_config(content, extension)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import weakref
+from typing import Callable, Dict, List, Optional
+
+import launch.logging
+from launch.action import Action
+from launch.actions import (
+    ExecuteProcess,
+    RegisterEventHandler,
+    Shutdown,
+    TimerAction,
+    UnregisterEventHandler,
+)
+from launch.event_handlers import OnProcessExit, OnProcessStart
+from launch.launch_context import LaunchContext
+
+
+class Criticality:
+    # Exit of the process shuts down the whole launch
+    CRITICAL = "critical"
+    # The process is restarted with exponential backoff
+    RESPAWN = "respawn"
+
+
+# Supervisor of each started process action, e.g. to record the policy with the process
+_supervisors = weakref.WeakKeyDictionary()
+
+
+def get_supervisor(process: ExecuteProcess) -> Optional["SupervisedProcess"]:
+    """Returns the supervisor which started the process action, or None if it isn't supervised."""
+    return _supervisors.get(process)
+
+
+class SupervisedProcess(Action):
+    """
+    Action that starts a process and applies its criticality policy when the process exits.
+
+    Processes are restarted by executing a new action created by the factory, so the launch-side
+    setup of the process is repeated as well (e.g. composable nodes are loaded into a restarted
+    container again). The restart delay starts at initial_delay and is multiplied by
+    backoff_factor after each restart, up to max_delay. It is reset once the process runs for
+    stable_time. Downtime of every restart is logged.
+
+    Args:
+        process_factory (Callable[[], ExecuteProcess]): Function creating the process action,
+            e.g. a launch_ros Node.
+        criticality (str): One of Criticality values.
+        initial_delay (float): Delay in seconds before the first restart.
+        max_delay (float): Maximum delay in seconds between restarts.
+        backoff_factor (float): Multiplier of the delay after each consecutive restart.
+        stable_time (float): Uptime in seconds after which the delay is reset.
+    """
+
+    def __init__(
+        self,
+        process_factory: Callable[[], ExecuteProcess],
+        criticality: str = Criticality.RESPAWN,
+        initial_delay: float = 0.05,
+        max_delay: float = 30.0,
+        backoff_factor: float = 2.0,
+        stable_time: float = 10.0,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        if criticality not in (Criticality.CRITICAL, Criticality.RESPAWN):
+            raise ValueError(f"Unknown process criticality: '{criticality}'.")
+
+        self._process_factory = process_factory
+        self._criticality = criticality
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._backoff_factor = backoff_factor
+        self._stable_time = stable_time
+
+        self._logger = launch.logging.get_logger("supervisor")
+        self._delay = initial_delay
+        self._start_time = 0.0
+        self._exit_time: Optional[float] = None
+        self._restarts = 0
+        self._max_downtime = 0.0
+
+    @property
+    def criticality(self) -> str:
+        return self._criticality
+
+    @property
+    def restart_policy(self) -> Dict[str, float]:
+        """Parameters of the restart backoff."""
+        return {
+            "initial_delay": self._initial_delay,
+            "max_delay": self._max_delay,
+            "backoff_factor": self._backoff_factor,
+            "stable_time": self._stable_time,
+        }
+
+    def create_process(self) -> ExecuteProcess:
+        """Creates a new process action, e.g. to inspect it without executing the supervisor."""
+        return self._process_factory()
+
+    def execute(self, context: LaunchContext) -> Optional[List[Action]]:
+        return self._start_process()
+
+    def _start_process(self) -> List[Action]:
+        process = self._process_factory()
+        _supervisors[process] = self
+        on_start = OnProcessStart(target_action=process, on_start=self._on_start)
+        on_exit = OnProcessExit(
+            target_action=process,
+            on_exit=lambda event, context: self._on_exit(event, context, on_start, on_exit),
+        )
+        return [RegisterEventHandler(on_start), RegisterEventHandler(on_exit), process]
+
+    def _on_start(self, event, context: LaunchContext) -> None:
+        self._start_time = time.monotonic()
+        if self._exit_time is None:
+            return
+
+        downtime = self._start_time - self._exit_time
+        self._max_downtime = max(self._max_downtime, downtime)
+        self._exit_time = None
+        self._logger.info(
+            f"Process {event.name} restarted, downtime: {downtime * 1000.0:.1f} ms "
+            f"(restarts: {self._restarts}, max downtime: {self._max_downtime * 1000.0:.1f} ms)."
+        )
+
+    def _on_exit(self, event, context: LaunchContext, on_start, on_exit) -> List[Action]:
+        actions = [UnregisterEventHandler(on_start), UnregisterEventHandler(on_exit)]
+        if context.is_shutdown:
+            return actions
+
+        uptime = time.monotonic() - self._start_time
+        if self._criticality == Criticality.CRITICAL:
+            return actions + [
+                Shutdown(
+                    reason=f"Critical process {event.name} exited with code {event.returncode}."
+                )
+            ]
+
+        if uptime >= self._stable_time:
+            self._delay = self._initial_delay
+
+        self._exit_time = time.monotonic()
+        self._restarts += 1
+        self._logger.warning(
+            f"Process {event.name} exited with code {event.returncode} after {uptime:.2f} s, "
+            f"restarting in {self._delay * 1000.0:.0f} ms."
+        )
+
+        restart = TimerAction(period=self._delay, actions=self._start_process())
+        self._delay = min(self._delay * self._backoff_factor, self._max_delay)
+        return actions + [restart]
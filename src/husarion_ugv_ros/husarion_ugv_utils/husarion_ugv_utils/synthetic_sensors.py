@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Publish deterministic synthetic sensor streams for load testing of localization and bridges.
+
+Usage:
+    ros2 run husarion_ugv_utils synthetic_sensors [--namespace <namespace>] [--duration 0.0]
+        [--wheels-rate 100] [--imu-rate 100] [--gps-rate 10] [--point-cloud-rate 0]
+        [--image-rate 0] [--seed 0] [--no-pacing]
+
+All streams are sampled from one planar trajectory driven by sinusoidal linear and angular
+velocity, so they are kinematically consistent: odometry/wheels (nav_msgs/Odometry), imu/data
+(sensor_msgs/Imu) and, as published by the NMEA driver, gps/fix (sensor_msgs/NavSatFix) and
+gps/vel (geometry_msgs/TwistStamped) with the ENU position converted to coordinates around
+--origin. Noise of the sensors matches covariances of the robot configuration and depends only
+on --seed. Optionally a static point cloud of a rectangular room and a static image are published
+with the given size. Topics are relative to --namespace and frames are prefixed with it, as with
+tf_prefix of localization.launch.py and nmea_navsat.launch.py.
+
+Samples are generated with NumPy for chunks of one second and published by updating a single
+pre-allocated message per stream. Stamps are the start time plus the generated time of each
+sample. Publishing is paced with the wall clock, unless --no-pacing is set, which publishes as
+fast as possible. Published counts, rates and the maximum lag behind the schedule are shown at
+exit.
+"""
+
+import argparse
+import array
+import math
+import os
+import time
+from typing import List, Optional
+
+import numpy as np
+import rclpy
+from geometry_msgs.msg import TwistStamped
+from nav_msgs.msg import Odometry
+from rclpy.node import Node
+from sensor_msgs.msg import Image, Imu, NavSatFix, NavSatStatus, PointCloud2, PointField
+
+CHUNK_DURATION = 1.0
+GRAVITY = 9.80665
+EARTH_RADIUS = 6378137.0
+
+# Variances as in the drive controller and IMU broadcaster configs (WH01_controller.yaml)
+WHEELS_TWIST_COVARIANCE = [5.4e-5, 5.4e-5, 0.0, 0.0, 0.0, 1.9e-4]
+IMU_ORIENTATION_VARIANCE = 1.8e-3
+IMU_ANGULAR_VELOCITY_VARIANCE = 1.0e-4
+IMU_LINEAR_ACCELERATION_VARIANCE = 7.6e-4
+
+
+def frame_id(namespace: str, frame: str) -> str:
+    namespace = namespace.strip("/")
+    return f"{namespace}/{frame}" if namespace else frame
+
+
+class Trajectory:
+    """
+    Planar trajectory of the robot, starting at the origin and heading east.
+
+    The linear velocity changes between 0.5 and 1.5 of its mean and the angular velocity is a
+    sine with twice the period, so the heading has a closed form and only the position is
+    integrated numerically.
+
+    Args:
+        linear_velocity (float): Mean linear velocity in m/s.
+        angular_velocity (float): Amplitude of the angular velocity in rad/s.
+        period (float): Period in seconds of the linear velocity changes.
+        step (float): Integration step in seconds of the position.
+    """
+
+    def __init__(
+        self, linear_velocity: float, angular_velocity: float, period: float, step: float = 1e-3
+    ):
+        self._v = linear_velocity
+        self._w = angular_velocity
+        self._omega = 2.0 * math.pi / period
+        self._step = step
+        self._t = np.zeros(1)
+        self._x = np.zeros(1)
+        self._y = np.zeros(1)
+
+    def linear_velocity(self, t: np.ndarray) -> np.ndarray:
+        return self._v * (1.0 - 0.5 * np.cos(self._omega * t))
+
+    def linear_acceleration(self, t: np.ndarray) -> np.ndarray:
+        return 0.5 * self._v * self._omega * np.sin(self._omega * t)
+
+    def angular_velocity(self, t: np.ndarray) -> np.ndarray:
+        return self._w * np.sin(0.5 * self._omega * t)
+
+    def yaw(self, t: np.ndarray) -> np.ndarray:
+        return 2.0 * self._w / self._omega * (1.0 - np.cos(0.5 * self._omega * t))
+
+    def position(self, t: np.ndarray) -> np.ndarray:
+        """Returns x and y in m of sorted times, not earlier than the last discarded time."""
+        self._extend(t[-1])
+        return np.interp(t, self._t, self._x), np.interp(t, self._t, self._y)
+
+    def discard_until(self, t: float) -> None:
+        """Drops the integrated positions before the time, which won't be sampled anymore."""
+        first = max(0, int(np.searchsorted(self._t, t)) - 1)
+        self._t = self._t[first:]
+        self._x = self._x[first:]
+        self._y = self._y[first:]
+
+    def _extend(self, until: float) -> None:
+        if until <= self._t[-1]:
+            return
+
+        steps = int(math.ceil((until - self._t[-1]) / self._step))
+        t = self._t[-1] + self._step * np.arange(steps + 1)
+        v = self.linear_velocity(t)
+        yaw = self.yaw(t)
+        # Trapezoidal integration of the velocity from the last integrated position
+        vx = v * np.cos(yaw)
+        vy = v * np.sin(yaw)
+        x = self._x[-1] + np.cumsum((vx[1:] + vx[:-1]) * 0.5 * self._step)
+        y = self._y[-1] + np.cumsum((vy[1:] + vy[:-1]) * 0.5 * self._step)
+
+        self._t = np.concatenate((self._t, t[1:]))
+        self._x = np.concatenate((self._x, x))
+        self._y = np.concatenate((self._y, y))
+
+
+class SensorStream:
+    """
+    Messages of a sensor published at a fixed rate. Values of the samples are generated for whole
+    chunks and a single pre-allocated message is updated and published for every sample.
+
+    Args:
+        node (Node): Node publishing the stream.
+        msg_type: Message type.
+        topic (str): Topic name.
+        rate (float): Publish rate in Hz.
+    """
+
+    def __init__(self, node: Node, msg_type, topic: str, rate: float):
+        self.topic = topic
+        self.rate = rate
+        self.published = 0
+        self.msg = msg_type()
+        self._publisher = node.create_publisher(msg_type, topic, 10)
+        self._stamps: List[List[int]] = []
+        self._values: Optional[List[List[float]]] = None
+
+    def sample_times(self, start: float, end: float) -> np.ndarray:
+        """Returns times of the samples in the range [start, end)."""
+        first = math.ceil(round(start * self.rate, 9))
+        last = math.ceil(round(end * self.rate, 9))
+        return np.arange(first, last) / self.rate
+
+    def prepare(
+        self, times: np.ndarray, trajectory: Trajectory, rng: np.random.Generator, start_ns: int
+    ) -> None:
+        if len(times) == 0:
+            self._stamps, self._values = [], None
+            return
+
+        stamps = start_ns + np.round(times * 1e9).astype(np.int64)
+        self._stamps = np.column_stack((stamps // 1_000_000_000, stamps % 1_000_000_000)).tolist()
+        self._values = self.generate(times, trajectory, rng)
+
+    def generate(
+        self, times: np.ndarray, trajectory: Trajectory, rng: np.random.Generator
+    ) -> Optional[List[List[float]]]:
+        """Returns values of the samples at the times, None for static messages."""
+        return None
+
+    def fill(self, values: List[float]) -> None:
+        pass
+
+    def publish(self, index: int) -> None:
+        stamp = self.msg.header.stamp
+        stamp.sec, stamp.nanosec = self._stamps[index]
+        if self._values is not None:
+            self.fill(self._values[index])
+        self._publisher.publish(self.msg)
+        self.published += 1
+
+
+class WheelOdometryStream(SensorStream):
+    def __init__(self, node: Node, rate: float, namespace: str):
+        super().__init__(node, Odometry, "odometry/wheels", rate)
+        self.msg.header.frame_id = frame_id(namespace, "odom")
+        self.msg.child_frame_id = frame_id(namespace, "base_link")
+        for i, variance in enumerate(WHEELS_TWIST_COVARIANCE):
+            self.msg.twist.covariance[i * 7] = variance
+
+    def generate(self, times, trajectory, rng):
+        x, y = trajectory.position(times)
+        yaw = trajectory.yaw(times)
+        v = trajectory.linear_velocity(times) + rng.normal(
+            0.0, math.sqrt(WHEELS_TWIST_COVARIANCE[0]), len(times)
+        )
+        w = trajectory.angular_velocity(times) + rng.normal(
+            0.0, math.sqrt(WHEELS_TWIST_COVARIANCE[5]), len(times)
+        )
+        return np.column_stack((x, y, np.sin(0.5 * yaw), np.cos(0.5 * yaw), v, w)).tolist()
+
+    def fill(self, values):
+        pose = self.msg.pose.pose
+        twist = self.msg.twist.twist
+        pose.position.x, pose.position.y, pose.orientation.z, pose.orientation.w = values[:4]
+        twist.linear.x, twist.angular.z = values[4:]
+
+
+class ImuStream(SensorStream):
+    def __init__(self, node: Node, rate: float, namespace: str):
+        super().__init__(node, Imu, "imu/data", rate)
+        self.msg.header.frame_id = frame_id(namespace, "imu_link")
+        for i in (0, 4, 8):
+            self.msg.orientation_covariance[i] = IMU_ORIENTATION_VARIANCE
+            self.msg.angular_velocity_covariance[i] = IMU_ANGULAR_VELOCITY_VARIANCE
+            self.msg.linear_acceleration_covariance[i] = IMU_LINEAR_ACCELERATION_VARIANCE
+
+    def generate(self, times, trajectory, rng):
+        n = len(times)
+        yaw = trajectory.yaw(times) + rng.normal(0.0, math.sqrt(IMU_ORIENTATION_VARIANCE), n)
+        v = trajectory.linear_velocity(times)
+        w = trajectory.angular_velocity(times)
+        w_noise, ax_noise, ay_noise, az_noise = rng.normal(
+            0.0,
+            np.sqrt(
+                [
+                    IMU_ANGULAR_VELOCITY_VARIANCE,
+                    IMU_LINEAR_ACCELERATION_VARIANCE,
+                    IMU_LINEAR_ACCELERATION_VARIANCE,
+                    IMU_LINEAR_ACCELERATION_VARIANCE,
+                ]
+            )[:, np.newaxis],
+            (4, n),
+        )
+        return np.column_stack(
+            (
+                np.sin(0.5 * yaw),
+                np.cos(0.5 * yaw),
+                w + w_noise,
+                trajectory.linear_acceleration(times) + ax_noise,
+                # Centripetal acceleration and gravity, which isn't removed by the IMU driver
+                v * w + ay_noise,
+                GRAVITY + az_noise,
+            )
+        ).tolist()
+
+    def fill(self, values):
+        msg = self.msg
+        msg.orientation.z, msg.orientation.w, msg.angular_velocity.z = values[:3]
+        acceleration = msg.linear_acceleration
+        acceleration.x, acceleration.y, acceleration.z = values[3:]
+
+
+class GpsFixStream(SensorStream):
+    def __init__(
+        self, node: Node, rate: float, namespace: str, origin: List[float], stddev: float
+    ):
+        super().__init__(node, NavSatFix, "gps/fix", rate)
+        self._origin = origin
+        self._stddev = stddev
+        self.msg.header.frame_id = frame_id(namespace, "gps")
+        self.msg.status.status = NavSatStatus.STATUS_FIX
+        self.msg.status.service = NavSatStatus.SERVICE_GPS
+        for i in (0, 4, 8):
+            self.msg.position_covariance[i] = stddev**2
+        self.msg.position_covariance_type = NavSatFix.COVARIANCE_TYPE_APPROXIMATED
+
+    def generate(self, times, trajectory, rng):
+        latitude, longitude, altitude = self._origin
+        east, north = trajectory.position(times)
+        east_noise, north_noise, up_noise = rng.normal(0.0, self._stddev, (3, len(times)))
+        # Local flat Earth approximation around the origin
+        return np.column_stack(
+            (
+                latitude + np.degrees((north + north_noise) / EARTH_RADIUS),
+                longitude
+                + np.degrees(
+                    (east + east_noise) / (EARTH_RADIUS * math.cos(math.radians(latitude)))
+                ),
+                altitude + up_noise,
+            )
+        ).tolist()
+
+    def fill(self, values):
+        self.msg.latitude, self.msg.longitude, self.msg.altitude = values
+
+
+class GpsVelocityStream(SensorStream):
+    def __init__(self, node: Node, rate: float, namespace: str):
+        super().__init__(node, TwistStamped, "gps/vel", rate)
+        self.msg.header.frame_id = frame_id(namespace, "gps")
+
+    def generate(self, times, trajectory, rng):
+        v = trajectory.linear_velocity(times)
+        yaw = trajectory.yaw(times)
+        return np.column_stack((v * np.cos(yaw), v * np.sin(yaw))).tolist()
+
+    def fill(self, values):
+        self.msg.twist.linear.x, self.msg.twist.linear.y = values
+
+
+class PointCloudStream(SensorStream):
+    """Static scan of a 10 x 6 m room by a 16-ring lidar in its center."""
+
+    def __init__(self, node: Node, rate: float, namespace: str, topic: str, points: int):
+        super().__init__(node, PointCloud2, topic, rate)
+        rings = 16
+        azimuth = np.linspace(-math.pi, math.pi, max(1, points // rings), endpoint=False)
+        elevation = np.radians(np.linspace(-15.0, 15.0, rings))
+        azimuth, elevation = np.meshgrid(azimuth, elevation)
+        # Horizontal distance to the closest wall along the beam
+        with np.errstate(divide="ignore"):
+            distance = np.minimum(5.0 / np.abs(np.cos(azimuth)), 3.0 / np.abs(np.sin(azimuth)))
+
+        cloud = np.zeros(
+            azimuth.size,
+            dtype=[("x", "<f4"), ("y", "<f4"), ("z", "<f4"), ("intensity", "<f4")],
+        )
+        cloud["x"] = (distance * np.cos(azimuth)).ravel()
+        cloud["y"] = (distance * np.sin(azimuth)).ravel()
+        cloud["z"] = (distance * np.tan(elevation)).ravel()
+        cloud["intensity"] = np.repeat(np.arange(rings, dtype=np.float32), azimuth.shape[1])
+
+        self.msg.header.frame_id = frame_id(namespace, "lidar")
+        self.msg.height = 1
+        self.msg.width = cloud.size
+        self.msg.fields = [
+            PointField(name=name, offset=4 * i, datatype=PointField.FLOAT32, count=1)
+            for i, name in enumerate(cloud.dtype.names)
+        ]
+        self.msg.is_bigendian = False
+        self.msg.point_step = cloud.itemsize
+        self.msg.row_step = cloud.nbytes
+        self.msg.is_dense = True
+        self.msg.data = array.array("B", cloud.tobytes())
+
+
+class ImageStream(SensorStream):
+    """Static RGB gradient image."""
+
+    def __init__(
+        self, node: Node, rate: float, namespace: str, topic: str, width: int, height: int
+    ):
+        super().__init__(node, Image, topic, rate)
+        image = np.empty((height, width, 3), dtype=np.uint8)
+        image[:, :, 0] = np.linspace(0, 255, width, dtype=np.uint8)[np.newaxis, :]
+        image[:, :, 1] = np.linspace(0, 255, height, dtype=np.uint8)[:, np.newaxis]
+        image[:, :, 2] = 128
+
+        self.msg.header.frame_id = frame_id(namespace, "camera")
+        self.msg.height = height
+        self.msg.width = width
+        self.msg.encoding = "rgb8"
+        self.msg.is_bigendian = False
+        self.msg.step = width * 3
+        self.msg.data = array.array("B", image.tobytes())
+
+
+class SensorPublisher:
+    """
+    Publishes sensor streams according to the schedule of their samples.
+
+    Args:
+        node (Node): Node of the streams, its clock gives the start stamp.
+        streams (List[SensorStream]): Streams to publish.
+        trajectory (Trajectory): Trajectory sampled by the streams.
+        seed (int): Seed of the sensor noise.
+        pacing (bool): Whether to publish according to the wall clock or as fast as possible.
+    """
+
+    def __init__(
+        self,
+        node: Node,
+        streams: List[SensorStream],
+        trajectory: Trajectory,
+        seed: int,
+        pacing: bool = True,
+    ):
+        self._streams = streams
+        self._trajectory = trajectory
+        self._rng = np.random.default_rng(seed)
+        self._pacing = pacing
+        self._start_ns = node.get_clock().now().nanoseconds
+        self._start_time = time.monotonic()
+        self.max_lag = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start_time
+
+    def publish_chunk(self, start: float, end: float) -> None:
+        times = []
+        stream_indices = []
+        sample_indices = []
+        for i, stream in enumerate(self._streams):
+            stream_times = stream.sample_times(start, end)
+            stream.prepare(stream_times, self._trajectory, self._rng, self._start_ns)
+            times.append(stream_times)
+            stream_indices.append(np.full(len(stream_times), i))
+            sample_indices.append(np.arange(len(stream_times)))
+        self._trajectory.discard_until(end)
+
+        times = np.concatenate(times)
+        order = np.argsort(times, kind="stable")
+        schedule = zip(
+            (times[order] + self._start_time).tolist(),
+            np.concatenate(stream_indices)[order].tolist(),
+            np.concatenate(sample_indices)[order].tolist(),
+        )
+        streams = self._streams
+        for publish_time, stream_index, sample_index in schedule:
+            if self._pacing:
+                delay = publish_time - time.monotonic()
+                if delay > 0.0:
+                    time.sleep(delay)
+                else:
+                    self.max_lag = max(self.max_lag, -delay)
+            streams[stream_index].publish(sample_index)
+
+    def run(self, duration: float) -> None:
+        """Publishes the streams for the duration in seconds, or until shutdown if it's 0."""
+        chunk = 0
+        while rclpy.ok() and (duration <= 0.0 or chunk * CHUNK_DURATION < duration):
+            end = (chunk + 1) * CHUNK_DURATION
+            self.publish_chunk(
+                chunk * CHUNK_DURATION, min(end, duration) if duration > 0.0 else end
+            )
+            chunk += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--namespace",
+        default=os.environ.get("ROBOT_NAMESPACE", ""),
+        help="Namespace of topics and prefix of frames, ROBOT_NAMESPACE by default.",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=0.0, help="Duration in seconds, 0 runs until stopped."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the sensor noise.")
+    parser.add_argument(
+        "--no-pacing",
+        dest="pacing",
+        action="store_false",
+        help="Publish as fast as possible instead of following the wall clock.",
+    )
+    parser.add_argument("--wheels-rate", type=float, default=100.0, help="0 disables the stream.")
+    parser.add_argument("--imu-rate", type=float, default=100.0, help="0 disables the stream.")
+    parser.add_argument(
+        "--gps-rate", type=float, default=10.0, help="Rate of gps/fix and gps/vel, 0 disables."
+    )
+    parser.add_argument(
+        "--gps-stddev", type=float, default=0.5, help="Standard deviation in m of GPS position."
+    )
+    parser.add_argument(
+        "--origin",
+        nargs=3,
+        type=float,
+        default=[52.2297, 21.0122, 100.0],
+        metavar=("LATITUDE", "LONGITUDE", "ALTITUDE"),
+        help="Coordinates of the start position.",
+    )
+    parser.add_argument(
+        "--linear-velocity", type=float, default=1.0, help="Mean linear velocity in m/s."
+    )
+    parser.add_argument(
+        "--angular-velocity", type=float, default=0.5, help="Amplitude of angular velocity."
+    )
+    parser.add_argument(
+        "--period", type=float, default=20.0, help="Period in seconds of velocity changes."
+    )
+    parser.add_argument("--point-cloud-rate", type=float, default=0.0, help="0 disables.")
+    parser.add_argument("--point-cloud-points", type=int, default=28800)
+    parser.add_argument("--point-cloud-topic", default="lidar/points")
+    parser.add_argument("--image-rate", type=float, default=0.0, help="0 disables.")
+    parser.add_argument(
+        "--image-size", nargs=2, type=int, default=[1280, 720], metavar=("WIDTH", "HEIGHT")
+    )
+    parser.add_argument("--image-topic", default="camera/image_raw")
+    args = parser.parse_args()
+
+    rclpy.init()
+    node = rclpy.create_node("synthetic_sensors", namespace=args.namespace)
+
+    namespace = args.namespace
+    streams: List[SensorStream] = []
+    if args.wheels_rate > 0.0:
+        streams.append(WheelOdometryStream(node, args.wheels_rate, namespace))
+    if args.imu_rate > 0.0:
+        streams.append(ImuStream(node, args.imu_rate, namespace))
+    if args.gps_rate > 0.0:
+        streams.append(GpsFixStream(node, args.gps_rate, namespace, args.origin, args.gps_stddev))
+        streams.append(GpsVelocityStream(node, args.gps_rate, namespace))
+    if args.point_cloud_rate > 0.0:
+        streams.append(
+            PointCloudStream(
+                node,
+                args.point_cloud_rate,
+                namespace,
+                args.point_cloud_topic,
+                args.point_cloud_points,
+            )
+        )
+    if args.image_rate > 0.0:
+        streams.append(
+            ImageStream(node, args.image_rate, namespace, args.image_topic, *args.image_size)
+        )
+    if not streams:
+        parser.error("all streams are disabled")
+
+    trajectory = Trajectory(args.linear_velocity, args.angular_velocity, args.period)
+    publisher = SensorPublisher(node, streams, trajectory, args.seed, args.pacing)
+    try:
+        publisher.run(args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        elapsed = publisher.elapsed
+        print(f"{'topic':<24}{'rate':>9}{'published':>11}{'achieved':>10}")
+        for stream in streams:
+            print(
+                f"{stream.topic:<24}{stream.rate:9.1f}{stream.published:11d}"
+                f"{stream.published / elapsed:10.1f}"
+            )
+        if args.pacing:
+            print(f"Max lag behind the schedule: {publisher.max_lag * 1000.0:.2f} ms")
+        node.destroy_node()
+        rclpy.try_shutdown()
+
+
+if __name__ == "__main__":
+    main()
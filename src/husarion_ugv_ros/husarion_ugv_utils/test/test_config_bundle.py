@@ -0,0 +1,185 @@
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from husarion_ugv_utils.config_bundle import (
+    BUNDLE_VERSION,
+    ConfigSource,
+    _validate_required_keys,
+    _validate_ros_parameters,
+    check_bundle_options,
+    compile_bundle,
+    get_bundled_config,
+    load_bundle,
+    write_bundle,
+)
+
+WHEEL_CONFIG = "wheel_radius: 0.1825\nmecanum: false\n"
+CONTROLLER_CONFIG = "/**:\n  controller_manager:\n    ros__parameters:\n      update_rate: 100\n"
+
+
+@pytest.fixture
+def share_dir(tmp_path, monkeypatch):
+    """Replaces configuration sources with test ones, read from a temporary share directory."""
+    share_dir = tmp_path / "share"
+    for package, file_name, content in [
+        ("description", "WH01.yaml", WHEEL_CONFIG),
+        ("controller", "WH01_controller.yaml", CONTROLLER_CONFIG),
+    ]:
+        (share_dir / package / "config").mkdir(parents=True)
+        (share_dir / package / "config" / file_name).write_text(content)
+
+    monkeypatch.setattr(
+        "husarion_ugv_utils.config_bundle.get_package_share_directory",
+        lambda package: str(share_dir / package),
+    )
+    monkeypatch.setattr(
+        "husarion_ugv_utils.config_bundle.CONFIG_SOURCES",
+        {
+            "wheel": ConfigSource(
+                "description",
+                "config/{wheel_type}.yaml",
+                _validate_required_keys({"wheel_radius": float, "mecanum": bool}),
+            ),
+            "controller": ConfigSource(
+                "controller",
+                "config/{wheel_type}_controller.yaml",
+                _validate_ros_parameters,
+                common_dir=True,
+            ),
+        },
+    )
+    return share_dir
+
+
+def test_compile_bundle(share_dir):
+    bundle = compile_bundle("panther", "WH01")
+
+    assert bundle["version"] == BUNDLE_VERSION
+    assert bundle["options"] == {
+        "robot_model": "panther",
+        "wheel_type": "WH01",
+        "localization_mode": "relative",
+        "gps_postfix": "",
+        "common_dir_path": "",
+    }
+    assert bundle["configs"]["wheel"]["content"] == WHEEL_CONFIG
+    assert bundle["configs"]["controller"]["source"] == str(
+        share_dir / "controller" / "config" / "WH01_controller.yaml"
+    )
+    assert bundle["hash"] == compile_bundle("panther", "WH01")["hash"]
+
+
+def test_compile_bundle_common_dir(share_dir, tmp_path):
+    common_dir = tmp_path / "common"
+    (common_dir / "controller" / "config").mkdir(parents=True)
+    (common_dir / "controller" / "config" / "WH01_controller.yaml").write_text(
+        "/**:\n  controller_manager:\n    ros__parameters:\n      update_rate: 50\n"
+    )
+
+    bundle = compile_bundle("panther", "WH01", common_dir_path=str(common_dir))
+
+    assert "update_rate: 50" in bundle["configs"]["controller"]["content"]
+    # Files not supporting the common directory are still read from the package
+    assert bundle["configs"]["wheel"]["source"].startswith(str(share_dir))
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "wheel_radius: [0.1\n",
+        "- wheel_radius\n",
+        "wheel_radius: 0.1825\n",
+        "wheel_radius: '0.1825'\nmecanum: false\n",
+        "wheel_radius: true\nmecanum: false\n",
+    ],
+)
+def test_compile_bundle_invalid_config(share_dir, content):
+    (share_dir / "description" / "config" / "WH01.yaml").write_text(content)
+
+    with pytest.raises(ValueError):
+        compile_bundle("panther", "WH01")
+
+
+def test_compile_bundle_accepts_int_for_float(share_dir):
+    (share_dir / "description" / "config" / "WH01.yaml").write_text(
+        "wheel_radius: 1\nmecanum: false\n"
+    )
+
+    assert compile_bundle("panther", "WH01")["configs"]["wheel"]["content"]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "controller_manager:\n  update_rate: 100\n",
+        "controller_manager:\n  ros__parameters: [update_rate]\n",
+    ],
+)
+def test_compile_bundle_invalid_ros_parameters(share_dir, content):
+    (share_dir / "controller" / "config" / "WH01_controller.yaml").write_text(content)
+
+    with pytest.raises(ValueError):
+        compile_bundle("panther", "WH01")
+
+
+def test_compile_bundle_missing_file(share_dir):
+    with pytest.raises(OSError):
+        compile_bundle("panther", "WH02")
+
+
+def test_write_and_load_bundle(share_dir, tmp_path):
+    bundle_path = str(tmp_path / "bundle.json")
+    bundle = compile_bundle("panther", "WH01")
+    write_bundle(bundle, bundle_path)
+
+    assert load_bundle(bundle_path) == bundle
+    assert get_bundled_config(bundle_path, "wheel") == (WHEEL_CONFIG, "WH01.yaml")
+    with pytest.raises(KeyError):
+        get_bundled_config(bundle_path, "lights")
+
+
+@pytest.mark.parametrize("key, value", [("version", 0), ("hash", "0" * 64)])
+def test_load_bundle_invalid(share_dir, tmp_path, key, value):
+    bundle_path = tmp_path / "bundle.json"
+    bundle = compile_bundle("panther", "WH01")
+    bundle[key] = value
+    bundle_path.write_text(json.dumps(bundle))
+
+    with pytest.raises(ValueError):
+        load_bundle(str(bundle_path))
+
+
+def test_check_bundle_options(share_dir, tmp_path):
+    bundle_path = str(tmp_path / "bundle.json")
+    write_bundle(compile_bundle("panther", "WH01", common_dir_path=str(share_dir)), bundle_path)
+
+    check_bundle_options(
+        bundle_path,
+        {
+            "robot_model": "panther",
+            "wheel_type": "WH01",
+            "localization_mode": "relative",
+            "fuse_gps": "False",
+            "common_dir_path": str(share_dir) + "/",
+        },
+    )
+    check_bundle_options(bundle_path, {})
+
+    with pytest.raises(ValueError, match="wheel_type"):
+        check_bundle_options(bundle_path, {"wheel_type": "WH02"})
+    with pytest.raises(ValueError, match="fuse_gps"):
+        check_bundle_options(bundle_path, {"fuse_gps": "true"})
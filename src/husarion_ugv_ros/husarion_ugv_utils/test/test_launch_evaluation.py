@@ -0,0 +1,32 @@
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from husarion_ugv_utils.benchmarks.launch_evaluation import robot_substitutions
+from launch.launch_context import LaunchContext
+
+
+@pytest.mark.parametrize("namespace", ["robot", ""])
+def test_robot_substitutions_are_equivalent(namespace):
+    context = LaunchContext()
+    context.launch_configurations["robot_model"] = "panther"
+    context.launch_configurations["log_level"] = "DEBUG"
+
+    substitutions = robot_substitutions(namespace)
+    results = {
+        name: [substitution.perform(context) for substitution in group]
+        for name, group in substitutions.items()
+    }
+
+    assert results["PythonExpression"] == results["husarion_ugv_utils"]
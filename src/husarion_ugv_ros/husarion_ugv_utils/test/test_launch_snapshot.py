@@ -0,0 +1,54 @@
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from husarion_ugv_utils.launch_snapshot import compute_input_hash
+
+
+def snapshot_inputs(common_dir_path):
+    return {
+        "launch": {
+            "package": "husarion_ugv_bringup",
+            "file": "bringup.launch.py",
+            "arguments": {"common_dir_path": str(common_dir_path)},
+        },
+        "packages": [],
+    }
+
+
+def test_input_hash_excludes_snapshot_dir(tmp_path):
+    (tmp_path / "config.yaml").write_text("a: 1\n")
+    snapshot_dir = tmp_path / "bringup_snapshot"
+    inputs = snapshot_inputs(tmp_path)
+
+    input_hash = compute_input_hash(inputs, str(snapshot_dir))
+    (snapshot_dir / "files").mkdir(parents=True)
+    (snapshot_dir / "snapshot.json").write_text("{}")
+    (snapshot_dir / "files" / "params.yaml").write_text("b: 2\n")
+
+    assert compute_input_hash(inputs, str(snapshot_dir)) == input_hash
+
+
+def test_input_hash_detects_changed_file(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("a: 1\n")
+    snapshot_dir = tmp_path / "bringup_snapshot"
+    inputs = snapshot_inputs(tmp_path)
+
+    input_hash = compute_input_hash(inputs, str(snapshot_dir))
+    config_path.write_text("a: 10\n")
+    os.utime(config_path, ns=(0, 0))
+
+    assert compute_input_hash(inputs, str(snapshot_dir)) != input_hash
@@ -0,0 +1,161 @@
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+
+import pytest
+from husarion_ugv_utils.log_pipeline import (
+    LogPipeline,
+    RotatingJsonLinesFile,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ListSink:
+    def __init__(self):
+        self.records = []
+
+    def write(self, record: dict) -> None:
+        self.records.append(record)
+
+    def flush(self) -> None:
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr("husarion_ugv_utils.log_pipeline.time.monotonic", clock)
+    return clock
+
+
+def test_token_bucket_burst(clock):
+    bucket = TokenBucket(rate=10.0, burst=3)
+
+    assert [bucket.consume() for _ in range(4)] == [True, True, True, False]
+
+
+def test_token_bucket_refill(clock):
+    bucket = TokenBucket(rate=10.0, burst=3)
+    for _ in range(3):
+        bucket.consume()
+
+    clock.now += 0.15
+    assert bucket.consume()
+    assert not bucket.consume()
+
+    # Tokens never exceed the burst size
+    clock.now += 100.0
+    assert [bucket.consume() for _ in range(4)] == [True, True, True, False]
+
+
+def test_pipeline_collapses_duplicates(clock, capsysbinary):
+    sink = ListSink()
+    pipeline = LogPipeline("node", sink, rate=100.0, burst=100)
+
+    for timestamp in ("1.000", "1.001", "1.002"):
+        pipeline.process("stdout", f"[INFO] [{timestamp}] [node]: message\n".encode())
+    pipeline.process("stdout", b"[INFO] [1.003] [node]: other\n")
+
+    assert [(record["msg"], record.get("repeated")) for record in sink.records] == [
+        ("[INFO] [1.000] [node]: message", None),
+        ("[INFO] [1.000] [node]: message", 2),
+        ("[INFO] [1.003] [node]: other", None),
+    ]
+    assert b"last message repeated 2 times" in capsysbinary.readouterr().out
+
+
+def test_pipeline_reports_repeats_on_flush(clock, capsysbinary):
+    sink = ListSink()
+    pipeline = LogPipeline("node", sink, rate=100.0, burst=100)
+
+    for _ in range(3):
+        pipeline.process("stdout", b"[INFO] [node]: message\n")
+    pipeline.flush()
+    pipeline.process("stdout", b"[INFO] [node]: message\n")
+
+    assert [record.get("repeated") for record in sink.records] == [None, 2, None]
+
+
+def test_pipeline_rate_limit(clock, capsysbinary):
+    sink = ListSink()
+    pipeline = LogPipeline("node", sink, rate=1.0, burst=2)
+
+    for index in range(5):
+        pipeline.process("stdout", f"[INFO] [node]: message {index}\n".encode())
+    pipeline.process("stdout", b"[WARN] [node]: warning\n")
+
+    assert [(record["level"], record["msg"]) for record in sink.records] == [
+        ("INFO", "[INFO] [node]: message 0"),
+        ("INFO", "[INFO] [node]: message 1"),
+        ("WARN", "[log_pipeline] 3 lines of node suppressed"),
+        ("WARN", "[WARN] [node]: warning"),
+    ]
+    assert sink.records[2]["suppressed"] == 3
+
+
+def test_pipeline_levels(clock, capsysbinary):
+    sink = ListSink()
+    pipeline = LogPipeline("node", sink, rate=100.0, burst=100)
+
+    pipeline.process("stdout", b"\x1b[33m[WARN] [node]: colored\x1b[0m\n")
+    pipeline.process("stderr", b"Traceback (most recent call last):\n")
+    pipeline.process("stdout", b"plain output\n")
+
+    assert [(record["stream"], record["level"], record["msg"]) for record in sink.records] == [
+        ("stdout", "WARN", "[WARN] [node]: colored"),
+        ("stderr", "ERROR", "Traceback (most recent call last):"),
+        ("stdout", "INFO", "plain output"),
+    ]
+
+
+def read_records(path) -> list:
+    with gzip.open(path, mode="rt", encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_rotating_file_rotation(tmp_path):
+    sink = RotatingJsonLinesFile(str(tmp_path), "node", max_bytes=1, backups=2)
+    for index in range(3):
+        sink.write({"msg": index})
+        sink.flush()
+    sink.write({"msg": 3})
+    sink.close()
+
+    assert read_records(tmp_path / "node.jsonl.gz") == [{"msg": 3}]
+    assert read_records(tmp_path / "node.1.jsonl.gz") == [{"msg": 2}]
+    assert read_records(tmp_path / "node.2.jsonl.gz") == [{"msg": 1}]
+    assert not (tmp_path / "node.3.jsonl.gz").exists()
+
+
+def test_rotating_file_new_run(tmp_path):
+    sink = RotatingJsonLinesFile(str(tmp_path), "node", max_bytes=1024, backups=1)
+    sink.write({"msg": "first run"})
+    sink.close()
+
+    sink = RotatingJsonLinesFile(str(tmp_path), "node", max_bytes=1024, backups=1)
+    sink.write({"msg": "second run"})
+    sink.close()
+
+    assert read_records(tmp_path / "node.jsonl.gz") == [{"msg": "second run"}]
+    assert read_records(tmp_path / "node.1.jsonl.gz") == [{"msg": "first run"}]
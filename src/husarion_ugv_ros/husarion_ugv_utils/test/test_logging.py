@@ -0,0 +1,57 @@
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from husarion_ugv_utils.logging import LimitedLogLevel, LogLevelPolicy
+from husarion_ugv_utils.substitutions import SUBSTITUTIONS_CACHE_KEY
+from launch.launch_context import LaunchContext
+from launch.utilities import perform_substitutions
+
+
+@pytest.mark.parametrize(
+    "log_level, expected",
+    [
+        ("DEBUG", "rcl:=INFO"),
+        ("debug", "rcl:=INFO"),
+        ("INFO", "rcl:=INFO"),
+        ("warn", "rcl:=WARN"),
+        ("ERROR", "rcl:=ERROR"),
+    ],
+)
+def test_limited_log_level(log_level, expected):
+    assert LimitedLogLevel("rcl", log_level).perform(LaunchContext()) == expected
+
+
+def test_limited_log_level_memoized():
+    context = LaunchContext()
+    LimitedLogLevel("rcl", "DEBUG").perform(context)
+
+    # Cached per launch context, keyed by the type and the performed values
+    cache = context.get_locals_as_dict()[SUBSTITUTIONS_CACHE_KEY]
+    assert cache == {(LimitedLogLevel, ("rcl", "DEBUG")): "rcl:=INFO"}
+
+    LimitedLogLevel("rcl", "DEBUG").perform(context)
+    LimitedLogLevel("pluginlib.ClassLoader", "DEBUG").perform(context)
+    assert len(cache) == 2
+
+
+def test_log_level_policy_arguments():
+    context = LaunchContext()
+    arguments = LogLevelPolicy("DEBUG").arguments("pluginlib.ClassLoader")
+
+    assert arguments[:3] == ["--ros-args", "--log-level", "DEBUG"]
+    assert [
+        argument if isinstance(argument, str) else perform_substitutions(context, [argument])
+        for argument in arguments[3:]
+    ] == ["--log-level", "rcl:=INFO", "--log-level", "pluginlib.ClassLoader:=INFO"]
@@ -0,0 +1,115 @@
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from husarion_ugv_utils.benchmarks.results import (
+    BenchmarkResult,
+    MetricComparison,
+    compare,
+)
+
+
+def metric(samples, higher_is_better=False, failed=0):
+    return {
+        "unit": "s",
+        "higher_is_better": higher_is_better,
+        "samples": samples,
+        "failed": failed,
+    }
+
+
+@pytest.mark.parametrize(
+    "baseline, run, status",
+    [
+        # Stable samples, mean changed by 10 %
+        ([1.0, 1.01, 0.99], [1.1, 1.11, 1.09], "REGRESSION"),
+        ([1.0, 1.01, 0.99], [0.9, 0.91, 0.89], "improved"),
+        # Mean changed by 10 %, but within the spread of samples
+        ([0.5, 1.5, 1.0], [0.6, 1.6, 1.1], "noise"),
+        ([1.0, 1.01, 0.99], [1.01, 1.02, 1.0], "ok"),
+        ([], [1.0, 1.01, 0.99], "missing"),
+        ([1.0, 1.01, 0.99], [], "FAILED"),
+    ],
+)
+def test_metric_comparison_status(baseline, run, status):
+    comparison = MetricComparison("time", metric(baseline), metric(run), threshold=0.05, sigma=3.0)
+
+    assert comparison.status == status
+
+
+def test_metric_comparison_failed_samples():
+    baseline = metric([1.0, 1.01, 0.99])
+    run = metric([0.9, 0.91], failed=1)
+
+    comparison = MetricComparison("time", baseline, run, threshold=0.05, sigma=3.0)
+
+    assert comparison.status == "FAILED"
+    assert comparison.regressed
+
+
+def test_metric_comparison_higher_is_better():
+    baseline = metric([100.0, 101.0, 99.0], higher_is_better=True)
+    run = metric([90.0, 91.0, 89.0], higher_is_better=True)
+
+    comparison = MetricComparison("rate", baseline, run, threshold=0.05, sigma=3.0)
+
+    assert comparison.status == "REGRESSION"
+    assert comparison.change == pytest.approx(0.1)
+
+
+def test_metric_comparison_single_samples():
+    # Without spread any change above the threshold is significant
+    comparison = MetricComparison("time", metric([1.0]), metric([1.1]), threshold=0.05, sigma=3.0)
+
+    assert comparison.status == "REGRESSION"
+    assert "REGRESSION" in str(comparison)
+
+
+def test_compare_metric_thresholds():
+    baseline = {"metrics": {"time": metric([1.0, 1.01, 0.99]), "cpu": metric([1.0, 1.01, 0.99])}}
+    run = {
+        "metrics": {
+            "time": metric([1.1, 1.11, 1.09]),
+            "cpu": metric([1.1, 1.11, 1.09]),
+            "new": metric([1.0]),
+        }
+    }
+
+    comparisons = compare(baseline, run, threshold=0.05, sigma=3.0, metric_thresholds={"cpu": 0.2})
+
+    assert {comparison.name: comparison.status for comparison in comparisons} == {
+        "time": "REGRESSION",
+        "cpu": "ok",
+        "new": "missing",
+    }
+
+
+def test_compare_failed_measurement():
+    baseline = BenchmarkResult("bringup")
+    baseline.add("first_odometry_filtered", [10.0, 10.1, 9.9], "s")
+    baseline.add("bringup", [10.0, 10.1, 9.9], "s")
+    baseline.add("jitter_max", [1.0], "ms")
+    run = BenchmarkResult("bringup")
+    run.add("first_odometry_filtered", [float("nan")], "s")
+    run.add("bringup", [5.0], "s")
+
+    comparisons = compare(
+        baseline.record, run.record, threshold=0.05, sigma=3.0, metric_thresholds={}
+    )
+
+    assert {comparison.name: comparison.status for comparison in comparisons} == {
+        "first_odometry_filtered": "FAILED",
+        "bringup": "improved",
+        "jitter_max": "FAILED",
+    }
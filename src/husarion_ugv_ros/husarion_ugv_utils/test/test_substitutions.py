@@ -0,0 +1,88 @@
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from husarion_ugv_utils.substitutions import ReplaceString, replace_placeholders
+from launch.condition import Condition
+from launch.launch_context import LaunchContext
+
+
+def test_replace_placeholders_longest_wins():
+    content = "topic: <namespace>/cmd_vel\nname: <namespace>"
+    replacements = {"<namespace>": "robot", "<namespace>/": ""}
+
+    assert replace_placeholders(content, replacements) == "topic: cmd_vel\nname: robot"
+
+
+def test_replace_placeholders_single_pass():
+    content = "<a> <b>"
+    replacements = {"<a>": "<b>", "<b>": "x"}
+
+    assert replace_placeholders(content, replacements) == "<b> x"
+
+
+def test_replace_placeholders_no_replacements():
+    assert replace_placeholders("<namespace>", {}) == "<namespace>"
+
+
+def test_replace_string_renders_file(tmp_path):
+    source = tmp_path / "config.yaml"
+    source.write_text("<namespace>/controller_manager:\n  ros__parameters: {}\n")
+    context = LaunchContext()
+
+    path = ReplaceString(str(source), {"<namespace>/": "robot/"}).perform(context)
+
+    assert path != str(source)
+    assert os.path.splitext(path)[1] == ".yaml"
+    with open(path) as file:
+        assert file.read() == "robot/controller_manager:\n  ros__parameters: {}\n"
+
+
+def test_replace_string_reuses_rendered_file(tmp_path):
+    source = tmp_path / "config.yaml"
+    source.write_text("<namespace>: {}\n")
+    context = LaunchContext()
+
+    first = ReplaceString(str(source), {"<namespace>": "robot"}).perform(context)
+    second = ReplaceString(str(source), {"<namespace>": "robot"}).perform(context)
+    other = ReplaceString(str(source), {"<namespace>": "other"}).perform(context)
+
+    assert first == second
+    assert first != other
+
+
+def test_replace_string_renders_modified_source(tmp_path):
+    source = tmp_path / "config.yaml"
+    source.write_text("<namespace>: {}\n")
+    context = LaunchContext()
+    first = ReplaceString(str(source), {"<namespace>": "robot"}).perform(context)
+
+    source.write_text("<namespace>: {a: 1}\n")
+    os.utime(source, ns=(0, os.stat(source).st_mtime_ns + 1))
+    second = ReplaceString(str(source), {"<namespace>": "robot"}).perform(context)
+
+    with open(second) as file:
+        assert file.read() == "robot: {a: 1}\n"
+    assert first != second
+
+
+def test_replace_string_condition_false(tmp_path):
+    source = tmp_path / "config.yaml"
+    source.write_text("<namespace>: {}\n")
+    condition = Condition(predicate=lambda context: False)
+
+    path = ReplaceString(str(source), {"<namespace>": "robot"}, condition).perform(LaunchContext())
+
+    assert path == str(source)
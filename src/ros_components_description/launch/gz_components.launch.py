@@ -12,7 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
 import os
+import shutil
+import tempfile
+from functools import partial
+from typing import Dict, List
 
 import yaml
 from ament_index_python.packages import get_package_share_directory
@@ -25,32 +30,55 @@ from launch.actions import (
 )
 from launch.launch_description_sources import PythonLaunchDescriptionSource
 from launch.substitutions import EnvironmentVariable, LaunchConfiguration
-from launch_ros.actions import SetParameter
-
+from launch_ros.actions import Node, SetParameter
+from ros_components_description.components_config import (
+    Component,
+    get_components_config,
+)
 
-def get_value(node: yaml.Node, key: str):
-    try:
-        return node[key]
+components_types_with_names = {
+    "ANT02": "teltonika",
+    "LDR01": "slamtec_rplidar",
+    "LDR06": "slamtec_rplidar",
+    "LDR10": "ouster_os",
+    "LDR11": "ouster_os",
+    "LDR12": "ouster_os",
+    "LDR13": "ouster_os",
+    "LDR14": "ouster_os",
+    "LDR15": "ouster_os",
+    "LDR20": "velodyne",
+    "CAM01": "orbbec_astra",
+    "CAM02": "intel_realsense_d435",
+    "CAM03": "stereolabs_zed",
+    "CAM04": "stereolabs_zed",
+    "CAM06": "stereolabs_zed",
+    "CAM11": "luxonis_depthai",
+    "MAN01": "ur",
+    "MAN02": "ur",
+    # "MAN03": "kinova_lite"  sim_isaac error
+    "MAN04": "kinova_6dof",
+    "MAN05": "kinova_6dof",
+    "MAN06": "kinova_7dof",
+    "MAN07": "kinova_7dof",
+    "GRP02": "robotiq",
+    # "GRP03": "robotiq", Waiting for release
+    # https://github.com/PickNikRobotics/ros2_robotiq_gripper/blob/main/robotiq_description/urdf/robotiq_2f_85_macro.urdf.xacro
+    "WCH02": "wibotic_station",
+}
 
-    except KeyError:
-        return ""
 
+def get_namespaces(name: str, namespace: str, component: Component):
+    absolute = "ur" not in name and "kinova" not in name and "robotiq" not in name
+    return component.get_namespaces(namespace, absolute)
 
-def get_launch_description(name: str, package: str, namespace: str, component: yaml.Node):
-    device_namespace = get_value(component, "device_namespace")
-    robot_namespace = namespace
 
-    if "ur" not in name and "kinova" not in name and "robotiq" not in name:
-        if len(robot_namespace) and robot_namespace[0] != "/":
-            robot_namespace = "/" + robot_namespace
-        if len(device_namespace) and device_namespace[0] != "/":
-            device_namespace = "/" + device_namespace
+def get_launch_description(name: str, package: str, namespace: str, component: Component):
+    robot_namespace, device_namespace = get_namespaces(name, namespace, component)
 
-    gz_bridge_name_prefix = component["type"] + "_gz_bridge"
-    device_namespace_prefix = get_value(component, "device_namespace")
+    gz_bridge_name_prefix = component.type + "_gz_bridge"
 
-    if device_namespace_prefix != "":
-        gz_bridge_name_prefix = device_namespace_prefix + "_" + gz_bridge_name_prefix
+    if component.device_namespace != "":
+        gz_bridge_name_prefix = component.device_namespace + "_" + gz_bridge_name_prefix
 
     return IncludeLaunchDescription(
         PythonLaunchDescriptionSource([package, "/launch/gz_", name, ".launch.py"]),
@@ -58,50 +86,197 @@ def get_launch_description(name: str, package: str, namespace: str, component: y
             "robot_namespace": robot_namespace,
             "device_namespace": device_namespace,
             "gz_bridge_name": gz_bridge_name_prefix,
+            "publish_point_cloud_tf": "False",
+            "spawn_controllers": "False",
         }.items(),
     )
 
 
-def get_launch_descriptions_from_yaml_node(
-    node: yaml.Node, package: os.PathLike, namespace: str
-) -> IncludeLaunchDescription:
-    actions = []
+# The frame of the point cloud from ignition gazebo 6 isn't provided by <frame_id>.
+# See https://github.com/gazebosim/gz-sensors/issues/239
+# Transforms are in static_transform_publisher format: 'x y z yaw pitch roll frame_id child_frame_id'
+def get_stereolabs_zed_point_cloud_tf(robot_namespace: str, device_namespace: str) -> str:
+    if robot_namespace.startswith("/"):
+        robot_namespace = robot_namespace[1:] + "/"
+
+    if device_namespace.startswith("/"):
+        device_namespace = device_namespace[1:]
+
+    parent_frame = robot_namespace + device_namespace + "_center_optical_frame"
+    child_frame = (
+        "panther/base_link/" + robot_namespace + device_namespace + "_stereolabs_zed_depth"
+    )
+    return " ".join(["0", "0", "0", "1.57", "-1.57", "0", parent_frame, child_frame])
+
+
+def get_kinova_point_cloud_tf(robot_namespace: str, device_namespace: str) -> str:
+    device_namespace_ext = device_namespace + "/"
+    if device_namespace == "":
+        device_namespace_ext = ""
+
+    prefix = device_namespace + "_"
+    if device_namespace == "":
+        prefix = ""
+
+    parent_frame = prefix + device_namespace + "_depth_optical_frame"
+    child_frame = (
+        "panther/base_link//"
+        + device_namespace_ext
+        + prefix
+        + device_namespace
+        + "_orbbec_astra_depth"
+    )
+    return " ".join(["0", "0", "0", "1.57", "-1.57", "0", parent_frame, child_frame])
+
+
+point_cloud_tf_getters = {
+    "stereolabs_zed": get_stereolabs_zed_point_cloud_tf,
+    "kinova_6dof": get_kinova_point_cloud_tf,
+    "kinova_7dof": get_kinova_point_cloud_tf,
+}
+
+
+def get_point_cloud_transforms(components: List[Component], namespace: str) -> list:
+    transforms = []
+
+    for component in components:
+        name = components_types_with_names.get(component.type)
+        if name in point_cloud_tf_getters:
+            robot_namespace, device_namespace = get_namespaces(name, namespace, component)
+            transforms.append(point_cloud_tf_getters[name](robot_namespace, device_namespace))
+
+    return transforms
+
+
+# Controllers spawned for manipulator components, with the same names and parameters as in their
+# gz_<name>.launch.py files: (config file, placeholder replacements, controllers with types).
+def get_ur_controllers(device_namespace: str) -> tuple:
+    joints = [
+        "shoulder_pan_joint",
+        "shoulder_lift_joint",
+        "elbow_joint",
+        "wrist_1_joint",
+        "wrist_2_joint",
+        "wrist_3_joint",
+        "tool0",
+    ]
+    replacements = {joint: device_namespace + "_" + joint for joint in joints}
+    controllers = {
+        "joint_trajectory_controller": "joint_trajectory_controller/JointTrajectoryController"
+    }
+    return "ur_controllers.yaml", replacements, controllers
+
+
+def get_kinova_controllers(config_file: str, device_namespace: str) -> tuple:
+    replacements = {
+        "- joint": "- " + device_namespace + "_joint",
+        "robotiq_85_left_knuckle_joint": device_namespace + "_robotiq_85_left_knuckle_joint",
+    }
+    controllers = {
+        "joint_trajectory_controller": "joint_trajectory_controller/JointTrajectoryController",
+        "robotiq_gripper_controller": "position_controllers/GripperActionController",
+    }
+    return config_file, replacements, controllers
+
 
-    components_types_with_names = {
-        "ANT02": "teltonika",
-        "LDR01": "slamtec_rplidar",
-        "LDR06": "slamtec_rplidar",
-        "LDR10": "ouster_os",
-        "LDR11": "ouster_os",
-        "LDR12": "ouster_os",
-        "LDR13": "ouster_os",
-        "LDR14": "ouster_os",
-        "LDR15": "ouster_os",
-        "LDR20": "velodyne",
-        "CAM01": "orbbec_astra",
-        "CAM02": "intel_realsense_d435",
-        "CAM03": "stereolabs_zed",
-        "CAM04": "stereolabs_zed",
-        "CAM06": "stereolabs_zed",
-        "CAM11": "luxonis_depthai",
-        "MAN01": "ur",
-        "MAN02": "ur",
-        # "MAN03": "kinova_lite"  sim_isaac error
-        "MAN04": "kinova_6dof",
-        "MAN05": "kinova_6dof",
-        "MAN06": "kinova_7dof",
-        "MAN07": "kinova_7dof",
-        "GRP02": "robotiq",
-        # "GRP03": "robotiq", Waiting for release
-        # https://github.com/PickNikRobotics/ros2_robotiq_gripper/blob/main/robotiq_description/urdf/robotiq_2f_85_macro.urdf.xacro
-        "WCH02": "wibotic_station",
+def get_robotiq_controllers(device_namespace: str) -> tuple:
+    replacements = {
+        "robotiq_85_left_knuckle_joint": device_namespace + "_robotiq_85_left_knuckle_joint",
     }
+    controllers = {"robotiq_gripper_controller": "position_controllers/GripperActionController"}
+    return "robotiq_controllers.yaml", replacements, controllers
 
-    for component in node["components"]:
-        component_type = component["type"]
-        if component_type in components_types_with_names:
+
+manipulator_controllers_getters = {
+    "ur": get_ur_controllers,
+    "kinova_6dof": partial(get_kinova_controllers, "kinova_6dof_controllers.yaml"),
+    "kinova_7dof": partial(get_kinova_controllers, "kinova_7dof_controllers.yaml"),
+    "robotiq": get_robotiq_controllers,
+}
+
+
+def get_manipulator_controllers(
+    components: List[Component], package: os.PathLike, namespace: str
+) -> Dict[str, dict]:
+    """
+    Returns parameters of all arm and gripper controllers of manipulator components, keyed by the
+    controller name. The controller type is stored in the parameters, so a single spawner can
+    load controllers of different types.
+    """
+    # Using robot_namespace as prefix for controller name is caused by
+    # https://github.com/ros-controls/ros2_control/issues/1506
+    robot_namespace_ext = namespace + "_" if namespace else ""
+    controllers = {}
+    configs = {}
+
+    for component in components:
+        name = components_types_with_names.get(component.type)
+        if name not in manipulator_controllers_getters:
+            continue
+
+        device_namespace = component.device_namespace
+        config_file, replacements, controller_types = manipulator_controllers_getters[name](
+            device_namespace
+        )
+
+        if config_file not in configs:
+            with open(os.path.join(package, "config", config_file)) as file:
+                configs[config_file] = file.read()
+
+        config = configs[config_file]
+        for placeholder, value in replacements.items():
+            config = config.replace(placeholder, value)
+
+        params = yaml.safe_load(config)["/**"]
+        for controller, controller_type in controller_types.items():
+            controller_name = robot_namespace_ext + device_namespace + "_" + controller
+            controllers[controller_name] = params[controller]
+            controllers[controller_name]["ros__parameters"]["type"] = controller_type
+
+    return controllers
+
+
+def get_manipulator_controllers_spawner(
+    components: List[Component], package: os.PathLike, namespace: str
+) -> List[Node]:
+    controllers = get_manipulator_controllers(components, package, namespace)
+    if not controllers:
+        return []
+
+    # Parameter file is needed until the spawner exits, remove it with the launch process
+    output_dir = tempfile.mkdtemp(prefix="ros_components_description_")
+    atexit.register(shutil.rmtree, output_dir, ignore_errors=True)
+    param_file_path = os.path.join(output_dir, "manipulator_controllers.yaml")
+    with open(param_file_path, "w") as param_file:
+        yaml.dump({"/**": controllers}, param_file, sort_keys=False)
+
+    spawner = Node(
+        package="controller_manager",
+        executable="spawner",
+        name="manipulator_controllers_spawner",
+        arguments=[
+            *controllers.keys(),
+            "-c",
+            "controller_manager",
+            "--controller-manager-timeout",
+            "10",
+            "--param-file",
+            param_file_path,
+        ],
+        namespace=namespace,
+    )
+    return [spawner]
+
+
+def get_launch_descriptions(
+    components: List[Component], package: os.PathLike, namespace: str
+) -> IncludeLaunchDescription:
+    actions = []
+
+    for component in components:
+        if component.type in components_types_with_names:
             launch_description = get_launch_description(
-                components_types_with_names[component_type], package, namespace, component
+                components_types_with_names[component.type], package, namespace, component
             )
             actions.append(launch_description)
 
@@ -114,17 +289,28 @@ def launch_setup(context, *args, **kwargs):
     components_config_path = LaunchConfiguration("components_config_path").perform(context)
     namespace = LaunchConfiguration("namespace").perform(context)
 
-    components_config = None
-    if components_config_path == "":
-        return []
+    # Loaded once and shared with the included launch files through the launch context
+    components = get_components_config(context, components_config_path)
 
-    with open(os.path.join(components_config_path)) as file:
-        components_config = yaml.safe_load(file)
+    actions = get_launch_descriptions(components, ros_components_description, namespace)
 
-    actions = []
-    if components_config is not None:
-        actions += get_launch_descriptions_from_yaml_node(
-            components_config, ros_components_description, namespace
+    # Load arm and gripper controllers of all manipulator components with one spawner
+    actions += get_manipulator_controllers_spawner(
+        components, ros_components_description, namespace
+    )
+
+    # Publish fix-up transforms of all components as one /tf_static message
+    point_cloud_transforms = get_point_cloud_transforms(components, namespace)
+    if point_cloud_transforms:
+        actions.append(
+            Node(
+                package="ros_components_description",
+                executable="static_transforms_publisher",
+                name="components_static_tf",
+                output="log",
+                parameters=[{"transforms": point_cloud_transforms, "use_sim_time": True}],
+                namespace=namespace,
+            )
         )
 
     return actions
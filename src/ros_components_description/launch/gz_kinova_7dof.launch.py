@@ -18,6 +18,7 @@ from nav2_common.launch import ReplaceString
 
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument, OpaqueFunction
+from launch.conditions import IfCondition
 from launch.substitutions import (
     EnvironmentVariable,
     LaunchConfiguration,
@@ -64,6 +65,7 @@ def fix_depth_image_tf(context, *args, **kwargs):
 def generate_launch_description():
     robot_namespace = LaunchConfiguration("robot_namespace")
     device_namespace = LaunchConfiguration("device_namespace")
+    spawn_controllers = LaunchConfiguration("spawn_controllers")
 
     initial_joint_controllers = PathJoinSubstitution(
         [FindPackageShare("ros_components_description"), "config", "kinova_7dof_controllers.yaml"]
@@ -114,6 +116,26 @@ def generate_launch_description():
         description="Sensor namespace that will appear before all non absolute topics and TF frames, used for distinguishing multiple cameras on the same robot.",
     )
 
+    declare_publish_point_cloud_tf = DeclareLaunchArgument(
+        "publish_point_cloud_tf",
+        default_value="True",
+        description=(
+            "Whether to start a static_transform_publisher fixing the point cloud frame. "
+            "gz_components.launch.py publishes these transforms for all components at once."
+        ),
+        choices=["True", "true", "False", "false"],
+    )
+
+    declare_spawn_controllers = DeclareLaunchArgument(
+        "spawn_controllers",
+        default_value="True",
+        description=(
+            "Whether to spawn controllers of the component. gz_components.launch.py spawns "
+            "controllers of all manipulator components at once."
+        ),
+        choices=["True", "true", "False", "false"],
+    )
+
     declare_robot_namespace = DeclareLaunchArgument(
         "robot_namespace",
         default_value=EnvironmentVariable("ROBOT_NAMESPACE", default_value=""),
@@ -141,6 +163,7 @@ def generate_launch_description():
             namespaced_initial_joint_controllers_path,
         ],
         namespace=robot_namespace,
+        condition=IfCondition(spawn_controllers),
     )
 
     robot_hand_controller_spawner = Node(
@@ -160,6 +183,7 @@ def generate_launch_description():
             namespaced_initial_joint_controllers_path,
         ],
         namespace=robot_namespace,
+        condition=IfCondition(spawn_controllers),
     )
 
     gz_bridge = Node(
@@ -174,10 +198,15 @@ def generate_launch_description():
     return LaunchDescription(
         [
             declare_device_namespace,
+            declare_publish_point_cloud_tf,
             declare_robot_namespace,
+            declare_spawn_controllers,
             initial_joint_controller_spawner_started,
             robot_hand_controller_spawner,
             gz_bridge,
-            OpaqueFunction(function=fix_depth_image_tf),
+            OpaqueFunction(
+                function=fix_depth_image_tf,
+                condition=IfCondition(LaunchConfiguration("publish_point_cloud_tf")),
+            ),
         ]
     )
@@ -20,6 +20,7 @@ from nav2_common.launch import ReplaceString
 
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument, OpaqueFunction
+from launch.conditions import IfCondition
 from launch.substitutions import EnvironmentVariable, LaunchConfiguration
 
 
@@ -76,6 +77,16 @@ def generate_launch_description():
         description="Sensor namespace that will appear before all non absolute topics and TF frames, used for distinguishing multiple cameras on the same robot.",
     )
 
+    declare_publish_point_cloud_tf = DeclareLaunchArgument(
+        "publish_point_cloud_tf",
+        default_value="True",
+        description=(
+            "Whether to start a static_transform_publisher fixing the point cloud frame. "
+            "gz_components.launch.py publishes these transforms for all components at once."
+        ),
+        choices=["True", "true", "False", "false"],
+    )
+
     declare_robot_namespace = DeclareLaunchArgument(
         "robot_namespace",
         default_value=EnvironmentVariable("ROBOT_NAMESPACE", default_value=""),
@@ -100,9 +111,13 @@ def generate_launch_description():
     return LaunchDescription(
         [
             declare_device_namespace,
+            declare_publish_point_cloud_tf,
             declare_robot_namespace,
             declare_gz_bridge_name,
             gz_bridge,
-            OpaqueFunction(function=fix_depth_image_tf),
+            OpaqueFunction(
+                function=fix_depth_image_tf,
+                condition=IfCondition(LaunchConfiguration("publish_point_cloud_tf")),
+            ),
         ]
     )
@@ -18,6 +18,7 @@ from nav2_common.launch import ReplaceString
 
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument
+from launch.conditions import IfCondition
 from launch.substitutions import (
     EnvironmentVariable,
     LaunchConfiguration,
@@ -29,6 +30,7 @@ from launch.substitutions import (
 def generate_launch_description():
     robot_namespace = LaunchConfiguration("robot_namespace")
     device_namespace = LaunchConfiguration("device_namespace")
+    spawn_controllers = LaunchConfiguration("spawn_controllers")
     initial_joint_controllers = PathJoinSubstitution(
         [FindPackageShare("ros_components_description"), "config", "ur_controllers.yaml"]
     )
@@ -65,6 +67,16 @@ def generate_launch_description():
         description="Sensor namespace that will appear before all non absolute topics and TF frames, used for distinguishing multiple cameras on the same robot.",
     )
 
+    declare_spawn_controllers = DeclareLaunchArgument(
+        "spawn_controllers",
+        default_value="True",
+        description=(
+            "Whether to spawn controllers of the component. gz_components.launch.py spawns "
+            "controllers of all manipulator components at once."
+        ),
+        choices=["True", "true", "False", "false"],
+    )
+
     declare_robot_namespace = DeclareLaunchArgument(
         "robot_namespace",
         default_value=EnvironmentVariable("ROBOT_NAMESPACE", default_value=""),
@@ -92,12 +104,14 @@ def generate_launch_description():
             namespaced_initial_joint_controllers_path,
         ],
         namespace=robot_namespace,
+        condition=IfCondition(spawn_controllers),
     )
 
     return LaunchDescription(
         [
             declare_device_namespace,
             declare_robot_namespace,
+            declare_spawn_controllers,
             initial_joint_controller_spawner_started,
         ]
     )
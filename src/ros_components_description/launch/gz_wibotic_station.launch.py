@@ -14,10 +14,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import os
-
-import yaml
 from launch_ros.actions import Node
+from ros_components_description.components_config import get_components_config
 
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument, OpaqueFunction
@@ -29,21 +27,13 @@ def launch_setup(context, *args, **kwargs):
     robot_namespace = LaunchConfiguration("robot_namespace")
     device_namespace = LaunchConfiguration("device_namespace")
 
-    components_config = None
-    if components_config_path == "":
-        return []
-
-    with open(os.path.join(components_config_path)) as file:
-        components_config = yaml.safe_load(file)
-
     actions = []
 
-    for component in components_config["components"]:
-        component_type = component["type"]
-        if component_type == "WCH02":
+    for component in get_components_config(context, components_config_path):
+        if component.type == "WCH02":
 
-            component_xyz = [x for x in component["xyz"].split()]
-            component_rpy = [x for x in component["rpy"].split()]
+            component_xyz = [str(x) for x in component.xyz]
+            component_rpy = [str(x) for x in component.rpy]
 
             spawn_station = Node(
                 package="ros_gz_sim",
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from typing import Dict, List, Tuple
+
+import yaml
+
+from launch.launch_context import LaunchContext
+
+COMPONENTS_CONFIG_CACHE_KEY = "ros_components_description_components_configs"
+
+
+class Component:
+    """
+    Class representing a single, validated entry of the components configuration file.
+    """
+
+    def __init__(self, node: Dict, index: int):
+        if not isinstance(node, dict) or not isinstance(node.get("type"), str):
+            raise ValueError(f"Component {index} has to be a mapping with a 'type' key.")
+
+        self.type: str = node["type"]
+        self.parent_link: str = str(node.get("parent_link", ""))
+        self.xyz: Tuple[float, float, float] = self._parse_vector(node, "xyz", index)
+        self.rpy: Tuple[float, float, float] = self._parse_vector(node, "rpy", index)
+        self.device_namespace: str = str(node.get("device_namespace", ""))
+
+    @staticmethod
+    def _parse_vector(node: Dict, key: str, index: int) -> Tuple[float, float, float]:
+        value = node.get(key, "0.0 0.0 0.0")
+        try:
+            vector = tuple(float(x) for x in str(value).split())
+        except ValueError:
+            vector = ()
+
+        if len(vector) != 3:
+            raise ValueError(
+                f"Component {index} ({node['type']}) has invalid '{key}': '{value}'. "
+                "Expected 3 numbers separated with spaces."
+            )
+        return vector
+
+    def get_namespaces(self, robot_namespace: str, absolute: bool = False) -> Tuple[str, str]:
+        """
+        Returns robot and device namespace of the component. If absolute is True, non-empty
+        namespaces are prefixed with '/'.
+        """
+        device_namespace = self.device_namespace
+
+        if absolute:
+            if robot_namespace and not robot_namespace.startswith("/"):
+                robot_namespace = "/" + robot_namespace
+            if device_namespace and not device_namespace.startswith("/"):
+                device_namespace = "/" + device_namespace
+
+        return robot_namespace, device_namespace
+
+
+def load_components_config(components_config_path: str) -> List[Component]:
+    """
+    Loads and validates the components configuration file.
+
+    Args:
+        components_config_path (str): Path to the components configuration file.
+
+    Returns:
+        List[Component]: List of the components. Empty if path is empty or file has no components.
+
+    Raises:
+        ValueError: If the file content is invalid.
+    """
+    if components_config_path == "":
+        return []
+
+    with open(components_config_path) as file:
+        components_config = yaml.safe_load(file)
+
+    return parse_components_config(components_config, components_config_path)
+
+
+def parse_components_config(components_config: Dict, source: str) -> List[Component]:
+    """
+    Validates loaded content of the components configuration file and returns its components.
+
+    Raises:
+        ValueError: If the content is invalid.
+    """
+    if components_config is None:
+        return []
+
+    if not isinstance(components_config, dict) or not isinstance(
+        components_config.get("components") or [], list
+    ):
+        raise ValueError(
+            f"Invalid components configuration file {source}: expected 'components' list."
+        )
+
+    return [
+        Component(node, index)
+        for index, node in enumerate(components_config.get("components") or [])
+    ]
+
+
+def get_components_config(context: LaunchContext, components_config_path: str) -> List[Component]:
+    """
+    Returns components from the configuration file. The file is loaded once per launch and
+    shared through the launch context with all included launch files.
+    """
+    if components_config_path == "":
+        return []
+
+    mtime = os.stat(components_config_path).st_mtime_ns
+    cache = context.get_locals_as_dict().get(COMPONENTS_CONFIG_CACHE_KEY)
+    if cache is None:
+        cache = {}
+        context.extend_globals({COMPONENTS_CONFIG_CACHE_KEY: cache})
+
+    cached = cache.get(components_config_path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, load_components_config(components_config_path))
+        cache[components_config_path] = cached
+
+    return cached[1]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+from typing import List
+
+import rclpy
+from geometry_msgs.msg import TransformStamped
+from rclpy.node import Node
+from tf2_ros import StaticTransformBroadcaster
+
+
+def transform_from_args(args: str) -> TransformStamped:
+    """
+    Create a transform from a string with the same layout as the positional arguments of
+    tf2_ros static_transform_publisher: 'x y z yaw pitch roll frame_id child_frame_id'.
+    """
+    fields = args.split()
+    if len(fields) != 8:
+        raise ValueError(
+            f"Invalid transform '{args}'. Expected 'x y z yaw pitch roll frame_id child_frame_id'."
+        )
+
+    x, y, z, yaw, pitch, roll = map(float, fields[:6])
+
+    cy, sy = math.cos(yaw * 0.5), math.sin(yaw * 0.5)
+    cp, sp = math.cos(pitch * 0.5), math.sin(pitch * 0.5)
+    cr, sr = math.cos(roll * 0.5), math.sin(roll * 0.5)
+
+    transform = TransformStamped()
+    transform.header.frame_id = fields[6]
+    transform.child_frame_id = fields[7]
+    transform.transform.translation.x = x
+    transform.transform.translation.y = y
+    transform.transform.translation.z = z
+    transform.transform.rotation.x = sr * cp * cy - cr * sp * sy
+    transform.transform.rotation.y = cr * sp * cy + sr * cp * sy
+    transform.transform.rotation.z = cr * cp * sy - sr * sp * cy
+    transform.transform.rotation.w = cr * cp * cy + sr * sp * sy
+    return transform
+
+
+class StaticTransformsPublisher(Node):
+    """
+    Node publishing many static transforms as a single latched /tf_static message. Replaces one
+    tf2_ros static_transform_publisher process per transform.
+    """
+
+    def __init__(self):
+        super().__init__("static_transforms_publisher")
+
+        self.declare_parameter("transforms", [""])
+        transforms_args: List[str] = self.get_parameter("transforms").value
+
+        transforms = [transform_from_args(args) for args in transforms_args if args.strip()]
+        stamp = self.get_clock().now().to_msg()
+        for transform in transforms:
+            transform.header.stamp = stamp
+
+        self._broadcaster = StaticTransformBroadcaster(self)
+        self._broadcaster.sendTransform(transforms)
+
+        self.get_logger().info(f"Publishing {len(transforms)} static transforms.")
+
+
+def main(args=None):
+    rclpy.init(args=args)
+
+    node = StaticTransformsPublisher()
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.destroy_node()
+        rclpy.try_shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+
+from launch.launch_context import LaunchContext
+from ros_components_description.components_config import (
+    get_components_config,
+    load_components_config,
+    parse_components_config,
+)
+
+COMPONENTS_CONFIG = """
+components:
+  - type: LDR01
+    parent_link: cover_link
+    xyz: 0.0 0.0 0.1
+    rpy: 0.0 0.0 3.14
+    device_namespace: main_lidar
+  - type: CAM01
+"""
+
+
+def test_parse_components():
+    components = parse_components_config(
+        {
+            "components": [
+                {
+                    "type": "LDR01",
+                    "parent_link": "cover_link",
+                    "xyz": "0.0 0.0 0.1",
+                    "rpy": "0.0 0.0 3.14",
+                    "device_namespace": "main_lidar",
+                },
+                {"type": "CAM01"},
+            ]
+        },
+        "test",
+    )
+
+    assert len(components) == 2
+    assert components[0].type == "LDR01"
+    assert components[0].parent_link == "cover_link"
+    assert components[0].xyz == (0.0, 0.0, 0.1)
+    assert components[0].rpy == (0.0, 0.0, 3.14)
+    assert components[0].device_namespace == "main_lidar"
+    assert components[1].xyz == (0.0, 0.0, 0.0)
+    assert components[1].device_namespace == ""
+
+
+def test_parse_empty_components():
+    assert parse_components_config(None, "test") == []
+    assert parse_components_config({"components": None}, "test") == []
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        ["LDR01"],
+        {"components": {"type": "LDR01"}},
+        {"components": [{"parent_link": "cover_link"}]},
+        {"components": [{"type": "LDR01", "xyz": "0.0 0.0"}]},
+        {"components": [{"type": "LDR01", "rpy": "0.0 0.0 a"}]},
+    ],
+)
+def test_parse_invalid_components(config):
+    with pytest.raises(ValueError):
+        parse_components_config(config, "test")
+
+
+def test_component_namespaces():
+    component = parse_components_config(
+        {"components": [{"type": "LDR01", "device_namespace": "lidar"}]}, "test"
+    )[0]
+
+    assert component.get_namespaces("robot") == ("robot", "lidar")
+    assert component.get_namespaces("robot", absolute=True) == ("/robot", "/lidar")
+    assert component.get_namespaces("", absolute=True) == ("", "/lidar")
+
+
+def test_load_components_config(tmp_path):
+    path = tmp_path / "components.yaml"
+    path.write_text(COMPONENTS_CONFIG)
+
+    assert [component.type for component in load_components_config(str(path))] == [
+        "LDR01",
+        "CAM01",
+    ]
+    assert load_components_config("") == []
+
+
+def test_get_components_config_cached(tmp_path):
+    path = tmp_path / "components.yaml"
+    path.write_text(COMPONENTS_CONFIG)
+    context = LaunchContext()
+
+    first = get_components_config(context, str(path))
+    second = get_components_config(context, str(path))
+
+    assert first is second
+    assert get_components_config(LaunchContext(), str(path)) is not first
+
+
+def test_get_components_config_reloads_modified_file(tmp_path):
+    path = tmp_path / "components.yaml"
+    path.write_text(COMPONENTS_CONFIG)
+    context = LaunchContext()
+    first = get_components_config(context, str(path))
+
+    path.write_text("components:\n  - type: CAM01\n")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    second = get_components_config(context, str(path))
+
+    assert [component.type for component in second] == ["CAM01"]
+    assert second is not first
@@ -0,0 +1,235 @@
+# Copyright 2024 Husarion sp. z o.o.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Stress benchmark of the components URDF expansion. Random and worst-case
+# components.yaml files with 1 to 30 namespaced components are expanded with
+# test/component.urdf.xacro and the expansion time, URDF size, link/joint count and
+# robot_state_publisher load time are reported. Run with `pytest -s` to see the table.
+
+import os
+import random
+import subprocess
+import time
+import uuid
+import xml.dom.minidom
+
+import pytest
+import xacro
+import yaml
+from test_components_xacro import (
+    ComponentsYamlParseUtils,
+    components_types_with_names,
+    xacro_path,
+)
+
+COMPONENTS_COUNTS = [1, 2, 5, 10, 20, 30]
+RANDOM_SEEDS = [0, 1, 2]
+XACRO_REPETITIONS = 3
+
+# Per component expansion time of the biggest configuration may be at most this many times
+# higher than the one of the reference configuration, otherwise the cost grows superlinearly.
+SUPERLINEAR_FACTOR = 2.0
+REFERENCE_COMPONENTS_COUNT = 5
+
+RSP_LOAD_TIMEOUT = 30.0
+
+# DEV components are mounting plates, only one of them can be installed on the robot
+STACKABLE_TYPES = sorted(
+    type_name for type_name in components_types_with_names if not type_name.startswith("DEV")
+)
+# Components with the biggest URDF trees (manipulators, grippers, stereo cameras, 3D lidars)
+WORST_CASE_TYPES = ["MAN02", "GRP02", "CAM04", "LDR15"]
+
+results = []
+
+
+def create_components_config(types: list, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    utils = ComponentsYamlParseUtils("")
+
+    components = []
+    for index, type_name in enumerate(types):
+        xyz = " ".join(f"{rng.uniform(-0.5, 0.5):.3f}" for _ in range(3))
+        device_namespace = f"{type_name.lower()}_{index}"
+        components.append(utils.create_component(type_name, device_namespace, xyz=xyz))
+
+    return {"components": components}
+
+
+def random_types(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [rng.choice(STACKABLE_TYPES) for _ in range(count)]
+
+
+def worst_case_types(count: int) -> list:
+    return [WORST_CASE_TYPES[i % len(WORST_CASE_TYPES)] for i in range(count)]
+
+
+def count_root_elements(doc: xml.dom.minidom.Document, tag_name: str) -> int:
+    return sum(
+        1
+        for node in doc.documentElement.childNodes
+        if node.nodeType == node.ELEMENT_NODE and node.tagName == tag_name
+    )
+
+
+def expand_urdf(components_config_path: str) -> tuple:
+    elapsed = []
+    for _ in range(XACRO_REPETITIONS):
+        start = time.perf_counter()
+        doc = xacro.process_file(
+            xacro_path, mappings={"components_config_path": components_config_path}
+        )
+        elapsed.append(time.perf_counter() - start)
+
+    return doc, min(elapsed)
+
+
+def measure_rsp_load_time(urdf: str, params_dir: str) -> float:
+    """Time from robot_state_publisher start until it latches robot_description."""
+    rclpy = pytest.importorskip("rclpy")
+    from rclpy.qos import DurabilityPolicy, QoSProfile
+    from std_msgs.msg import String
+
+    namespace = "bench_" + uuid.uuid4().hex[:8]
+    params_path = os.path.join(params_dir, namespace + "_rsp.yaml")
+    with open(params_path, mode="w", encoding="utf-8") as file:
+        yaml.dump({"/**": {"ros__parameters": {"robot_description": urdf}}}, file)
+
+    rclpy.init()
+    node = rclpy.create_node("components_benchmark", namespace=namespace)
+    received = []
+    node.create_subscription(
+        String,
+        "robot_description",
+        received.append,
+        QoSProfile(depth=1, durability=DurabilityPolicy.TRANSIENT_LOCAL),
+    )
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            "ros2",
+            "run",
+            "robot_state_publisher",
+            "robot_state_publisher",
+            "--ros-args",
+            "-r",
+            f"__ns:=/{namespace}",
+            "--params-file",
+            params_path,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        while not received and time.perf_counter() - start < RSP_LOAD_TIMEOUT:
+            rclpy.spin_once(node, timeout_sec=0.01)
+        elapsed = time.perf_counter() - start
+    finally:
+        process.terminate()
+        process.wait()
+        node.destroy_node()
+        rclpy.shutdown()
+
+    assert received, f"robot_state_publisher did not publish robot_description in {namespace}."
+    return elapsed
+
+
+def run_benchmark(name: str, types: list, tmpdir_factory, seed: int = 0) -> dict:
+    dir = tmpdir_factory.mktemp(name)
+    components_config_path = str(dir.join(name + "_components.yaml"))
+
+    utils = ComponentsYamlParseUtils(components_config_path)
+    utils.save_yaml(create_components_config(types, seed))
+
+    doc, expansion_time = expand_urdf(components_config_path)
+    urdf = doc.toxml()
+
+    result = {
+        "name": name,
+        "components": len(types),
+        "xacro_time": expansion_time,
+        "urdf_size": len(urdf.encode("utf-8")),
+        "links": count_root_elements(doc, "link"),
+        "joints": count_root_elements(doc, "joint"),
+        "urdf": urdf,
+        "dir": str(dir),
+    }
+    results.append(result)
+    return result
+
+
+@pytest.fixture(scope="module", autouse=True)
+def report():
+    yield
+
+    header = f"{'case':<24}{'components':>12}{'xacro [ms]':>12}{'ms/comp':>10}"
+    header += f"{'size [kB]':>12}{'links':>8}{'joints':>8}{'rsp [ms]':>10}"
+    print("\n" + header)
+    for result in sorted(results, key=lambda r: (r["name"].split("_")[0], r["components"])):
+        rsp_time = result.get("rsp_time")
+        rsp_str = f"{rsp_time * 1000.0:.1f}" if rsp_time is not None else "-"
+        line = f"{result['name']:<24}{result['components']:>12}"
+        line += f"{result['xacro_time'] * 1000.0:>12.1f}"
+        line += f"{result['xacro_time'] * 1000.0 / result['components']:>10.2f}"
+        line += f"{result['urdf_size'] / 1024.0:>12.1f}{result['links']:>8}{result['joints']:>8}"
+        line += f"{rsp_str:>10}"
+        print(line)
+
+
+@pytest.mark.parametrize("seed", RANDOM_SEEDS)
+@pytest.mark.parametrize("count", COMPONENTS_COUNTS)
+def test_random_components_expansion(count, seed, tmpdir_factory):
+    result = run_benchmark(
+        f"random{seed}_{count}", random_types(count, seed), tmpdir_factory, seed=seed
+    )
+
+    # Each component adds at least one link attached with a joint to the parent link
+    assert result["links"] > count
+    assert result["joints"] >= count
+
+
+@pytest.mark.parametrize("count", COMPONENTS_COUNTS)
+def test_worst_case_components_expansion(count, tmpdir_factory):
+    result = run_benchmark(f"worst_{count}", worst_case_types(count), tmpdir_factory)
+
+    assert result["links"] > count
+    assert result["joints"] >= count
+
+
+def test_worst_case_expansion_scales_linearly(tmpdir_factory):
+    reference = run_benchmark(
+        "worst_reference",
+        worst_case_types(REFERENCE_COMPONENTS_COUNT),
+        tmpdir_factory,
+    )
+    biggest = run_benchmark(
+        "worst_biggest", worst_case_types(max(COMPONENTS_COUNTS)), tmpdir_factory
+    )
+
+    reference_cost = reference["xacro_time"] / reference["components"]
+    biggest_cost = biggest["xacro_time"] / biggest["components"]
+    assert biggest_cost <= SUPERLINEAR_FACTOR * reference_cost, (
+        f"Expansion cost grows superlinearly: {biggest_cost * 1000.0:.2f} ms per component for "
+        f"{biggest['components']} components, {reference_cost * 1000.0:.2f} ms per component "
+        f"for {reference['components']} components."
+    )
+
+
+@pytest.mark.parametrize("count", COMPONENTS_COUNTS)
+def test_worst_case_robot_state_publisher_load(count, tmpdir_factory):
+    result = run_benchmark(f"worst-rsp_{count}", worst_case_types(count), tmpdir_factory)
+    result["rsp_time"] = measure_rsp_load_time(result["urdf"], result["dir"])